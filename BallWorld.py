@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class BallWorld:
+    """Stockage en tableaux contigus (structure-of-arrays) de l'état physique des balles"""
+
+    def __init__(self, capacite=64):
+        """
+        Initialise un monde de balles vide
+
+        Args:
+            capacite (int): Nombre de lignes pré-allouées (agrandi automatiquement)
+        """
+        capacite = max(1, int(capacite))
+        self.nb = 0
+        self.positions = np.zeros((capacite, 2), dtype=np.float64)
+        self.positions_precedentes = np.zeros((capacite, 2), dtype=np.float64)  # Pour l'interpolation du rendu
+        self.vitesses = np.zeros((capacite, 2), dtype=np.float64)
+        self.tailles = np.zeros(capacite, dtype=np.float64)
+        self.gravites = np.zeros(capacite, dtype=np.float64)
+        self.coefs_collision = np.zeros(capacite, dtype=np.float64)
+        self.balles = []  # Balle associée à chaque ligne
+
+        # Générateur pour séparer les balles parfaitement superposées
+        self.rng = np.random.default_rng()
+
+        # Tampons des paires et des contacts réutilisés d'une frame à l'autre : nom -> tableau
+        # (au moins de la capacité du monde, agrandi au besoin, jamais réduit)
+        self._tampons = {}
+
+    def __len__(self):
+        return self.nb
+
+    def _agrandir(self, capacite):
+        """Réalloue les tableaux avec une capacité plus grande"""
+        for nom in ('positions', 'positions_precedentes', 'vitesses', 'tailles', 'gravites', 'coefs_collision'):
+            ancien = getattr(self, nom)
+            nouveau = np.zeros((capacite,) + ancien.shape[1:], dtype=ancien.dtype)
+            nouveau[:self.nb] = ancien[:self.nb]
+            setattr(self, nom, nouveau)
+
+    def ajouter(self, balle, position, vitesse, taille, gravite, coef_collision):
+        """
+        Ajoute une ligne pour une balle et la lie à ce monde
+
+        Returns:
+            int: Indice de la ligne attribuée
+        """
+        if self.nb == len(self.tailles):
+            self._agrandir(len(self.tailles) * 2)
+
+        i = self.nb
+        self.positions[i] = position
+        self.positions_precedentes[i] = position
+        self.vitesses[i] = vitesse
+        self.tailles[i] = taille
+        self.gravites[i] = gravite
+        self.coefs_collision[i] = coef_collision
+        self.balles.append(balle)
+        self.nb += 1
+
+        balle.world = self
+        balle.index = i
+        return i
+
+    def etat(self, i):
+        """Retourne une copie de l'état (position, vitesse, taille, gravité, coef) de la ligne i"""
+        return (self.positions[i].copy(), self.vitesses[i].copy(), self.tailles[i],
+                self.gravites[i], self.coefs_collision[i])
+
+    def adopter(self, balle):
+        """Déplace une balle (et son état) depuis son monde actuel vers celui-ci"""
+        ancien = balle.world
+        if ancien is self:
+            return balle.index
+
+        etat = ancien.etat(balle.index)
+        ancien._supprimer_ligne(balle.index)
+        return self.ajouter(balle, *etat)
+
+    def retirer(self, balle):
+        """Retire une balle de ce monde ; elle conserve son état dans un monde privé"""
+        if balle.world is not self:
+            return False
+
+        etat = self.etat(balle.index)
+        self._supprimer_ligne(balle.index)
+        BallWorld(capacite=1).ajouter(balle, *etat)
+        return True
+
+    def _supprimer_ligne(self, i):
+        """Supprime la ligne i en la remplaçant par la dernière ligne"""
+        dernier = self.nb - 1
+        if i != dernier:
+            self.positions[i] = self.positions[dernier]
+            self.positions_precedentes[i] = self.positions_precedentes[dernier]
+            self.vitesses[i] = self.vitesses[dernier]
+            self.tailles[i] = self.tailles[dernier]
+            self.gravites[i] = self.gravites[dernier]
+            self.coefs_collision[i] = self.coefs_collision[dernier]
+            deplacee = self.balles[dernier]
+            self.balles[i] = deplacee
+            deplacee.index = i
+
+        self.balles.pop()
+        self.nb -= 1
+
+    def memoriser_positions(self):
+        """Copie les positions courantes avant un pas de physique (base de l'interpolation)"""
+        n = self.nb
+        self.positions_precedentes[:n] = self.positions[:n]
+
+    def positions_interpolees(self, alpha):
+        """
+        Positions de rendu entre le pas précédent et le pas courant
+
+        Args:
+            alpha (float): 0 = état précédent, 1 = état courant
+
+        Returns:
+            array: Tableau (n, 2) indexé comme les lignes du monde
+        """
+        n = self.nb
+        precedentes = self.positions_precedentes[:n]
+        return precedentes + (self.positions[:n] - precedentes) * alpha
+
+    def integrer(self, dt):
+        """Applique la gravité puis intègre les positions de toutes les balles en une passe"""
+        n = self.nb
+        if n == 0:
+            return
+
+        vitesses = self.vitesses[:n]
+        vitesses[:, 1] += self.gravites[:n] * dt
+        self.positions[:n] += vitesses * dt
+
+    def taille_max(self):
+        """Plus grand rayon parmi les balles du monde (0 si vide)"""
+        if self.nb == 0:
+            return 0.0
+        return float(self.tailles[:self.nb].max())
+
+    def _tampon(self, nom, m, dtype=np.float64, colonnes=None):
+        """
+        Vue sur les `m` premières lignes d'un tampon réutilisé (réalloué seulement s'il est trop petit)
+
+        Args:
+            nom (str): Nom du tampon
+            m (int): Nombre de lignes utilisées
+            dtype: Type des éléments
+            colonnes (int): Nombre de colonnes (None : tableau à une dimension)
+        """
+        tampon = self._tampons.get(nom)
+        if tampon is None or len(tampon) < m:
+            lignes = max(m, len(self.positions), 2 * len(tampon) if tampon is not None else 0)
+            tampon = np.empty((lignes,) if colonnes is None else (lignes, colonnes), dtype=dtype)
+            self._tampons[nom] = tampon
+        return tampon[:m]
+
+    def _ecarts(self, i, j, prefixe):
+        """
+        Vecteurs j - i, distances au carré et sommes des rayons des paires, dans les tampons `prefixe`
+
+        Returns:
+            tuple: (delta (m, 2), distances au carré, sommes des rayons)
+        """
+        m = len(i)
+        delta = self._tampon(prefixe + "delta", m, colonnes=2)
+        positions_i = self._tampon("positions_i", m, colonnes=2)
+        np.take(self.positions, j, axis=0, out=delta)
+        np.take(self.positions, i, axis=0, out=positions_i)
+        np.subtract(delta, positions_i, out=delta)
+        distance_squared = np.einsum('ij,ij->i', delta, delta, out=self._tampon(prefixe + "distance2", m))
+
+        somme_rayons = self._tampon(prefixe + "somme_rayons", m)
+        tailles_j = self._tampon("tailles_j", m)
+        np.take(self.tailles, i, out=somme_rayons)
+        np.take(self.tailles, j, out=tailles_j)
+        np.add(somme_rayons, tailles_j, out=somme_rayons)
+        return delta, distance_squared, somme_rayons
+
+    def _garder(self, masque, tableaux, prefixe):
+        """Copie compacte des lignes retenues par `masque` de chaque tableau, dans les tampons `prefixe`"""
+        k = int(np.count_nonzero(masque))
+        gardes = []
+        for rang, tableau in enumerate(tableaux):
+            colonnes = tableau.shape[1] if tableau.ndim == 2 else None
+            sortie = self._tampon(f"{prefixe}{rang}", k, tableau.dtype, colonnes)
+            np.compress(masque, tableau, axis=0, out=sortie)
+            gardes.append(sortie)
+        return gardes
+
+    def filtrer_contacts(self, i, j):
+        """
+        Ne garde que les paires candidates dont les disques se touchent
+
+        Returns:
+            tuple: Tableaux (i, j) filtrés (vues sur des tampons réutilisés, valables jusqu'au prochain appel)
+        """
+        i = np.asarray(i, dtype=np.intp)
+        j = np.asarray(j, dtype=np.intp)
+        if i.size == 0:
+            return i, j
+        _, distance_squared, somme_rayons = self._ecarts(i, j, "filtre_")
+        contacts = self._tampon("contacts", len(i), dtype=bool)
+        np.multiply(somme_rayons, somme_rayons, out=somme_rayons)
+        np.less_equal(distance_squared, somme_rayons, out=contacts)
+        contacts_i, contacts_j = self._garder(contacts, (i, j), "contacts_")
+        return contacts_i, contacts_j
+
+    def resoudre_collisions(self, i, j):
+        """
+        Résout en bloc les collisions balle-balle pour une liste de paires candidates
+
+        Même modèle que Balle.collision_avec_balle : masse proportionnelle au cube du
+        rayon, restitution fixe de 0.8, correction de position de la moitié du
+        chevauchement de chaque côté.
+
+        Args:
+            i (array): Indices de la première balle de chaque paire
+            j (array): Indices de la seconde balle de chaque paire
+
+        Returns:
+            int: Nombre de contacts résolus
+        """
+        i = np.asarray(i, dtype=np.intp)
+        j = np.asarray(j, dtype=np.intp)
+        if i.size == 0:
+            return 0
+
+        positions = self.positions
+        vitesses = self.vitesses
+        tailles = self.tailles
+
+        # Vecteur de distance entre les centres des balles
+        delta, distance_squared, somme_rayons = self._ecarts(i, j, "resolution_")
+
+        # Test rapide: ne garder que les paires qui se touchent
+        proches = self._tampon("proches", len(i), dtype=bool)
+        carres = self._tampon("carres", len(i))
+        np.multiply(somme_rayons, somme_rayons, out=carres)
+        np.less_equal(distance_squared, carres, out=proches)
+        if not proches.any():
+            return 0
+        i, j, delta, distance_squared, somme_rayons = self._garder(
+            proches, (i, j, delta, distance_squared, somme_rayons), "proches_")
+
+        # Balles presque parfaitement superposées : direction aléatoire
+        distance = np.sqrt(distance_squared)
+        superposees = distance_squared < 0.0001
+        if superposees.any():
+            angles = self.rng.uniform(0, 2 * np.pi, int(superposees.sum()))
+            delta[superposees, 0] = np.cos(angles)
+            delta[superposees, 1] = np.sin(angles)
+            distance[superposees] = 0.01
+
+        # Normaliser le vecteur de direction
+        m = len(i)
+        direction = np.divide(delta, distance[:, None], out=self._tampon("direction", m, colonnes=2))
+        overlap = np.subtract(somme_rayons, distance, out=self._tampon("overlap", m))
+
+        # Ne traiter que les balles qui se chevauchent et s'approchent
+        delta_v = self._tampon("delta_v", m, colonnes=2)
+        vitesses_i = self._tampon("positions_i", m, colonnes=2)
+        np.take(vitesses, j, axis=0, out=delta_v)
+        np.take(vitesses, i, axis=0, out=vitesses_i)
+        np.subtract(delta_v, vitesses_i, out=delta_v)
+        vitesse_relative = np.einsum('ij,ij->i', delta_v, direction, out=self._tampon("vitesse_relative", m))
+        actives = np.greater(overlap, 0, out=self._tampon("actives", m, dtype=bool))
+        actives &= vitesse_relative < 0
+        nb_contacts = int(np.count_nonzero(actives))
+        if nb_contacts == 0:
+            return 0
+        i, j, direction, overlap, vitesse_relative = self._garder(
+            actives, (i, j, direction, overlap, vitesse_relative), "actives_")
+
+        # Masse des balles (proportionnelle au volume)
+        m1 = tailles[i] ** 3
+        m2 = tailles[j] ** 3
+
+        # Impulsions
+        impulsion = (-(1 + 0.8) * vitesse_relative / (1 / m1 + 1 / m2))[:, None] * direction
+        correction = (overlap / 2)[:, None] * direction
+
+        # Accumulation (une balle peut apparaître dans plusieurs paires)
+        np.subtract.at(vitesses, i, impulsion / m1[:, None])
+        np.add.at(vitesses, j, impulsion / m2[:, None])
+        np.subtract.at(positions, i, correction)
+        np.add.at(positions, j, correction)
+
+        return nb_contacts
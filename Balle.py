@@ -1,24 +1,28 @@
 # -*- coding: utf-8 -*-
 import pygame
-import numpy as np
+import math
+import random
 from SurfaceManager import SurfaceManager
+from BallWorld import BallWorld
+from FlagAtlas import FlagAtlas
 
 
 class Balle:
     def __init__(self, taille, image=None, couleur="red", contour=None, position=(100, 100), vitesse=(0, 0),
-                 coef_gravite=0.5, coef_collision=0.8):
-        self.taille = taille
+                 coef_gravite=0.5, coef_collision=0.8, world=None):
         self.image_path = image
         self.couleur = couleur
         self.contour = contour
-        self.position = list(position)
-        self.vitesse = list(vitesse)
-        self.gravite = 980 * coef_gravite  # ~9.8 m/s² * coefficient
         self.direction = [1, 1]
-        self.coef_collision = coef_collision
 
-        # Compteur pour les logs
-        self.log_counter = 0
+        # Ligne de la balle dans un BallWorld (monde privé tant qu'elle n'est pas ajoutée à un écran)
+        self.world = None
+        self.index = -1
+        if world is None:
+            world = BallWorld(capacite=1)
+        world.ajouter(self, position, vitesse, taille,
+                      980 * coef_gravite,  # ~9.8 m/s² * coefficient
+                      coef_collision)
 
         # Référence au gestionnaire de surfaces
         self.surface_manager = SurfaceManager.get_instance()
@@ -29,75 +33,105 @@ class Balle:
         if self.image_path:
             self._prepare_image()
 
+    # Vues sur la ligne de la balle dans son BallWorld
+    @property
+    def position(self):
+        return self.world.positions[self.index]
+
+    @position.setter
+    def position(self, valeur):
+        self.world.positions[self.index] = valeur
+
+    @property
+    def vitesse(self):
+        return self.world.vitesses[self.index]
+
+    @vitesse.setter
+    def vitesse(self, valeur):
+        self.world.vitesses[self.index] = valeur
+
+    @property
+    def taille(self):
+        return float(self.world.tailles[self.index])
+
+    @taille.setter
+    def taille(self, valeur):
+        self.world.tailles[self.index] = valeur
+
+    @property
+    def gravite(self):
+        return float(self.world.gravites[self.index])
+
+    @gravite.setter
+    def gravite(self, valeur):
+        self.world.gravites[self.index] = valeur
+
+    @property
+    def coef_collision(self):
+        return float(self.world.coefs_collision[self.index])
+
+    @coef_collision.setter
+    def coef_collision(self, valeur):
+        self.world.coefs_collision[self.index] = valeur
+
     def _prepare_image(self):
-        """Charge et prépare l'image de la balle en utilisant le cache"""
+        """Obtient l'image de la balle, partagée par toutes les balles de même image, taille et contour"""
         try:
-            # Charger l'image originale
-            original_image = self.surface_manager.get_image(self.image_path)
-            if original_image is None:
-                return
-
-            # Créer une surface circulaire avec canal alpha
-            self.image = pygame.Surface((self.taille * 2, self.taille * 2), pygame.SRCALPHA)
-
-            # Redimensionner l'image originale
-            scaled_size = int(self.taille * 2.1)  # 5% plus grand
-            scaled_image = self.surface_manager.get_scaled_image(self.image_path, (scaled_size, scaled_size))
-            if scaled_image is None:
-                return
-
-            # Créer un masque circulaire (réutilisable)
-            mask_key = f"mask_{int(self.taille * 2)}"
-            if mask_key in self.surface_manager.circle_cache:
-                mask_surface = self.surface_manager.circle_cache[mask_key]
-            else:
-                mask_surface = pygame.Surface((self.taille * 2, self.taille * 2), pygame.SRCALPHA)
-                pygame.draw.circle(mask_surface, (255, 255, 255, 255), (self.taille, self.taille), self.taille)
-                self.surface_manager.circle_cache[mask_key] = mask_surface
-
-            # Découper l'image en cercle
-            self.image.fill((0, 0, 0, 0))  # Remplir avec du transparent
-            self.image.blit(scaled_image,
-                            ((self.taille * 2 - scaled_size) // 2,
-                             (self.taille * 2 - scaled_size) // 2))
-
-            # Appliquer le masque
-            self.image.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
+            self.image = self.surface_manager.get_ball_sprite(self.image_path, self.taille, self.contour,
+                                                              self._dessiner_image)
         except Exception as e:
             print(f"Erreur lors de la préparation de l'image: {self.image_path}")
             print(f"Détail de l'erreur: {e}")
             self.image = None
 
-    # Le reste des méthodes restent inchangées
-    def mettre_a_jour(self, dt):
-        # LOG: Position avant mise à jour
-        old_position = self.position.copy()
+    def _dessiner_image(self):
+        """
+        Dessine l'image de la balle : drapeau de l'atlas cuit s'il existe, sinon découpé depuis le cache
+
+        Returns:
+            pygame.Surface: Image découpée en disque, contour compris (None si l'image est illisible)
+        """
+        # Drapeau déjà découpé dans l'atlas cuit (python FlagAtlas.py)
+        image = FlagAtlas.get_instance().sprite(self.image_path, self.taille)
+        if image is not None:
+            image = image.copy() if self.contour else image
+        else:
+            # Charger l'image originale
+            original_image = self.surface_manager.get_image(self.image_path)
+            if original_image is None:
+                return None
+
+            # Redimensionner, découper en cercle et appliquer le masque
+            image = self.surface_manager.decouper_en_cercle(original_image, self.taille, self.image_path)
+            if image is None:
+                return None
+
+        # Bordure intégrée à l'image : la balle se dessine en un seul blit. Le trait est tracé vers
+        # l'intérieur depuis le bord du disque du masque (même centre et rayon), donc jamais rogné
+        if self.contour:
+            demi_cote = image.get_width() / 2
+            pygame.draw.circle(image, self.contour[0], (demi_cote, demi_cote), demi_cote, self.contour[1])
+        return image
 
+    def mettre_a_jour(self, dt):
+        """Intègre cette seule balle (Screen intègre tout le BallWorld en une passe)"""
+        vitesse = self.vitesse
         # Ajoute la gravité à la vitesse verticale
-        self.vitesse[1] += self.gravite * dt
+        vitesse[1] += self.gravite * dt
         # Met à jour la position en fonction de la vitesse
-        self.position[0] += self.vitesse[0] * dt
-        self.position[1] += self.vitesse[1] * dt
-
-        # LOG: Détecter les changements brusques de position
-        self.log_counter += 1
-        if self.log_counter % 120 == 0:  # Toutes les 2 secondes à 60 FPS
-            distance_mouvement = ((self.position[0] - old_position[0]) ** 2 + (
-                        self.position[1] - old_position[1]) ** 2) ** 0.5
+        self.position += vitesse * dt
 
     def collision_avec_balle(self, autre_balle):
-        """Gère la collision avec une autre balle de façon stable"""
-        import numpy as np
+        """Gère la collision avec une autre balle (chemin scalaire, voir BallWorld.resoudre_collisions)"""
+        x1, y1 = self.position
+        x2, y2 = autre_balle.position
 
         # Vecteur de distance entre les centres des balles
-        delta_position = np.array([
-            autre_balle.position[0] - self.position[0],
-            autre_balle.position[1] - self.position[1]
-        ])
+        dx = float(x2 - x1)
+        dy = float(y2 - y1)
 
         # Distance entre les centres
-        distance_squared = delta_position[0] ** 2 + delta_position[1] ** 2
+        distance_squared = dx * dx + dy * dy
         somme_rayons = self.taille + autre_balle.taille
 
         # Test rapide: si les balles sont trop éloignées, sortir immédiatement
@@ -107,84 +141,73 @@ class Balle:
         # Éviter division par zéro
         if distance_squared < 0.0001:  # Presque parfaitement superposées
             # Générer une direction aléatoire pour séparer les balles
-            import random
-            angle = random.uniform(0, 2 * np.pi)
-            delta_position = np.array([np.cos(angle), np.sin(angle)])
+            angle = random.uniform(0, 2 * math.pi)
+            dx, dy = math.cos(angle), math.sin(angle)
             distance = 0.01  # Petite valeur non-nulle
         else:
-            distance = np.sqrt(distance_squared)
+            distance = math.sqrt(distance_squared)
 
         # Normaliser le vecteur de direction
-        direction = delta_position / distance
+        nx = dx / distance
+        ny = dy / distance
 
         # Calcul du chevauchement
         overlap = somme_rayons - distance
+        if overlap <= 0:
+            return False
 
-        # Si collision
-        if overlap > 0:
-            # Vecteur vitesse relative
-            delta_v = np.array([
-                autre_balle.vitesse[0] - self.vitesse[0],
-                autre_balle.vitesse[1] - self.vitesse[1]
-            ])
-
-            # Produit scalaire pour déterminer si les balles s'approchent
-            vitesse_relative_selon_direction = np.dot(delta_v, direction)
-
-            # Ne traiter la collision que si les balles s'approchent
-            if vitesse_relative_selon_direction < 0:
-                # Masse des balles (proportionnelle au volume)
-                m1 = self.taille ** 3
-                m2 = autre_balle.taille ** 3
-                total_mass = m1 + m2
-
-                # Éviter division par zéro si les masses sont trop faibles
-                if total_mass < 0.0001:
-                    total_mass = 0.0001
-
-                # Calculer les impulsions
-                j = -(1 + 0.8) * vitesse_relative_selon_direction
-                j /= (1 / m1 + 1 / m2)
-
-                # Appliquer les forces
-                impulsion = j * direction
-
-                # Calculer les nouvelles vitesses
-                nouvelle_vitesse1 = np.array(self.vitesse) - (impulsion / m1)
-                nouvelle_vitesse2 = np.array(autre_balle.vitesse) + (impulsion / m2)
-
-                # Correction de position pour éviter superposition
-                correction = (overlap / 2) * direction
-                self.position[0] -= correction[0]
-                self.position[1] -= correction[1]
-                autre_balle.position[0] += correction[0]
-                autre_balle.position[1] += correction[1]
-
-                # Mise à jour des vitesses
-                self.vitesse = nouvelle_vitesse1.tolist()
-                autre_balle.vitesse = nouvelle_vitesse2.tolist()
-
-                return True
+        v1 = self.vitesse
+        v2 = autre_balle.vitesse
 
-        return False
+        # Produit scalaire pour déterminer si les balles s'approchent
+        vitesse_relative_selon_direction = (v2[0] - v1[0]) * nx + (v2[1] - v1[1]) * ny
 
-    def afficher(self, surface):
-        """Affiche la balle avec réutilisation des surfaces"""
-        # Position pour le blit (coin supérieur gauche)
-        pos_x = int(self.position[0] - self.taille)
-        pos_y = int(self.position[1] - self.taille)
+        # Ne traiter la collision que si les balles s'approchent
+        if vitesse_relative_selon_direction >= 0:
+            return False
 
+        # Masse des balles (proportionnelle au volume)
+        m1 = self.taille ** 3
+        m2 = autre_balle.taille ** 3
+
+        # Calculer les impulsions
+        j = -(1 + 0.8) * vitesse_relative_selon_direction
+        j /= (1 / m1 + 1 / m2)
+
+        # Mise à jour des vitesses
+        v1[0] -= j * nx / m1
+        v1[1] -= j * ny / m1
+        v2[0] += j * nx / m2
+        v2[1] += j * ny / m2
+
+        # Correction de position pour éviter superposition
+        correction = overlap / 2
+        p1 = self.position
+        p2 = autre_balle.position
+        p1[0] -= correction * nx
+        p1[1] -= correction * ny
+        p2[0] += correction * nx
+        p2[1] += correction * ny
+
+        return True
+
+    def surface_affichage(self):
+        """Surface à dessiner pour cette balle (image découpée ou cercle en cache), bordure comprise"""
         if self.image:
-            # Utiliser l'image préparée
-            surface.blit(self.image, (pos_x, pos_y))
-
-            # Dessiner la bordure si spécifiée
-            if self.contour:
-                pygame.draw.circle(surface, self.contour[0],
-                                   (int(self.position[0]), int(self.position[1])),
-                                   self.taille, self.contour[1])
-        else:
-            # Utiliser une surface de cercle en cache
-            circle_surface = self.surface_manager.get_circle_surface(
-                self.taille, self.couleur, self.contour)
-            surface.blit(circle_surface, (pos_x, pos_y))
\ No newline at end of file
+            return self.image
+        return self.surface_manager.get_circle_surface(self.taille, self.couleur, self.contour)
+
+    def sprite(self, position=None):
+        """
+        Couple (surface, coin supérieur gauche) de la balle, pour un Surface.blits groupé
+
+        Args:
+            position (list): Centre à utiliser (ex: interpolé) ; la position courante par défaut
+        """
+        if position is None:
+            position = self.position
+        return self.surface_affichage(), (int(position[0] - self.taille), int(position[1] - self.taille))
+
+    def afficher(self, surface, position=None):
+        """Affiche la balle avec réutilisation des surfaces (à `position` si fournie, ex: interpolée)"""
+        surface.blit(*self.sprite(position))
@@ -0,0 +1,612 @@
+# -*- coding: utf-8 -*-
+"""
+Mesures de performance des chemins critiques du jeu Bounce
+
+Usage:
+    python Benchmark.py            # tous les benchmarks
+    python Benchmark.py collisions # un benchmark précis
+"""
+import os
+import sys
+import math
+import time
+import random
+import numpy as np
+
+# Aucun affichage nécessaire pour les mesures
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from Balle import Balle
+from BallWorld import BallWorld
+from FlagAtlas import FlagAtlas
+from SurfaceManager import SurfaceManager
+
+# Mesures à froid : le singleton ne lit ni n'écrit le cache de sprites sur disque
+SurfaceManager.DOSSIER_DISQUE = None
+
+
+def creer_tas_de_balles(nb_balles, taille=(800, 600), tailles=(8, 8), seed=0):
+    """Crée un BallWorld rempli de balles tassées au hasard dans la zone donnée"""
+    rng = random.Random(seed)
+    world = BallWorld(capacite=nb_balles)
+    for _ in range(nb_balles):
+        Balle(taille=rng.uniform(*tailles),
+              position=(rng.uniform(0, taille[0]), rng.uniform(0, taille[1])),
+              vitesse=(rng.uniform(-100, 100), rng.uniform(-100, 100)),
+              world=world)
+    return world
+
+
+def paires_brutes(world):
+    """Toutes les paires (i, j) qui se chevauchent, calculées naïvement"""
+    import numpy as np
+    n = world.nb
+    positions = world.positions[:n]
+    tailles = world.tailles[:n]
+    i, j = np.triu_indices(n, k=1)
+    delta = positions[j] - positions[i]
+    somme = tailles[i] + tailles[j]
+    proches = (delta * delta).sum(axis=1) <= somme * somme
+    return i[proches], j[proches]
+
+
+def bench_collisions(nb_balles=3000, repetitions=20):
+    """Compare Balle.collision_avec_balle paire par paire et BallWorld.resoudre_collisions"""
+    print(f"\n⚙️  Collisions balle-balle ({nb_balles} balles, {repetitions} frames)")
+
+    world = creer_tas_de_balles(nb_balles)
+    paires_i, paires_j = paires_brutes(world)
+    etat = (world.positions.copy(), world.vitesses.copy())
+    print(f"   Paires candidates: {len(paires_i)}")
+
+    # Chemin historique : une paire à la fois
+    debut = time.perf_counter()
+    contacts_scalaires = 0
+    for _ in range(repetitions):
+        world.positions[:], world.vitesses[:] = etat
+        for i, j in zip(paires_i.tolist(), paires_j.tolist()):
+            if world.balles[i].collision_avec_balle(world.balles[j]):
+                contacts_scalaires += 1
+    temps_scalaire = (time.perf_counter() - debut) / repetitions
+
+    # Chemin vectorisé : toutes les paires d'un coup
+    debut = time.perf_counter()
+    contacts_vectorises = 0
+    for _ in range(repetitions):
+        world.positions[:], world.vitesses[:] = etat
+        contacts_vectorises += world.resoudre_collisions(paires_i, paires_j)
+    temps_vectorise = (time.perf_counter() - debut) / repetitions
+
+    print(f"   Paire par paire : {temps_scalaire * 1000:8.2f} ms/frame, "
+          f"{contacts_scalaires / repetitions:.0f} contacts/frame")
+    print(f"   Vectorisé       : {temps_vectorise * 1000:8.2f} ms/frame, "
+          f"{contacts_vectorises / repetitions:.0f} contacts/frame")
+    print(f"   Accélération    : x{temps_scalaire / max(temps_vectorise, 1e-9):.1f}")
+
+
+def bench_broad_phase(nb_balles=3000, frames=20):
+    """Compare les phases grossières sur un tas dense de balles au fond de l'écran"""
+    from Screen import Screen
+
+    print(f"\n🧱 Phase grossière ({nb_balles} balles en tas, {frames} frames)")
+    for broad_phase in ("quadtree", "linear_quadtree", "grid", "sap"):
+        screen = Screen(taille=(800, 600), broad_phase=broad_phase, headless=True)
+        source = creer_tas_de_balles(nb_balles, taille=(800, 150), tailles=(6, 6))
+        for balle in list(source.balles):
+            balle.position[1] += 450
+            screen.ajouter_objet(balle)
+
+        debut = time.perf_counter()
+        nb_paires = 0
+        for _ in range(frames):
+            screen.world.integrer(1 / 120)
+            paires_i, _ = screen.paires_candidates()
+            nb_paires += len(paires_i)
+        duree = (time.perf_counter() - debut) / frames
+        print(f"   {broad_phase:15s}: {duree * 1000:8.2f} ms/frame, {nb_paires / frames:.0f} paires/frame")
+
+
+def bench_faux_positifs(nb_balles=2000):
+    """Compte les paires candidates inutiles et les contacts manqués sur une scène de tailles mélangées"""
+    from Screen import Screen
+    from Quadtree import Quadtree, Rectangle
+
+    print(f"\n🎯 Faux positifs de la phase grossière ({nb_balles} balles de rayon 3 à 30)")
+    source = creer_tas_de_balles(nb_balles, taille=(800, 600), tailles=(3, 30))
+    contacts = set(zip(*(t.tolist() for t in paires_brutes(source))))
+    print(f"   Contacts réels: {len(contacts)}")
+
+    def afficher(nom, paires, duree):
+        paires = {(min(i, j), max(i, j)) for i, j in paires}
+        faux_positifs = len(paires - contacts)
+        manques = len(contacts - paires)
+        print(f"   {nom:28s}: {len(paires):7d} candidates, {faux_positifs:7d} faux positifs, "
+              f"{manques:5d} manquées, {duree * 1000:7.2f} ms")
+
+    # Avant : recherche de rayon 2 x taille autour de chaque balle, sans filtrage par rayon
+    debut = time.perf_counter()
+    quadtree = Quadtree(Rectangle(-100, -100, 1000, 800))
+    for balle in source.balles:
+        quadtree.insert(balle.position, balle.index)
+    paires = []
+    for balle in source.balles:
+        for _, j in quadtree.query_radius(balle.position, balle.taille * 2):
+            if balle.index < j:
+                paires.append((balle.index, j))
+    afficher("avant (quadtree, 2 x taille)", paires, time.perf_counter() - debut)
+
+    # Après : recherche taille + rayon max et pré-filtrage par somme des rayons
+    for broad_phase in ("quadtree", "linear_quadtree", "grid", "sap"):
+        screen = Screen(taille=(800, 600), broad_phase=broad_phase, headless=True)
+        for balle in list(source.balles):
+            screen.ajouter_objet(balle)
+        debut = time.perf_counter()
+        paires_i, paires_j = screen.paires_candidates()
+        duree = time.perf_counter() - debut
+        afficher(f"après ({broad_phase})", zip(list(paires_i), list(paires_j)), duree)
+
+        # Rendre les balles au monde source pour la phase suivante
+        for balle in list(screen.world.balles):
+            source.adopter(balle)
+
+
+def creer_scene_anneaux(nb_anneaux=60, nb_balles=300, seed=0, classe=None, **options):
+    """Écran avec des anneaux concentriques (à la CercleCloneDialog) et des balles réparties dedans"""
+    from Screen import Screen
+    from Cercle import Cercle
+
+    rng = random.Random(seed)
+    screen = (classe or Screen)(taille=(800, 600), headless=True, **options)
+    for k in range(nb_anneaux):
+        screen.ajouter_objet(Cercle([400, 300], 40 + k * 6, life=10 ** 6,
+                                    angle_ouverture=rng.choice([0, 40, 90]),
+                                    angle_rotation=rng.uniform(0, 360)))
+    for _ in range(nb_balles):
+        angle = rng.uniform(0, 2 * math.pi)
+        rayon = rng.uniform(0, 40 + nb_anneaux * 6)
+        screen.ajouter_objet(Balle(rng.uniform(3, 8),
+                                   position=(400 + rayon * math.cos(angle), 300 + rayon * math.sin(angle)),
+                                   vitesse=(rng.uniform(-200, 200), rng.uniform(-200, 200))))
+    return screen
+
+
+def bench_anneaux(nb_anneaux=60, nb_balles=300, frames=10):
+    """Compare la double boucle balle × cercle historique et le passage par l'index des anneaux"""
+    from Cercle import Cercle
+
+    print(f"\n⭕ Collisions balle-cercle ({nb_balles} balles, {nb_anneaux} anneaux, {frames} frames)")
+
+    def separer(screen):
+        balles = [obj for obj in screen.objets if isinstance(obj, Balle)]
+        cercles = [obj for obj in screen.objets if isinstance(obj, Cercle)]
+        return balles, cercles
+
+    def double_boucle(screen, filtre):
+        """Toutes les paires une par une, comme la boucle historique de Screen (filtrées par `filtre`)"""
+        for _ in range(frames):
+            screen.world.integrer(1 / 60)
+            balles, cercles = separer(screen)
+            for balle in balles:
+                for cercle in cercles[:]:
+                    if filtre(balle, cercle):
+                        screen._gerer_collision_balle_cercle(balle, cercle)
+
+    def par_index(screen):
+        """Passage par l'index des anneaux ; retourne le nombre de paires examinées"""
+        paires = 0
+        for _ in range(frames):
+            screen.world.integrer(1 / 60)
+            screen.gerer_collisions_balles_cercles(*separer(screen))
+            paires += screen.paires_balle_cercle
+        return paires
+
+    def verifier_identiques(reference, screen):
+        n = reference.world.nb
+        assert np.array_equal(reference.world.positions[:n], screen.world.positions[:n]), "positions différentes"
+        assert np.array_equal(reference.world.vitesses[:n], screen.world.vitesses[:n]), "vitesses différentes"
+        assert [c.life for c in separer(reference)[1]] == [c.life for c in separer(screen)[1]], "vies différentes"
+
+    def touche(balle, cercle):
+        """L'anneau contient la balle dans sa bande |distance - rayon| <= taille"""
+        dx = balle.position[0] - cercle.position[0]
+        dy = balle.position[1] - cercle.position[1]
+        return abs(math.hypot(dx, dy) - cercle.rayon) <= balle.taille
+
+    # Chemin historique : toutes les paires, une par une
+    historique = creer_scene_anneaux(nb_anneaux, nb_balles)
+    debut = time.perf_counter()
+    double_boucle(historique, lambda balle, cercle: True)
+    temps_boucle = (time.perf_counter() - debut) / frames
+
+    # Index des anneaux, comportement par défaut : état identique à la double boucle historique
+    screen = creer_scene_anneaux(nb_anneaux, nb_balles)
+    debut = time.perf_counter()
+    paires = par_index(screen)
+    temps_index = (time.perf_counter() - debut) / frames
+    verifier_identiques(historique, screen)
+
+    # Option anneaux_touches_seulement : identique à la double boucle limitée aux anneaux touchés
+    reference = creer_scene_anneaux(nb_anneaux, nb_balles)
+    double_boucle(reference, touche)
+    screen = creer_scene_anneaux(nb_anneaux, nb_balles, anneaux_touches_seulement=True)
+    debut = time.perf_counter()
+    paires_touches = par_index(screen)
+    temps_touches = (time.perf_counter() - debut) / frames
+    verifier_identiques(reference, screen)
+
+    print(f"   Double boucle   : {temps_boucle * 1000:8.2f} ms/frame, {nb_balles * nb_anneaux} paires/frame")
+    print(f"   Index anneaux   : {temps_index * 1000:8.2f} ms/frame, {paires / frames:.0f} paires/frame "
+          f"(x{temps_boucle / max(temps_index, 1e-9):.1f})")
+    print(f"   Anneaux touchés : {temps_touches * 1000:8.2f} ms/frame, {paires_touches / frames:.0f} paires/frame "
+          f"(x{temps_boucle / max(temps_touches, 1e-9):.1f})")
+    print("   États           : identiques à la double boucle historique (et à sa version limitée "
+          "aux anneaux touchés avec l'option)")
+
+
+def bench_debug(nb_anneaux=60, nb_balles=300, frames=10):
+    """Temps de frame du passage balle-cercle : debug désactivé, formatage immédiat historique, debug actif"""
+    from Screen import Screen
+    from Cercle import Cercle
+
+    class ScreenFormatageImmediat(Screen):
+        """Reproduit les cinq f-strings construites à chaque paire avant le journal différé"""
+
+        def _gerer_collision_balle_cercle(self, balle, cercle):
+            distance = math.dist(balle.position, cercle.position)
+            messages = [
+                f"Balle pos: {[round(float(x), 2) for x in balle.position]}, Cercle pos: {cercle.position}",
+                f"Distance: {distance:.2f}, Rayon: {cercle.rayon}, Taille balle: {balle.taille}",
+                f"Proche du cercle: {distance + balle.taille >= cercle.rayon}, "
+                f"À l'intérieur: {distance <= cercle.rayon - balle.taille}, "
+                f"À l'extérieur: {distance >= cercle.rayon + balle.taille}",
+                f"S'approche: {False}, S'éloigne: {False}",
+                f"Mode collision_sur_contact: {self.collision_sur_contact}, "
+                f"Mode brisure: {self.brisure_dans_ouverture}",
+            ]
+            for message in messages:
+                self.log_debug(message)
+            return super()._gerer_collision_balle_cercle(balle, cercle)
+
+    print(f"\n🐞 Journal de debug ({nb_balles} balles, {nb_anneaux} anneaux, {frames} frames)")
+    variantes = (
+        ("debug désactivé", Screen, False),
+        ("formatage immédiat (avant)", ScreenFormatageImmediat, False),
+        ("debug actif (tampon)", Screen, True),
+    )
+    for nom, classe, debug in variantes:
+        screen = creer_scene_anneaux(nb_anneaux, nb_balles, classe=classe, debug=debug)
+        debut = time.perf_counter()
+        for _ in range(frames):
+            screen.world.integrer(1 / 60)
+            balles = [obj for obj in screen.objets if isinstance(obj, Balle)]
+            cercles = [obj for obj in screen.objets if isinstance(obj, Cercle)]
+            screen.gerer_collisions_balles_cercles(balles, cercles)
+        duree = (time.perf_counter() - debut) / frames
+        print(f"   {nom:28s}: {duree * 1000:8.2f} ms/frame, {len(screen.journal.tampon)} entrées en tampon")
+
+
+def bench_tunnel(nb_balles=200, vitesse=8000, pas=240):
+    """Balles très rapides enfermées dans un anneau plein : fuites avec et sans détection continue"""
+    from Screen import Screen
+    from Cercle import Cercle
+
+    print(f"\n🚀 Effet tunnel ({nb_balles} balles à {vitesse} px/s dans un anneau plein, {pas} pas)")
+    for detection_continue in (False, True):
+        rng = random.Random(0)
+        screen = Screen(taille=(800, 600), headless=True, detection_continue=detection_continue)
+        screen.ajouter_objet(Cercle([400, 300], 250, life=10 ** 9))
+        for _ in range(nb_balles):
+            angle = rng.uniform(0, 2 * math.pi)
+            rayon = rng.uniform(0, 200)
+            screen.ajouter_objet(Balle(4, position=(400 + rayon * math.cos(angle), 300 + rayon * math.sin(angle)),
+                                       vitesse=(vitesse * math.cos(angle), vitesse * math.sin(angle)),
+                                       coef_gravite=0))
+
+        debut = time.perf_counter()
+        enfermees = 0
+        for _ in range(pas):
+            screen.pas_physique(1 / 120)
+        duree = (time.perf_counter() - debut) / pas
+        for balle in screen.world.balles:
+            if math.dist(balle.position, (400, 300)) < 250:
+                enfermees += 1
+        nom = "détection continue" if detection_continue else "test de proximité seul"
+        print(f"   {nom:24s}: {duree * 1000:8.2f} ms/pas, {enfermees}/{nb_balles} balles encore enfermées")
+
+
+def bench_particules(nb_explosions=40, pas=120):
+    """Compare la mise à jour des particules objet par objet et le ParticleSystem en tableaux"""
+    import numpy as np
+    from Particule import Particule, StyleExplosion
+    from ParticleSystem import ParticleSystem
+
+    print(f"\n✨ Particules ({nb_explosions} explosions de 75 particules, {pas} pas)")
+
+    # Chemin historique : un objet Particule par particule, filtrage par liste
+    random.seed(0)
+    particules = []
+    for e in range(nb_explosions):
+        for i in range(75):
+            angle = i / 75 * 2 * math.pi
+            particules.append(Particule([400 + 100 * math.cos(angle), 300 + 100 * math.sin(angle)],
+                                        style=StyleExplosion.FIREWORK, direction_angle=angle))
+    debut = time.perf_counter()
+    for _ in range(pas):
+        for particule in particules:
+            particule.mettre_a_jour(1 / 120)
+        particules = [particule for particule in particules if particule.vie > 0]
+    temps_objets = (time.perf_counter() - debut) / pas
+
+    # Tableaux : un pas vectorisé, compactage en bloc
+    systeme = ParticleSystem()
+    systeme.rng = np.random.default_rng(0)
+    for _ in range(nb_explosions):
+        systeme.explosion([400, 300], 100, style=StyleExplosion.FIREWORK)
+    debut = time.perf_counter()
+    for _ in range(pas):
+        systeme.mettre_a_jour(1 / 120)
+    temps_tableaux = (time.perf_counter() - debut) / pas
+
+    print(f"   Objets Particule : {temps_objets * 1000:8.3f} ms/pas, {len(particules)} restantes")
+    print(f"   ParticleSystem   : {temps_tableaux * 1000:8.3f} ms/pas, {systeme.nb} restantes")
+    print(f"   Accélération     : x{temps_objets / max(temps_tableaux, 1e-9):.1f}")
+
+    # Rendu : une Surface par point de traînée, ou sprites de l'atlas en un Surface.blits
+    import pygame
+    cible = pygame.Surface((800, 600))
+    debut = time.perf_counter()
+    for particule in particules:
+        particule.afficher(cible)
+    temps_surfaces = time.perf_counter() - debut
+    debut = time.perf_counter()
+    systeme.afficher(cible)
+    temps_atlas = time.perf_counter() - debut
+    print(f"   Rendu Particule.afficher : {temps_surfaces * 1000:8.2f} ms/frame")
+    print(f"   Rendu atlas + blits      : {temps_atlas * 1000:8.2f} ms/frame (premier appel, atlas à remplir)")
+    debut = time.perf_counter()
+    systeme.afficher(cible)
+    print(f"   Rendu atlas + blits      : {(time.perf_counter() - debut) * 1000:8.2f} ms/frame (atlas chaud)")
+
+
+def bench_rendu(nb_balles=5000, nb_anneaux=40, frames=10):
+    """Compare le rendu objet par objet (appartenance statique en liste) et le lot unique Surface.blits"""
+    from Screen import Screen
+    from Cercle import Cercle
+
+    print(f"\n🖼️  Rendu ({nb_balles} balles drapeaux, {nb_anneaux} anneaux fixes, {frames} frames)")
+    rng = random.Random(0)
+    screen = Screen(taille=(1200, 800))
+    drapeaux = sorted(os.listdir("Images"))[:50]
+    for k in range(nb_anneaux):
+        screen.ajouter_objet(Cercle([600, 400], 60 + k * 8, life=10 ** 6))
+    for _ in range(nb_balles):
+        screen.ajouter_objet(Balle(rng.choice((6, 8, 10)), image=os.path.join("Images", rng.choice(drapeaux)),
+                                   contour=((255, 255, 255), 1),
+                                   position=(rng.uniform(0, 1200), rng.uniform(0, 800))))
+    screen.mettre_a_jour_surface_statique()
+
+    # Avant : un afficher() par objet, statiques cherchés dans une liste
+    statiques = list(screen.static_objects)
+    debut = time.perf_counter()
+    for _ in range(frames):
+        screen.ecran.fill(screen.couleur_fond)
+        screen.ecran.blit(screen.static_surface, (0, 0))
+        for obj in screen.objets:
+            if obj not in statiques:
+                obj.afficher(screen.ecran)
+    temps_objets = (time.perf_counter() - debut) / frames
+
+    # Après : une liste de (surface, destination) et un seul Surface.blits
+    debut = time.perf_counter()
+    for _ in range(frames):
+        screen.ecran.fill(screen.couleur_fond)
+        screen.ecran.blits(screen.lots_de_rendu(), doreturn=False)
+    temps_lot = (time.perf_counter() - debut) / frames
+
+    print(f"   afficher() par objet : {temps_objets * 1000:8.2f} ms/frame")
+    print(f"   Surface.blits groupé : {temps_lot * 1000:8.2f} ms/frame")
+    print(f"   Accélération         : x{temps_objets / max(temps_lot, 1e-9):.1f}")
+
+
+def bench_arcs(nb_arcs=30, frames=60):
+    """Compare le redessin suréchantillonné des arcs tournants à chaque frame et le cache des rotations"""
+    from Cercle import Cercle
+    import pygame
+
+    print(f"\n🌀 Arcs tournants ({nb_arcs} clones de 3 géométries, {frames} frames)")
+    cible = pygame.Surface((800, 600))
+    arcs = [Cercle([400, 300], 100 + 40 * (k % 3), epaisseur=3, life=10, angle_ouverture=45,
+                   angle_rotation=k * 12, vitesse_rotation=90) for k in range(nb_arcs)]
+
+    # Avant : chaque arc redessine sa surface à 4x puis smoothscale à chaque frame
+    debut = time.perf_counter()
+    for _ in range(frames):
+        for arc in arcs:
+            arc.mettre_a_jour(1 / 60)
+            surface = arc.dessiner_surface(arc.couleur_vie(1.0), arc.angle_rotation)
+            cible.blit(surface, (arc.position[0] - arc.rayon - arc.epaisseur,
+                                 arc.position[1] - arc.rayon - arc.epaisseur))
+    temps_redessin = (time.perf_counter() - debut) / frames
+
+    # Après : une surface par géométrie et angle quantifié de 0 à 45°, en cache LRU partagé
+    surface_manager = SurfaceManager.get_instance()
+    debut = time.perf_counter()
+    for _ in range(frames):
+        for arc in arcs:
+            arc.mettre_a_jour(1 / 60)
+            cible.blit(*arc.sprite())
+    temps_cache = (time.perf_counter() - debut) / frames
+
+    rotations = surface_manager.arcs_tournes
+    print(f"   Redessin à chaque frame : {temps_redessin * 1000:8.2f} ms/frame")
+    print(f"   Cache des rotations     : {temps_cache * 1000:8.2f} ms/frame "
+          f"({len(surface_manager.arcs_de_base)} bases, {len(rotations)} rotations, "
+          f"{rotations.hits} hits, {rotations.misses} misses)")
+    print(f"   Accélération            : x{temps_redessin / max(temps_cache, 1e-9):.1f}")
+    assert rotations.hits > 0, "Aucune rotation d'arc relue du cache"
+
+
+def bench_prerendu(nb_anneaux=500, nb_geometries=25):
+    """Prérendu de nombreux anneaux clonés : dessin par cercle contre surfaces partagées du SurfaceManager"""
+    from Cercle import Cercle
+
+    print(f"\n💍 Prérendu des anneaux ({nb_anneaux} anneaux, {nb_geometries} géométries distinctes)")
+    anneaux = [Cercle([400, 300], 40 + 12 * (k % nb_geometries), epaisseur=3, life=10,
+                      angle_ouverture=(k % nb_geometries) % 3 * 30, angle_rotation=90)
+               for k in range(nb_anneaux)]
+
+    # Avant : chaque cercle dessine sa propre surface
+    debut = time.perf_counter()
+    for anneau in anneaux:
+        anneau.dessiner_surface(anneau.couleur_vie(1.0), anneau.angle_rotation)
+    temps_individuel = time.perf_counter() - debut
+
+    # Après : une surface par géométrie, partagée
+    surface_manager = SurfaceManager.get_instance()
+    surface_manager.anneaux.clear()
+    debut = time.perf_counter()
+    for anneau in anneaux:
+        anneau.creer_surface_prerendue()
+    temps_partage = time.perf_counter() - debut
+
+    stats = surface_manager.anneaux.stats()
+    print(f"   Une surface par cercle : {temps_individuel * 1000:8.1f} ms")
+    print(f"   Surfaces partagées     : {temps_partage * 1000:8.1f} ms "
+          f"({stats['entrees']} surfaces, {stats['octets'] / 1e6:.1f} Mo, {stats['hits']} hits, "
+          f"{stats['misses']} misses, {stats['evictions']} évictions)")
+
+
+def bench_trace(repetitions=5):
+    """Temps de tracé d'un anneau et d'un arc par rayon, et taille de la surface 4x qu'il n'alloue plus"""
+    from Cercle import Cercle
+
+    print(f"\n✏️  Tracé anticrénelé NumPy ({repetitions} tracés par forme)")
+    for rayon in (50, 150, 400, 800):
+        for ouverture in (0, 45):
+            cercle = Cercle([0, 0], rayon, epaisseur=3, angle_ouverture=ouverture, angle_rotation=30)
+            debut = time.perf_counter()
+            for _ in range(repetitions):
+                surface = cercle.dessiner_surface((0, 255, 0), cercle.angle_rotation)
+            duree = (time.perf_counter() - debut) / repetitions
+            cote_4x = surface.get_width() * 4
+            forme = "arc   " if ouverture else "cercle"
+            print(f"   {forme} rayon {rayon:4d}: {duree * 1000:7.2f} ms "
+                  f"(surface 4x évitée : {cote_4x}x{cote_4x}, {cote_4x * cote_4x * 4 / 1e6:.0f} Mo)")
+
+
+def bench_caches(nb_balles=2000, budget_images=2 * 1024 * 1024):
+    """Remplit les caches du SurfaceManager avec un petit budget d'images et affiche leurs statistiques"""
+
+    print(f"\n🗄️  Caches de surfaces ({nb_balles} balles drapeaux, budget images {budget_images / 1e6:.0f} Mo)")
+    surface_manager = SurfaceManager.get_instance()
+    surface_manager.configurer_budgets(image_cache=budget_images)
+    atlas = FlagAtlas.get_instance()
+    FlagAtlas._instance = FlagAtlas(dossier=os.devnull)  # Sans atlas cuit : les caches d'images servent
+    rng = random.Random(0)
+    drapeaux = sorted(os.listdir("Images"))
+    debut = time.perf_counter()
+    balles = [Balle(rng.choice((6, 8, 10, 12, 15, 20)), image=os.path.join("Images", rng.choice(drapeaux)))
+              for _ in range(nb_balles)]
+    print(f"   Création : {(time.perf_counter() - debut) * 1000:.0f} ms, "
+          f"{len({id(balle.image) for balle in balles})} images distinctes")
+    for nom, stats in surface_manager.stats().items():
+        print(f"   {nom:16s}: {stats['entrees']:6d} entrées, {stats['octets'] / 1e6:6.1f} / "
+              f"{stats['max_octets'] / 1e6:6.1f} Mo, {stats['hits']:6d} hits, {stats['misses']:6d} misses, "
+              f"{stats['evictions']:6d} évictions")
+    surface_manager.configurer_budgets(image_cache=SurfaceManager.BUDGETS["image_cache"])
+    FlagAtlas._instance = atlas
+
+
+def bench_atlas(nb_balles=5000, tailles=(8, 15)):
+    """Création de balles drapeaux : découpe à la création contre atlas cuit par FlagAtlas.py"""
+    import tempfile
+    import pygame
+
+    print(f"\n🏳️  Atlas de drapeaux ({nb_balles} balles, tailles {', '.join(f'{t:g}' for t in tailles)})")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    drapeaux = sorted(os.listdir("Images"))
+    atlas = FlagAtlas.get_instance()
+
+    with tempfile.TemporaryDirectory() as dossier:
+        debut = time.perf_counter()
+        FlagAtlas.cuire(tailles, dossier_sortie=dossier)
+        print(f"   Cuisson            : {(time.perf_counter() - debut) * 1000:7.0f} ms")
+
+        for nom, source in (("Découpe à la volée", os.devnull), ("Atlas cuit", dossier)):
+            for cache in SurfaceManager.get_instance().caches().values():
+                cache.clear()
+            FlagAtlas._instance = FlagAtlas(dossier=source)
+            rng = random.Random(0)
+            debut = time.perf_counter()
+            for _ in range(nb_balles):
+                Balle(rng.choice(tailles), image=os.path.join("Images", rng.choice(drapeaux)))
+            print(f"   {nom:19s}: {(time.perf_counter() - debut) * 1000:7.0f} ms")
+
+    FlagAtlas._instance = atlas
+
+
+def bench_disque(nb_anneaux=60, nb_balles=2000):
+    """Lancement à froid puis à chaud avec le cache de sprites sur disque (anneaux et balles drapeaux)"""
+    import tempfile
+    import pygame
+    from Cercle import Cercle
+
+    print(f"\n💾 Cache de sprites sur disque ({nb_anneaux} anneaux, {nb_balles} balles drapeaux)")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    drapeaux = sorted(os.listdir("Images"))
+    singleton = SurfaceManager._instance
+    atlas = FlagAtlas.get_instance()
+    FlagAtlas._instance = FlagAtlas(dossier=os.devnull)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for nom in ("Lancement à froid", "Lancement à chaud"):
+            # Un nouveau gestionnaire par lancement : seuls les fichiers du dossier sont conservés
+            SurfaceManager._instance = SurfaceManager(dossier_disque=dossier)
+            rng = random.Random(0)
+            debut = time.perf_counter()
+            for k in range(nb_anneaux):
+                Cercle([400, 300], 40 + 6 * k, epaisseur=3, angle_ouverture=(k % 3) * 30,
+                       angle_rotation=90).creer_surface_prerendue()
+            for _ in range(nb_balles):
+                Balle(rng.choice((6, 8, 10, 12, 15, 20)), image=os.path.join("Images", rng.choice(drapeaux)))
+            stats = SurfaceManager._instance.cache_disque.stats()
+            print(f"   {nom}: {(time.perf_counter() - debut) * 1000:7.0f} ms "
+                  f"({stats['lectures']} lectures, {stats['ecritures']} écritures)")
+
+    SurfaceManager._instance = singleton
+    FlagAtlas._instance = atlas
+
+
+BENCHMARKS = {
+    "collisions": bench_collisions,
+    "broad_phase": bench_broad_phase,
+    "faux_positifs": bench_faux_positifs,
+    "anneaux": bench_anneaux,
+    "debug": bench_debug,
+    "tunnel": bench_tunnel,
+    "particules": bench_particules,
+    "rendu": bench_rendu,
+    "arcs": bench_arcs,
+    "prerendu": bench_prerendu,
+    "trace": bench_trace,
+    "caches": bench_caches,
+    "atlas": bench_atlas,
+    "disque": bench_disque,
+}
+
+
+def main():
+    """Point d'entrée principal"""
+    noms = sys.argv[1:] or list(BENCHMARKS)
+    for nom in noms:
+        if nom not in BENCHMARKS:
+            print(f"❌ Benchmark inconnu: {nom} (disponibles: {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[nom]()
+
+
+if __name__ == "__main__":
+    main()
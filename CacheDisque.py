@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import os
+import struct
+import hashlib
+import numpy as np
+import pygame
+
+
+class CacheDisque:
+    """Cache persistant de sprites dérivés : un fichier de pixels RGBA bruts par sprite, relu sans décodage"""
+
+    VERSION = 2  # Format des entrées (le contenu du code de dessin fait déjà partie de la clé de chaque entrée)
+    EXTENSION = ".rgba"
+    ENTETE = struct.Struct("<II")  # Largeur, hauteur
+    REMPLISSAGE_APRES_PURGE = 0.9  # Fraction du budget visée par une purge (évite de purger à chaque écriture)
+
+    def __init__(self, dossier, max_octets=256 * 1024 * 1024):
+        """
+        Prépare le cache sans toucher au disque : le dossier n'est créé (puis purgé au-delà du budget)
+        qu'à la première écriture
+
+        Args:
+            dossier (str): Dossier des fichiers du cache
+            max_octets (int): Taille maximale du dossier
+        """
+        self.dossier = dossier
+        self.max_octets = max_octets
+        self.empreintes = {}  # (chemin absolu, date, taille du fichier) -> hash du contenu
+        self.lectures = 0
+        self.ecritures = 0
+        self.octets = 0  # Taille du dossier, tenue à jour à chaque écriture après la purge d'ouverture
+        self.ouvert = False  # Dossier créé et purgé
+        self.inutilisable = False  # Dossier impossible à créer : plus aucune écriture tentée
+
+    def empreinte(self, source):
+        """
+        Hash du contenu d'un fichier source, recalculé seulement quand sa date ou sa taille change
+
+        Returns:
+            str: Hash hexadécimal, ou None si le fichier est absent
+        """
+        chemin = os.path.abspath(source)
+        try:
+            infos = os.stat(chemin)
+        except OSError:
+            return None
+        cle = (chemin, infos.st_mtime_ns, infos.st_size)
+        if cle not in self.empreintes:
+            with open(chemin, 'rb') as f:
+                self.empreintes[cle] = hashlib.sha1(f.read()).hexdigest()
+        return self.empreintes[cle]
+
+    def chemin(self, parametres, source=None, code=()):
+        """
+        Fichier d'une entrée : hash des paramètres de transformation, du contenu de la source et du code de dessin
+
+        Args:
+            parametres (tuple): Paramètres du sprite (type, taille, contour, géométrie...)
+            source (str): Image dont le sprite est dérivé, ou None
+            code (tuple): Fichiers Python qui dessinent le sprite : les modifier invalide l'entrée
+
+        Returns:
+            str: Chemin du fichier, ou None si la source est introuvable
+        """
+        empreinte = None
+        if source is not None:
+            empreinte = self.empreinte(source)
+            if empreinte is None:
+                return None
+        empreintes_code = tuple(self.empreinte(fichier) for fichier in code)
+        cle = repr((self.VERSION, empreinte, empreintes_code, parametres)).encode('utf-8')
+        return os.path.join(self.dossier, hashlib.sha1(cle).hexdigest() + self.EXTENSION)
+
+    def contient(self, parametres, source=None, code=()):
+        """True si le sprite est dans le cache (sans le relire)"""
+        chemin = self.chemin(parametres, source, code)
+        return chemin is not None and os.path.exists(chemin)
+
+    def charger(self, parametres, source=None, code=()):
+        """
+        Relit un sprite du cache (pixels projetés en mémoire, sans décodage d'image)
+
+        Returns:
+            pygame.Surface: Sprite avec canal alpha, ou None si absent (ou source ou code de dessin modifiés depuis)
+        """
+        chemin = self.chemin(parametres, source, code)
+        if chemin is None or not os.path.exists(chemin):
+            return None
+        try:
+            with open(chemin, 'rb') as f:
+                largeur, hauteur = self.ENTETE.unpack(f.read(self.ENTETE.size))
+            pixels = np.memmap(chemin, dtype=np.uint8, mode='r', offset=self.ENTETE.size,
+                               shape=(hauteur * largeur * 4,))
+            surface = pygame.image.frombuffer(pixels, (largeur, hauteur), "RGBA")
+            # Copie détachée du fichier (convertie au format de l'écran si une fenêtre existe)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            else:
+                surface = surface.copy()
+        except (OSError, ValueError, struct.error, pygame.error) as e:
+            print(f"Entrée de cache illisible {chemin}: {e}")
+            return None
+        self.lectures += 1
+        return surface
+
+    def ouvrir(self):
+        """
+        Crée le dossier du cache et supprime les entrées au-delà du budget (une seule fois : ensuite
+        enregistrer tient la taille du dossier à jour et purge dès qu'elle dépasse le budget)
+
+        Returns:
+            bool: True si le dossier est utilisable
+        """
+        if not self.ouvert and not self.inutilisable:
+            try:
+                os.makedirs(self.dossier, exist_ok=True)
+                self.purger()
+                self.ouvert = True
+            except OSError as e:
+                print(f"Cache de sprites sur disque désactivé ({self.dossier}): {e}")
+                self.inutilisable = True
+        return self.ouvert
+
+    def enregistrer(self, parametres, surface, source=None, code=()):
+        """Écrit un sprite dans le cache (écriture atomique : fichier temporaire puis renommage)"""
+        if surface is None or not self.ouvrir():
+            return
+        chemin = self.chemin(parametres, source, code)
+        if chemin is None:
+            return
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        try:
+            remplace = os.path.getsize(chemin) if os.path.exists(chemin) else 0
+            with open(temporaire, 'wb') as f:
+                f.write(self.ENTETE.pack(*surface.get_size()))
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(temporaire, chemin)
+            self.ecritures += 1
+            self.octets += os.path.getsize(chemin) - remplace
+        except OSError as e:
+            print(f"Impossible d'écrire l'entrée de cache {chemin}: {e}")
+            return
+
+        if self.octets > self.max_octets:
+            try:
+                self.purger(self.max_octets * self.REMPLISSAGE_APRES_PURGE)
+            except OSError as e:
+                print(f"Impossible de purger le cache {self.dossier}: {e}")
+
+    def purger(self, cible=None):
+        """
+        Supprime les entrées les moins récemment écrites tant que le dossier dépasse `cible`, puis recompte sa taille
+
+        Args:
+            cible (int): Taille visée en octets (par défaut le budget max_octets)
+        """
+        if cible is None:
+            cible = self.max_octets
+        entrees = []
+        for nom in os.listdir(self.dossier):
+            chemin = os.path.join(self.dossier, nom)
+            try:
+                infos = os.stat(chemin)
+            except OSError:
+                continue
+            entrees.append((infos.st_mtime, infos.st_size, chemin))
+
+        total = sum(taille for _, taille, _ in entrees)
+        for _, taille, chemin in sorted(entrees):
+            if total <= cible:
+                break
+            try:
+                os.remove(chemin)
+                total -= taille
+            except OSError:
+                pass
+        self.octets = total
+
+    def stats(self):
+        """Compteurs du cache : lectures et écritures depuis l'ouverture, taille du dossier"""
+        return {"lectures": self.lectures, "ecritures": self.ecritures, "octets": self.octets}
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """Cache borné en entrées et/ou en octets : les entrées les moins récemment utilisées sont évincées"""
+
+    def __init__(self, max_entrees=None, max_octets=None, poids=None):
+        """
+        Initialise un cache vide
+
+        Args:
+            max_entrees (int): Nombre maximal d'entrées conservées (256 si aucune borne n'est donnée)
+            max_octets (int): Budget en octets, mesuré par `poids`
+            poids (callable): Taille en octets d'une valeur (ex: SurfaceManager.octets_surface)
+        """
+        if max_entrees is None and max_octets is None:
+            max_entrees = 256
+        self.max_entrees = max(1, int(max_entrees)) if max_entrees is not None else None
+        self.max_octets = int(max_octets) if max_octets is not None else None
+        self.poids = poids or (lambda valeur: 0)
+        self.entrees = OrderedDict()  # clé -> (valeur, octets)
+        self.octets = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entrees)
+
+    def __contains__(self, cle):
+        return cle in self.entrees
+
+    def get(self, cle, defaut=None):
+        """Retourne la valeur associée à la clé (et la marque comme récente), ou `defaut`"""
+        entree = self.entrees.get(cle)
+        if entree is None:
+            self.misses += 1
+            return defaut
+        self.entrees.move_to_end(cle)
+        self.hits += 1
+        return entree[0]
+
+    def put(self, cle, valeur):
+        """Ajoute ou remplace une entrée puis évince les plus anciennes tant qu'une borne est dépassée"""
+        ancienne = self.entrees.pop(cle, None)
+        if ancienne is not None:
+            self.octets -= ancienne[1]
+        octets = self.poids(valeur)
+        self.entrees[cle] = (valeur, octets)
+        self.octets += octets
+
+        # La dernière entrée ajoutée est toujours conservée, même seule au-dessus du budget
+        self._evincer(garder=1)
+        return valeur
+
+    def redimensionner(self, max_octets):
+        """Change le budget en octets puis évince les entrées les plus anciennes jusqu'à le respecter"""
+        self.max_octets = int(max_octets) if max_octets is not None else None
+        self._evincer(garder=0)
+
+    def _evincer(self, garder):
+        """Évince les entrées les plus anciennes tant qu'une borne est dépassée (en conservant `garder` entrées)"""
+        while len(self.entrees) > garder and self._deborde():
+            _, (_, octets_evinces) = self.entrees.popitem(last=False)
+            self.octets -= octets_evinces
+            self.evictions += 1
+
+    def _deborde(self):
+        """True si une des bornes est dépassée"""
+        if self.max_entrees is not None and len(self.entrees) > self.max_entrees:
+            return True
+        return self.max_octets is not None and self.octets > self.max_octets
+
+    def stats(self):
+        """Compteurs du cache : entrées, octets, budget, hits, misses, évictions"""
+        return {
+            "entrees": len(self.entrees),
+            "octets": self.octets,
+            "max_octets": self.max_octets,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        self.entrees.clear()
+        self.octets = 0
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 import pygame
 import math
+import numpy as np
+from SurfaceManager import SurfaceManager
 
 
 class Cercle:
+    PALIERS_VIE = 20  # Paliers de couleur selon la vie (un par tranche de 5 %), partagés entre cercles identiques
+    PAS_ANGLE = 1  # Quantification minimale de l'angle des sprites d'arcs tournants, en degrés
+    PAS_ANGLE_MAX = 6  # Au-delà, les rotations d'un arc ne sont plus mises en cache mais calculées à chaque frame
+
     def __init__(self, position, rayon, couleur="black", epaisseur=2, life=20, angle_ouverture=0, angle_rotation=0,
                  vitesse_rotation=0):
         self.position = position
@@ -22,21 +28,13 @@ class Cercle:
         self.surface_prerendue = None
         self.rect_surface = None
         self.derniers_params = {}
-        self.derniere_life_ratio = -1  # Pour détecter les changements de couleur basés sur life
+        self.dernier_palier_vie = -1  # Pour détecter les changements de couleur basés sur life
 
     def mettre_a_jour(self, dt):
-        """Met à jour la rotation de l'arc"""
-        rotation_modifiee = False
-
+        """Met à jour la rotation de l'arc (dessiné ensuite depuis le cache des rotations, voir sprite_tournant)"""
         if self.vitesse_rotation != 0:
             self.angle_rotation += self.vitesse_rotation * dt
             self.angle_rotation = self.angle_rotation % 360  # Garder l'angle entre 0 et 360
-            rotation_modifiee = True
-
-        # Si la rotation a changé, il faut recréer la surface prérendue
-        if rotation_modifiee and self.surface_prerendue is not None:
-            # On indique que la surface doit être recréée en la mettant à None
-            self.surface_prerendue = None
 
     def est_dans_ouverture(self, position_balle, rayon_balle=0):
         """Vérifie si une balle est entièrement dans l'ouverture (partie invisible) de l'arc"""
@@ -108,101 +106,104 @@ class Cercle:
 
     def a_change(self):
         """Vérifie si le cercle a changé depuis le dernier prérendu"""
-        # Calculer le ratio actuel de vie
-        ratio = max(0, min(1, self.life / self.life_max))
-
         # Vérifier si l'un des paramètres a changé
         return (not self.derniers_params or
                 self.derniers_params['rayon'] != self.rayon or
                 self.derniers_params['epaisseur'] != self.epaisseur or
-                self.derniers_params['angle_rotation'] != self.angle_rotation or
+                (self.angle_ouverture > 0 and self.derniers_params['angle_rotation'] != self.angle_rotation) or
                 self.derniers_params['angle_ouverture'] != self.angle_ouverture or
-                abs(self.derniere_life_ratio - ratio) > 0.05)  # 5% de changement de couleur
+                self.dernier_palier_vie != self.palier_vie())  # 5% de changement de couleur
 
-    def creer_surface_prerendue(self):
-        """Crée une surface prérendue pour ce cercle"""
-        # Calcul de la proportion de vie restante (entre 0 et 1)
+    def palier_vie(self):
+        """Palier de couleur (0 à PALIERS_VIE) correspondant à la proportion de vie restante"""
         ratio = max(0, min(1, self.life / self.life_max))
+        return round(ratio * self.PALIERS_VIE)
 
-        # Interpolation de vert à rouge
+    @staticmethod
+    def couleur_vie(ratio):
+        """Couleur d'un cercle selon sa proportion de vie : interpolation de rouge (0) à vert (1)"""
         r = int(255 * (1 - ratio))  # de 0 à 255
         g = int(255 * ratio)  # de 255 à 0
         b = 0
-        couleur = (r, g, b)
+        return (r, g, b)
 
+    def rayons_anneau(self):
+        """Rayons extérieur et intérieur de la partie tracée"""
         if self.angle_ouverture == 0:
-            # Dessiner un cercle complet (ancien comportement)
-            # Surface temporaire plus grande pour lisser
-            scale_factor = 4
-            rayon_grand = self.rayon * scale_factor
-            taille_surface = rayon_grand * 2
-
-            # Création de la surface temporaire avec canal alpha
-            temp_surface = pygame.Surface((taille_surface, taille_surface), pygame.SRCALPHA)
-            centre = (rayon_grand, rayon_grand)
-
-            # Dessin du cercle sur la surface temporaire
-            pygame.draw.circle(temp_surface, (*couleur, 255), centre, rayon_grand, self.epaisseur * scale_factor)
-
-            # Réduction de la surface pour un effet lissé
-            cercle_lisse = pygame.transform.smoothscale(temp_surface, (self.rayon * 2, self.rayon * 2))
-
-            # Stocker comme surface prérendue
-            self.surface_prerendue = cercle_lisse
-            self.rect_surface = self.surface_prerendue.get_rect(
-                center=(self.position[0], self.position[1])
-            )
-        else:
-            # Dessiner un arc (la partie visible = 360° - angle_ouverture)
+            # Cercle complet : l'épaisseur est tracée vers l'intérieur depuis le rayon
+            return self.rayon, self.rayon - self.epaisseur
+        # Arc : l'épaisseur est centrée sur le rayon
+        return self.rayon + self.epaisseur / 2, self.rayon - self.epaisseur / 2
+
+    def cote_surface(self):
+        """Côté de la surface dessinée par dessiner_surface"""
+        # Le bord anticrénelé déborde d'un demi-pixel au-delà du rayon extérieur : marge d'un pixel
+        return 2 * math.ceil(self.rayons_anneau()[0]) + 2
+
+    def dessiner_surface(self, couleur, angle_rotation):
+        """
+        Dessine le cercle (ou l'arc tourné de `angle_rotation`) avec anticrénelage
+
+        La couverture de chaque pixel est calculée directement avec NumPy à partir de sa
+        distance au centre (bords de l'anneau) et, pour un arc, de son angle (bords de
+        l'ouverture), puis écrite dans le canal alpha : ni surface temporaire agrandie,
+        ni boucle de segments.
+
+        Returns:
+            pygame.Surface: Surface carrée centrée sur le cercle, avec un pixel de marge autour du bord extérieur
+        """
+        rayon_exterieur, rayon_interieur = self.rayons_anneau()
+        cote = self.cote_surface()
+
+        # Distance de chaque centre de pixel au centre de la surface (tableaux indexés [x, y])
+        coords = np.arange(cote, dtype=np.float32) + 0.5 - cote / 2
+        dx = coords[:, None]
+        dy = coords[None, :]
+        distances = np.sqrt(dx * dx + dy * dy)
+
+        # Couverture radiale : filtre boîte d'un pixel sur les deux bords de l'anneau
+        couverture = np.clip(distances - rayon_interieur + 0.5, 0, 1)
+        couverture *= np.clip(rayon_exterieur - distances + 0.5, 0, 1)
+
+        if self.angle_ouverture > 0:
+            # Partie visible : de la fin de l'ouverture sur 360° - ouverture, dans le sens horaire à l'écran
             angle_visible = 360 - self.angle_ouverture
+            debut = angle_rotation + self.angle_ouverture / 2
+
+            # Angles calculés seulement sur les pixels de l'anneau
+            xs, ys = np.nonzero(couverture)
+            relatifs = (np.degrees(np.arctan2(coords[ys], coords[xs])) - debut) % 360
 
-            # Convertir les angles en radians pour la partie VISIBLE
-            angle_debut_visible = math.radians(self.angle_rotation + self.angle_ouverture / 2)
-            angle_fin_visible = math.radians(self.angle_rotation + self.angle_ouverture / 2 + angle_visible)
-
-            # Créer une surface temporaire pour dessiner l'arc avec anti-aliasing
-            scale_factor = 4
-            rayon_grand = self.rayon * scale_factor
-            epaisseur_grande = self.epaisseur * scale_factor
-            taille_surface = rayon_grand * 2 + epaisseur_grande * 2
-
-            temp_surface = pygame.Surface((taille_surface, taille_surface), pygame.SRCALPHA)
-            centre_temp = (taille_surface // 2, taille_surface // 2)
-
-            # Dessiner l'arc en utilisant des lignes pour un meilleur rendu
-            num_segments = max(10, int(angle_visible / 2))  # Plus de segments pour les gros arcs
-            angle_step = (angle_fin_visible - angle_debut_visible) / num_segments
-
-            for i in range(num_segments):
-                angle1 = angle_debut_visible + i * angle_step
-                angle2 = angle_debut_visible + (i + 1) * angle_step
-
-                # Points de l'arc externe
-                x1_ext = centre_temp[0] + (rayon_grand + epaisseur_grande // 2) * math.cos(angle1)
-                y1_ext = centre_temp[1] + (rayon_grand + epaisseur_grande // 2) * math.sin(angle1)
-                x2_ext = centre_temp[0] + (rayon_grand + epaisseur_grande // 2) * math.cos(angle2)
-                y2_ext = centre_temp[1] + (rayon_grand + epaisseur_grande // 2) * math.sin(angle2)
-
-                # Points de l'arc interne
-                x1_int = centre_temp[0] + (rayon_grand - epaisseur_grande // 2) * math.cos(angle1)
-                y1_int = centre_temp[1] + (rayon_grand - epaisseur_grande // 2) * math.sin(angle1)
-                x2_int = centre_temp[0] + (rayon_grand - epaisseur_grande // 2) * math.cos(angle2)
-                y2_int = centre_temp[1] + (rayon_grand - epaisseur_grande // 2) * math.sin(angle2)
-
-                # Dessiner le segment comme un polygone
-                points = [(x1_ext, y1_ext), (x2_ext, y2_ext), (x2_int, y2_int), (x1_int, y1_int)]
-                pygame.draw.polygon(temp_surface, (*couleur, 255), points)
-
-            # Réduire et stocker
-            arc_lisse = pygame.transform.smoothscale(temp_surface,
-                                                     (self.rayon * 2 + self.epaisseur * 2,
-                                                      self.rayon * 2 + self.epaisseur * 2))
-
-            # Stocker comme surface prérendue
-            self.surface_prerendue = arc_lisse
-            self.rect_surface = self.surface_prerendue.get_rect(
-                center=(self.position[0], self.position[1])
-            )
+            # Distance signée au bord le plus proche (positive dans la partie visible), en pixels d'arc
+            dedans = np.minimum(relatifs, angle_visible - relatifs)
+            dehors = np.minimum(relatifs - angle_visible, 360 - relatifs)
+            ecarts = np.where(relatifs <= angle_visible, dedans, -dehors)
+            couverture[xs, ys] *= np.clip(np.radians(ecarts) * distances[xs, ys] + 0.5, 0, 1)
+
+        surface = pygame.Surface((cote, cote), pygame.SRCALPHA)
+        surface.fill((*couleur, 0))
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[:] = (couverture * 255 + 0.5).astype(np.uint8)
+        del alpha  # Libère le verrou de la surface
+        return surface
+
+    def creer_surface_prerendue(self):
+        """
+        Obtient la surface prérendue de ce cercle depuis le cache partagé du SurfaceManager
+
+        Les cercles de même rayon, épaisseur, ouverture, rotation et palier de vie (ex: clones
+        concentriques) partagent une seule surface, dessinée une fois.
+        """
+        palier = self.palier_vie()
+        angle = self.angle_rotation if self.angle_ouverture > 0 else 0
+        cle = (self.rayon, self.epaisseur, self.angle_ouverture, angle, palier)
+
+        # Stocker comme surface prérendue
+        self.surface_prerendue = SurfaceManager.get_instance().get_ring_surface(
+            cle, lambda: self.dessiner_surface(self.couleur_vie(palier / self.PALIERS_VIE), angle))
+        self.rect_surface = self.surface_prerendue.get_rect(
+            center=(self.position[0], self.position[1])
+        )
 
         # Mémoriser les paramètres utilisés pour ce rendu
         self.derniers_params = {
@@ -211,17 +212,135 @@ class Cercle:
             'angle_rotation': self.angle_rotation,
             'angle_ouverture': self.angle_ouverture,
         }
-        self.derniere_life_ratio = ratio
+        self.dernier_palier_vie = palier
+
+    def est_arc_tournant(self):
+        """True si le cercle est un arc qui tourne (dessiné par sprite_tournant)"""
+        return self.vitesse_rotation != 0 and self.angle_ouverture > 0
+
+    def geometrie_tournante(self):
+        """Clé des rotations partagées de cet arc : (rayon, épaisseur, ouverture, palier de couleur)"""
+        return self.rayon, self.epaisseur, self.angle_ouverture, self.palier_vie()
+
+    def octets_rotation(self):
+        """Taille en mémoire d'une rotation de cet arc (surface de dessiner_surface)"""
+        return self.cote_surface() ** 2 * 4
+
+    @classmethod
+    def repartir_rotations(cls, octets):
+        """
+        Répartit le budget du cache arcs_tournes entre les géométries des arcs tournants affichés
+
+        Seules les rotations de 0 à 45° sont gardées (voir sprite_tournant). Les géométries sont retenues
+        de la plus petite à la plus grande tant que ces rotations tiennent ensemble dans le budget au pas
+        PAS_ANGLE_MAX ; elles partagent ensuite le pas le plus fin (au moins PAS_ANGLE) pour lequel elles
+        tiennent toutes. Les plus grandes, au-delà, sont tournées à chaque frame sans cache.
+
+        Args:
+            octets (dict): Géométrie (voir geometrie_tournante) -> octets d'une rotation (voir octets_rotation)
+
+        Returns:
+            dict: Géométrie -> pas en degrés (diviseur de 45), ou None pour un arc tourné à chaque frame
+        """
+        surface_manager = SurfaceManager.get_instance()
+        max_octets = surface_manager.arcs_tournes.max_octets
+        # Nombre de pas sur 45° : 45 / nb_pas rotations distinctes, plus celle de 0°
+        nb_pas_max = int(45 / cls.PAS_ANGLE)
+        nb_pas_min = math.ceil(45 / cls.PAS_ANGLE_MAX)
+
+        ordre = sorted(octets, key=octets.get)
+        en_cache = []
+        total = 0  # Octets d'une rotation de chaque géométrie retenue
+        for geometrie in ordre:
+            if max_octets is not None and (total + octets[geometrie]) * (nb_pas_min + 1) > max_octets:
+                break
+            en_cache.append(geometrie)
+            total += octets[geometrie]
+
+        pas = dict.fromkeys(ordre)
+        if en_cache:
+            nb_pas = nb_pas_max if max_octets is None else min(nb_pas_max, max_octets // total - 1)
+            for geometrie in en_cache:
+                pas[geometrie] = 45 / nb_pas
+
+        surface_manager.rotations_arcs = {geometrie: (octets[geometrie], pas[geometrie]) for geometrie in ordre}
+        return pas
+
+    def pas_angle_tournant(self):
+        """
+        Pas de quantification de l'angle des rotations de cet arc, fixé par la dernière répartition
+        du budget (voir repartir_rotations), à laquelle une géométrie encore inconnue est ajoutée
+
+        Returns:
+            float: Pas en degrés, ou None si l'arc est tourné à chaque frame sans cache
+        """
+        rotations = SurfaceManager.get_instance().rotations_arcs
+        geometrie = self.geometrie_tournante()
+        if geometrie not in rotations:
+            octets = {autre: octets for autre, (octets, _) in rotations.items()}
+            octets[geometrie] = self.octets_rotation()
+            return self.repartir_rotations(octets)[geometrie]
+        return rotations[geometrie][1]
+
+    def sprite_tournant(self):
+        """
+        Sprite d'un arc qui tourne, tiré du cache partagé du SurfaceManager
+
+        L'arc est symétrique par rapport à l'axe de son ouverture et sa surface est un carré centré :
+        une rotation d'un quart de tour ou un miroir en donne donc une autre à l'identique, pixel pour
+        pixel. Seuls les angles quantifiés de 0 à 45° (voir pas_angle_tournant) sont dessinés, une fois
+        par (rayon, épaisseur, ouverture, palier de couleur), et gardés en mémoire ; les autres en sont
+        déduits. Un arc dont les rotations ne tiennent pas en cache est tourné à chaque frame depuis
+        son sprite de base.
+        """
+        surface_manager = SurfaceManager.get_instance()
+        palier = self.palier_vie()
+        couleur = self.couleur_vie(palier / self.PALIERS_VIE)
+        geometrie = self.geometrie_tournante()
+        pas = self.pas_angle_tournant()
+
+        if pas is None:
+            base = surface_manager.get_persistant("arcs_de_base", geometrie,
+                                                  lambda: self.dessiner_surface(couleur, 0))
+            # Les angles croissent dans le sens horaire à l'écran, rotozoom tourne dans le sens trigonométrique
+            # (et lisse le résultat, contrairement à rotate qui dégrade l'anticrénelage)
+            tourne = pygame.transform.rotozoom(base, -self.angle_rotation, 1)
+        else:
+            # Angle quantifié = quarts * 90° + rang * pas ; au-delà de 45° dans le quart, c'est le miroir
+            # (angle opposé) de (quarts + 1) * 90° - rang' * pas
+            nb_pas = round(45 / pas)
+            quarts, rang = divmod(round(self.angle_rotation / pas) % (8 * nb_pas), 2 * nb_pas)
+            miroir = rang > nb_pas
+            if miroir:
+                quarts, rang = quarts + 1, 2 * nb_pas - rang
+            angle = rang * pas
+
+            # Rotations gardées en mémoire seulement : trop nombreuses pour le cache sur disque
+            cle = geometrie + (angle,)
+            tourne = surface_manager.arcs_tournes.get(cle)
+            if tourne is None:
+                tourne = surface_manager.arcs_tournes.put(cle, self.dessiner_surface(couleur, angle))
+            if miroir:
+                tourne = pygame.transform.flip(tourne, False, True)  # Angle opposé
+            if quarts % 4:
+                # Quarts de tour exacts, dans le sens horaire à l'écran
+                tourne = pygame.transform.rotate(tourne, -90 * (quarts % 4))
+
+        largeur, hauteur = tourne.get_size()
+        return tourne, (self.position[0] - largeur / 2, self.position[1] - hauteur / 2)
+
+    def sprite(self):
+        """Couple (surface prérendue, coin supérieur gauche), recréant le prérendu si le cercle a changé"""
+        if self.est_arc_tournant():
+            return self.sprite_tournant()
 
-    def afficher(self, surface):
-        """Affiche le cercle sur la surface, en utilisant la surface prérendue si possible"""
         # Si la surface prérendue n'existe pas ou si le cercle a changé, recréer la surface
         if self.surface_prerendue is None or self.a_change():
             self.creer_surface_prerendue()
 
-        # Afficher la surface prérendue
-        if self.angle_ouverture == 0:
-            surface.blit(self.surface_prerendue, (self.position[0] - self.rayon, self.position[1] - self.rayon))
-        else:
-            surface.blit(self.surface_prerendue, (self.position[0] - self.rayon - self.epaisseur,
-                                                  self.position[1] - self.rayon - self.epaisseur))
\ No newline at end of file
+        demi_cote = self.surface_prerendue.get_width() / 2
+        return self.surface_prerendue, (self.position[0] - demi_cote, self.position[1] - demi_cote)
+
+    def afficher(self, surface):
+        """Affiche le cercle sur la surface, en utilisant la surface prérendue si possible"""
+        surface.blit(*self.sprite())
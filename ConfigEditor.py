@@ -609,7 +609,11 @@ class ConfigEditor:
                 "collision_sur_contact": True,
                 "brisure_dans_ouverture": False,
                 "marge_suppression": 100,
-                "debug": False
+                "debug": False,
+                "broad_phase": "quadtree",
+                "frequence_physique": 120,
+                "rendu_partiel": False,
+                "anneaux_touches_seulement": False
             },
             "balles": [],
             "cercles": []
@@ -724,6 +728,13 @@ class ConfigEditor:
         tk.Spinbox(screen_frame, from_=30, to=120, textvariable=self.screen_vars['fps'], width=10).grid(row=row,
                                                                                                         column=1,
                                                                                                         padx=5)
+
+        # Fréquence de la physique (indépendante du FPS d'affichage)
+        tk.Label(screen_frame, text="Physique (Hz):").grid(row=row, column=2, sticky="w", padx=(20, 0))
+        self.screen_vars['frequence_physique'] = tk.IntVar(
+            value=self.config['ecran'].get('frequence_physique', 120))
+        tk.Spinbox(screen_frame, from_=30, to=480, textvariable=self.screen_vars['frequence_physique'],
+                   width=10).grid(row=row, column=3, padx=5)
         row += 1
 
         # Sélecteur de couleur de fond
@@ -754,11 +765,33 @@ class ConfigEditor:
                                                                                                  sticky="w")
         row += 1
 
+        self.screen_vars['rendu_partiel'] = tk.BooleanVar(value=self.config['ecran'].get('rendu_partiel', False))
+        self.screen_vars['rendu_partiel'].trace('w', self.on_screen_setting_changed)
+        tk.Checkbutton(screen_frame, text="Rendu partiel (zones modifiées seulement)",
+                       variable=self.screen_vars['rendu_partiel']).grid(row=row, column=0, columnspan=2, sticky="w")
+        row += 1
+
+        self.screen_vars['anneaux_touches_seulement'] = tk.BooleanVar(
+            value=self.config['ecran'].get('anneaux_touches_seulement', False))
+        self.screen_vars['anneaux_touches_seulement'].trace('w', self.on_screen_setting_changed)
+        tk.Checkbutton(screen_frame, text="Collisions avec les seuls anneaux touchés",
+                       variable=self.screen_vars['anneaux_touches_seulement']).grid(row=row, column=0, columnspan=2,
+                                                                                    sticky="w")
+        row += 1
+
         # Marge de suppression
         tk.Label(screen_frame, text="Marge suppression:").grid(row=row, column=0, sticky="w")
         self.screen_vars['marge_suppression'] = tk.IntVar(value=self.config['ecran']['marge_suppression'])
         tk.Spinbox(screen_frame, from_=50, to=500, textvariable=self.screen_vars['marge_suppression'], width=10).grid(
             row=row, column=1, padx=5)
+        row += 1
+
+        # Détection grossière des collisions entre balles
+        tk.Label(screen_frame, text="Broad phase:").grid(row=row, column=0, sticky="w")
+        self.screen_vars['broad_phase'] = tk.StringVar(value=self.config['ecran'].get('broad_phase', "quadtree"))
+        ttk.Combobox(screen_frame, textvariable=self.screen_vars['broad_phase'],
+                     values=["quadtree", "linear_quadtree", "grid", "sap"],
+                     width=12, state="readonly").grid(row=row, column=1, padx=5, sticky="w")
 
         # Bouton d'application
         tk.Button(screen_frame, text="Appliquer les modifications", command=self.apply_screen_config,
@@ -1633,11 +1666,15 @@ class ConfigEditor:
         self.config["ecran"]["taille"] = [self.screen_vars['largeur'].get(), self.screen_vars['hauteur'].get()]
         self.config["ecran"]["titre"] = self.screen_vars['titre'].get()
         self.config["ecran"]["fps"] = self.screen_vars['fps'].get()
+        self.config["ecran"]["frequence_physique"] = self.screen_vars['frequence_physique'].get()
         self.config["ecran"]["couleur_fond"] = self.screen_color_picker.get_color()
         self.config["ecran"]["collision_sur_contact"] = self.screen_vars['collision_sur_contact'].get()
         self.config["ecran"]["brisure_dans_ouverture"] = self.screen_vars['brisure_dans_ouverture'].get()
         self.config["ecran"]["debug"] = self.screen_vars['debug'].get()
+        self.config["ecran"]["rendu_partiel"] = self.screen_vars['rendu_partiel'].get()
+        self.config["ecran"]["anneaux_touches_seulement"] = self.screen_vars['anneaux_touches_seulement'].get()
         self.config["ecran"]["marge_suppression"] = self.screen_vars['marge_suppression'].get()
+        self.config["ecran"]["broad_phase"] = self.screen_vars['broad_phase'].get()
 
         if show_message:
             messagebox.showinfo("Succès", "Configuration de l'écran appliquée !")
@@ -1662,7 +1699,11 @@ class ConfigEditor:
                     "collision_sur_contact": True,
                     "brisure_dans_ouverture": False,
                     "marge_suppression": 100,
-                    "debug": False
+                    "debug": False,
+                    "broad_phase": "quadtree",
+                    "frequence_physique": 120,
+                    "rendu_partiel": False,
+                    "anneaux_touches_seulement": False
                 },
                 "balles": [],
                 "cercles": []
@@ -1719,6 +1760,7 @@ class ConfigEditor:
         self.screen_vars['hauteur'].set(ecran["taille"][1])
         self.screen_vars['titre'].set(ecran["titre"])
         self.screen_vars['fps'].set(ecran["fps"])
+        self.screen_vars['frequence_physique'].set(ecran.get("frequence_physique", 120))
 
         # Couleur de fond
         couleur_fond = ecran.get("couleur_fond", [0, 0, 0])
@@ -1731,7 +1773,10 @@ class ConfigEditor:
         self.screen_vars['collision_sur_contact'].set(ecran["collision_sur_contact"])
         self.screen_vars['brisure_dans_ouverture'].set(ecran["brisure_dans_ouverture"])
         self.screen_vars['debug'].set(ecran["debug"])
+        self.screen_vars['rendu_partiel'].set(ecran.get("rendu_partiel", False))
+        self.screen_vars['anneaux_touches_seulement'].set(ecran.get("anneaux_touches_seulement", False))
         self.screen_vars['marge_suppression'].set(ecran["marge_suppression"])
+        self.screen_vars['broad_phase'].set(ecran.get("broad_phase", "quadtree"))
 
     def refresh_config_list(self):
         """Rafraîchit la liste des configurations disponibles"""
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Atlas de drapeaux prédécoupés en disques, un par taille de balle
+
+Usage:
+    python FlagAtlas.py            # tailles des balles "image" de CONFIGS/*.json
+    python FlagAtlas.py 8 15 20    # tailles explicites
+"""
+import os
+import sys
+import json
+import math
+import pygame
+from SurfaceManager import SurfaceManager
+
+
+class FlagAtlas:
+    """Charge les atlas cuits par `python FlagAtlas.py` et fournit les drapeaux déjà masqués en sous-surfaces"""
+
+    DOSSIER = "FlagAtlas"  # Dossier de sortie de la cuisson (ignoré par git)
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        """Accès singleton à l'atlas"""
+        if FlagAtlas._instance is None:
+            FlagAtlas._instance = FlagAtlas()
+        return FlagAtlas._instance
+
+    def __init__(self, dossier=DOSSIER):
+        self.dossier = dossier
+        self.index = {}  # Nom de taille -> index JSON de l'atlas, ou None si absent
+        self.images = {}  # Nom de taille -> surface de l'atlas (chargée au premier sprite demandé)
+        self.dates = {}  # Chemin absolu d'une image -> date de modification
+
+    @staticmethod
+    def nom_taille(taille):
+        """Nom de fichier d'une taille de balle (ex: 15.0 -> "15", 7.5 -> "7.5")"""
+        return f"{float(taille):g}"
+
+    def _charger_index(self, nom):
+        """Lit l'index JSON d'une taille ou mémorise son absence"""
+        if nom not in self.index:
+            self.index[nom] = None
+            chemin_index = os.path.join(self.dossier, f"atlas_{nom}.json")
+            if os.path.exists(chemin_index):
+                try:
+                    with open(chemin_index, 'r', encoding='utf-8') as f:
+                        self.index[nom] = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Erreur lors du chargement de l'index {chemin_index}: {e}")
+        return self.index[nom]
+
+    def _charger_image(self, nom):
+        """Charge l'image d'un atlas (une seule lecture), ou None si elle est illisible"""
+        if nom not in self.images:
+            chemin_image = os.path.join(self.dossier, f"atlas_{nom}.png")
+            try:
+                image = pygame.image.load(chemin_image)
+                # convert_alpha nécessite une fenêtre (absente en mode headless)
+                if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                    image = image.convert_alpha()
+            except Exception as e:
+                print(f"Erreur lors du chargement de l'atlas {chemin_image}: {e}")
+                image = None
+            self.images[nom] = image
+        return self.images[nom]
+
+    def _date(self, chemin):
+        """Date de modification d'une image source (mémorisée)"""
+        chemin = os.path.abspath(chemin)
+        if chemin not in self.dates:
+            self.dates[chemin] = os.path.getmtime(chemin) if os.path.exists(chemin) else None
+        return self.dates[chemin]
+
+    def _entree(self, chemin_image, taille):
+        """Entrée de l'index pour ce drapeau à cette taille, ou None s'il n'a pas été cuit ou a changé depuis"""
+        index = self._charger_index(self.nom_taille(taille))
+        if index is None:
+            return None
+        entree = index["drapeaux"].get(os.path.basename(chemin_image))
+        if entree is None or entree["date"] != self._date(chemin_image):
+            return None
+        return entree
+
+    def contient(self, chemin_image, taille):
+        """True si le drapeau est disponible dans l'atlas à cette taille (sans charger l'image de l'atlas)"""
+        return self._entree(chemin_image, taille) is not None
+
+    def sprite(self, chemin_image, taille):
+        """
+        Drapeau découpé en disque de rayon `taille`, tiré de l'atlas
+
+        Args:
+            chemin_image (str): Chemin de l'image source (ex: Images/Belgium.png)
+            taille (float): Rayon de la balle
+
+        Returns:
+            pygame.Surface: Sous-surface partagée de l'atlas, ou None si le drapeau n'a pas été cuit
+                            à cette taille ou si l'image a changé depuis
+        """
+        entree = self._entree(chemin_image, taille)
+        if entree is None:
+            return None
+        nom = self.nom_taille(taille)
+        image = self._charger_image(nom)
+        if image is None:
+            return None
+        cote = self.index[nom]["cote"]
+        return image.subsurface((entree["x"], entree["y"], cote, cote))
+
+    @classmethod
+    def cuire(cls, tailles, dossier_images="Images", dossier_sortie=DOSSIER):
+        """
+        Découpe toutes les images du dossier en disques et les range dans un atlas par taille
+
+        Args:
+            tailles (iterable): Rayons de balles à cuire
+            dossier_images (str): Dossier des drapeaux sources
+            dossier_sortie (str): Dossier où écrire atlas_<taille>.png et atlas_<taille>.json
+
+        Returns:
+            list: Chemins des atlas écrits
+        """
+        surface_manager = SurfaceManager.get_instance()
+        fichiers = sorted(f for f in os.listdir(dossier_images) if f.lower().endswith(cls.EXTENSIONS))
+        images = {}
+        for fichier in fichiers:
+            try:
+                image = pygame.image.load(os.path.join(dossier_images, fichier))
+                # Même format de pixels qu'au chargement en jeu (SurfaceManager.get_image)
+                if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                    image = image.convert_alpha()
+                images[fichier] = image
+            except Exception as e:
+                print(f"Erreur lors du chargement de l'image {fichier}: {e}")
+
+        os.makedirs(dossier_sortie, exist_ok=True)
+        ecrits = []
+        for taille in sorted(set(float(t) for t in tailles)):
+            cote = int(taille * 2)
+            colonnes = max(1, math.ceil(math.sqrt(len(images))))
+            lignes = max(1, math.ceil(len(images) / colonnes))
+            atlas = pygame.Surface((colonnes * cote, lignes * cote), pygame.SRCALPHA)
+            atlas.fill((0, 0, 0, 0))
+
+            drapeaux = {}
+            for k, (fichier, image) in enumerate(images.items()):
+                x, y = (k % colonnes) * cote, (k // colonnes) * cote
+                atlas.blit(surface_manager.decouper_en_cercle(image, taille), (x, y))
+                drapeaux[fichier] = {"x": x, "y": y,
+                                     "date": os.path.getmtime(os.path.join(dossier_images, fichier))}
+
+            nom = cls.nom_taille(taille)
+            chemin_image = os.path.join(dossier_sortie, f"atlas_{nom}.png")
+            pygame.image.save(atlas, chemin_image)
+            with open(os.path.join(dossier_sortie, f"atlas_{nom}.json"), 'w', encoding='utf-8') as f:
+                json.dump({"taille": taille, "cote": cote, "drapeaux": drapeaux}, f, indent=1, ensure_ascii=False)
+            ecrits.append(chemin_image)
+        return ecrits
+
+
+def tailles_des_configs(dossier_configs="CONFIGS"):
+    """Rayons des balles de type image utilisés dans les configurations JSON"""
+    tailles = set()
+    if not os.path.exists(dossier_configs):
+        return tailles
+    for fichier in os.listdir(dossier_configs):
+        if not fichier.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(dossier_configs, fichier), 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Configuration illisible {fichier}: {e}")
+            continue
+        for balle in config.get("balles", []):
+            if balle.get("type_apparence") == "image" and balle.get("image"):
+                tailles.add(float(balle["taille"]))
+    return tailles
+
+
+def main():
+    """Point d'entrée de la cuisson"""
+    tailles = [float(arg) for arg in sys.argv[1:]] or sorted(tailles_des_configs())
+    if not tailles:
+        print("❌ Aucune taille à cuire (aucune balle image dans CONFIGS/, et aucune taille en argument)")
+        return
+
+    # Fenêtre cachée : convert_alpha en a besoin
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+    print(f"🔥 Cuisson des drapeaux pour les tailles: {', '.join(FlagAtlas.nom_taille(t) for t in tailles)}")
+    for chemin in FlagAtlas.cuire(tailles):
+        print(f"   ✅ {chemin}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
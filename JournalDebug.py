@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import sys
+from collections import deque
+
+
+class JournalDebug:
+    """Journal de debug paresseux : rien n'est formaté tant que le tampon n'est pas vidé"""
+
+    def __init__(self, actif=False, capacite=20000):
+        """
+        Initialise le journal
+
+        Args:
+            actif (bool): Si False, chaque appel retourne immédiatement
+            capacite (int): Nombre d'entrées conservées (les plus anciennes sont écrasées)
+        """
+        self.actif = actif
+        self.tampon = deque(maxlen=capacite)
+        self.frame = 0  # Numéro de frame attaché à chaque entrée
+
+    def log(self, message, *args):
+        """
+        Enregistre un message différé
+
+        Args:
+            message (str | callable): Gabarit au format % ou fonction retournant le texte
+            *args: Arguments du gabarit, formatés seulement à la lecture
+        """
+        if self.actif:
+            self.tampon.append((self.frame, message, args))
+
+    def evenement(self, nom, **champs):
+        """Enregistre un événement structuré (ex: evenement("rebond", cercle=3, vie=12))"""
+        if self.actif:
+            self.tampon.append((self.frame, nom, champs))
+
+    @staticmethod
+    def _formater(message, args):
+        """Construit le texte d'une entrée"""
+        if callable(message):
+            return message()
+        if isinstance(args, dict):
+            return f"{message} " + " ".join(f"{cle}={valeur}" for cle, valeur in args.items())
+        if args:
+            return message % args
+        return message
+
+    def lignes(self):
+        """Retourne les entrées du tampon formatées (la plus ancienne en premier)"""
+        return [f"[DEBUG {frame}] {self._formater(message, args)}" for frame, message, args in self.tampon]
+
+    def vider(self, flux=None):
+        """Écrit toutes les entrées sur le flux (sortie standard par défaut) puis vide le tampon"""
+        flux = flux or sys.stdout
+        for ligne in self.lignes():
+            flux.write(ligne + "\n")
+        self.tampon.clear()
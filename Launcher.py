@@ -5,11 +5,42 @@ Lanceur simple pour le jeu Bounce
 from Screen import Screen
 from Balle import Balle
 from Cercle import Cercle
+from FlagAtlas import FlagAtlas
+from SurfaceManager import SurfaceManager
 import sys
 import json
 import os
 
 
+def chemin_image(balle_config):
+    """Chemin de l'image d'une balle de la configuration, ou None pour une balle de couleur"""
+    if balle_config.get("type_apparence", "couleur") == "image" and balle_config.get("image"):
+        return os.path.join("Images", balle_config.get("image"))
+    return None
+
+
+def precharger_images(config):
+    """
+    Lance en arrière-plan le décodage des images de balles de la configuration
+
+    Les drapeaux déjà présents dans l'atlas cuit (python FlagAtlas.py), ou dont l'image finale est déjà
+    en cache (mémoire ou disque), n'ont pas besoin d'être décodés.
+
+    Returns:
+        int: Nombre d'images mises en décodage
+    """
+    atlas = FlagAtlas.get_instance()
+    surface_manager = SurfaceManager.get_instance()
+    chemins = set()
+    for balle_config in config.get("balles", []):
+        image = chemin_image(balle_config)
+        taille = balle_config["taille"]
+        if (image and not atlas.contient(image, taille) and
+                not surface_manager.a_sprite_balle(image, taille, None, Balle._dessiner_image)):
+            chemins.add(image)
+    return surface_manager.prefetch(sorted(chemins))
+
+
 def creer_objets_depuis_config_json(screen, config):
     """Crée les objets du jeu à partir d'une configuration JSON"""
     # Créer les balles
@@ -26,11 +57,7 @@ def creer_objets_depuis_config_json(screen, config):
             couleur = couleur_map.get(couleur, [255, 255, 255])
 
         # Gestion de l'apparence
-        type_apparence = balle_config.get("type_apparence", "couleur")
-        if type_apparence == "image" and balle_config.get("image"):
-            image = os.path.join("Images", balle_config.get("image"))
-        else:
-            image = None
+        image = chemin_image(balle_config)
 
         balle = Balle(
             position=balle_config["position"],
@@ -70,21 +97,50 @@ def creer_objets_depuis_config_json(screen, config):
         )
         screen.ajouter_objet(cercle)
 
+    # Les images des balles sont prêtes : les décodages lancés par precharger_images et non utilisés
+    # (ex: sprite relu du cache disque entre-temps) ne doivent pas rester en mémoire
+    SurfaceManager.get_instance().abandonner_prechargements()
+
 
-def lancer_jeu_depuis_fichier(fichier_config):
-    """Lance le jeu à partir d'un fichier de configuration JSON"""
+def creer_screen_depuis_config(config, headless=False):
+    """Crée l'écran décrit par la section "ecran" d'une configuration"""
+    ecran_config = config.get("ecran", {})
+
+    # Gestion de la couleur de fond
+    couleur_fond = ecran_config.get("couleur_fond", [0, 0, 0])
+    if isinstance(couleur_fond, str):
+        couleur_map = {"black": [0, 0, 0], "white": [255, 255, 255], "gray": [128, 128, 128]}
+        couleur_fond = couleur_map.get(couleur_fond, [0, 0, 0])
+
+    return Screen(
+        taille=ecran_config.get("taille", [800, 600]),
+        couleur_fond=couleur_fond,
+        titre=ecran_config.get("titre", "Bounce Game"),
+        collision_sur_contact=ecran_config.get("collision_sur_contact", True),
+        brisure_dans_ouverture=ecran_config.get("brisure_dans_ouverture", False),
+        debug=ecran_config.get("debug", False),
+        broad_phase=ecran_config.get("broad_phase", "quadtree"),
+        frequence_physique=ecran_config.get("frequence_physique", 120),
+        rendu_partiel=ecran_config.get("rendu_partiel", False),
+        anneaux_touches_seulement=ecran_config.get("anneaux_touches_seulement", False),
+        headless=headless
+    )
+
+
+def lancer_jeu_depuis_fichier(fichier_config, enregistrement=None):
+    """
+    Lance le jeu à partir d'un fichier de configuration JSON
+
+    Args:
+        fichier_config (str): Fichier de configuration
+        enregistrement (str): Journal binaire où enregistrer la partie (python Replay.py verifier pour la rejouer)
+    """
     try:
         with open(fichier_config, 'r', encoding='utf-8') as f:
             config = json.load(f)
 
         ecran_config = config.get("ecran", {})
 
-        # Gestion de la couleur de fond
-        couleur_fond = ecran_config.get("couleur_fond", [0, 0, 0])
-        if isinstance(couleur_fond, str):
-            couleur_map = {"black": [0, 0, 0], "white": [255, 255, 255], "gray": [128, 128, 128]}
-            couleur_fond = couleur_map.get(couleur_fond, [0, 0, 0])
-
         print(f"\n🚀 Lancement depuis: {os.path.basename(fichier_config)}")
         print(f"   Titre: {ecran_config.get('titre', 'Bounce Game')}")
         print(f"   Taille: {ecran_config.get('taille', [800, 600])}")
@@ -93,21 +149,29 @@ def lancer_jeu_depuis_fichier(fichier_config):
         print("   Appuyez sur la croix pour quitter")
         print("   Bon jeu ! 🎯\n")
 
+        # Décoder les images pendant la création de la fenêtre
+        precharger_images(config)
+
         # Créer l'écran de jeu
-        screen = Screen(
-            taille=ecran_config.get("taille", [800, 600]),
-            couleur_fond=couleur_fond,
-            titre=ecran_config.get("titre", "Bounce Game"),
-            collision_sur_contact=ecran_config.get("collision_sur_contact", True),
-            brisure_dans_ouverture=ecran_config.get("brisure_dans_ouverture", False)
-        )
+        screen = creer_screen_depuis_config(config)
 
         # Ajouter les objets
         creer_objets_depuis_config_json(screen, config)
 
+        # Enregistrer la partie (graine, configuration et événements)
+        replay = None
+        if enregistrement:
+            from Replay import Replay
+            replay = Replay(dt=screen.pas_fixe, config=config)
+            screen.enregistrer(replay)
+
         # Lancer la boucle de jeu
         screen.boucle(fps=ecran_config.get("fps", 60))
 
+        if replay is not None:
+            replay.sauvegarder(enregistrement)
+            print(f"🎬 Partie enregistrée dans {enregistrement} ({replay.nb_pas} pas, graine {replay.graine})")
+
     except FileNotFoundError:
         print(f"❌ Fichier de configuration '{fichier_config}' introuvable")
     except json.JSONDecodeError:
@@ -116,6 +180,34 @@ def lancer_jeu_depuis_fichier(fichier_config):
         print(f"❌ Erreur lors du lancement: {e}")
 
 
+def simuler_depuis_fichier(fichier_config, duree=10.0):
+    """
+    Simule une configuration sans affichage (validation en lot, mesures de la physique)
+
+    Returns:
+        dict: Statistiques de la simulation, ou None si la configuration est invalide
+    """
+    try:
+        with open(fichier_config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        screen = creer_screen_depuis_config(config, headless=True)
+        creer_objets_depuis_config_json(screen, config)
+        stats = screen.simuler(duree=duree)
+
+        print(f"✅ {os.path.basename(fichier_config)}: {stats['pas']} pas ({stats['temps_simule']:.1f} s simulées) "
+              f"en {stats['temps_reel']:.2f} s, {stats['balles']} balles et {stats['cercles']} cercles restants")
+        return stats
+
+    except FileNotFoundError:
+        print(f"❌ Fichier de configuration '{fichier_config}' introuvable")
+    except json.JSONDecodeError:
+        print(f"❌ Erreur de format JSON dans '{fichier_config}'")
+    except Exception as e:
+        print(f"❌ Erreur lors de la simulation de '{fichier_config}': {e}")
+    return None
+
+
 def lister_configs_disponibles():
     """Liste les configurations JSON disponibles"""
     config_dir = "CONFIGS"
@@ -135,19 +227,36 @@ def main():
     """Point d'entrée principal"""
     print("🎮 Bienvenue dans Bounce!")
 
+    # --enregistrer fichier.bnr : enregistrer la partie lancée
+    arguments = sys.argv[1:]
+    enregistrement = None
+    if "--enregistrer" in arguments:
+        position = arguments.index("--enregistrer")
+        enregistrement = arguments[position + 1] if position + 1 < len(arguments) else "partie.bnr"
+        del arguments[position:position + 2]
+
+    # --headless : simuler sans affichage toutes les configurations passées en argument
+    arguments = [arg for arg in arguments if arg != "--headless"]
+    if "--headless" in sys.argv[1:]:
+        for arg in arguments or lister_configs_disponibles():
+            if not os.path.exists(arg):
+                arg = os.path.join("CONFIGS", arg)
+            simuler_depuis_fichier(arg)
+        return
+
     # Vérifier si un fichier de config a été passé en argument
-    if len(sys.argv) > 1:
-        arg = sys.argv[1]
+    if arguments:
+        arg = arguments[0]
 
         # Si c'est un fichier JSON, le charger directement
         if arg.endswith('.json'):
             if os.path.exists(arg):
-                lancer_jeu_depuis_fichier(arg)
+                lancer_jeu_depuis_fichier(arg, enregistrement)
             else:
                 # Essayer dans le dossier CONFIGS
                 fichier_dans_configs = os.path.join("CONFIGS", arg)
                 if os.path.exists(fichier_dans_configs):
-                    lancer_jeu_depuis_fichier(fichier_dans_configs)
+                    lancer_jeu_depuis_fichier(fichier_dans_configs, enregistrement)
                 else:
                     print(f"❌ Fichier '{arg}' introuvable")
         else:
@@ -168,7 +277,7 @@ def main():
             num = int(input("\nNuméro de la configuration à lancer: ")) - 1
             if 0 <= num < len(configs_json):
                 fichier = os.path.join("CONFIGS", configs_json[num])
-                lancer_jeu_depuis_fichier(fichier)
+                lancer_jeu_depuis_fichier(fichier, enregistrement)
             else:
                 print("❌ Numéro invalide")
         except ValueError:
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+import math
+import numpy as np
+from Particule import Particule, StyleExplosion
+from SurfaceManager import SurfaceManager
+
+
+class ParticleSystem:
+    """Toutes les particules d'un écran en tableaux contigus, avec traînées en tampon circulaire"""
+
+    LONGUEUR_TRACE_MAX = 8  # Points de traînée conservés (feu d'artifice : 8, autres styles : 5)
+    FRICTION = 0.98  # Facteur de vitesse par 1/60 s, indépendant de la fréquence de la physique
+
+    ARRAYS = ('positions', 'vitesses', 'vies', 'vies_initiales', 'tailles', 'couleurs', 'teintes_trace',
+              'angles', 'vitesses_rotation', 'gravites', 'longueurs_trace', 'nb_traces', 'traces')
+
+    def __init__(self, capacite=256):
+        """
+        Initialise un système vide
+
+        Args:
+            capacite (int): Nombre de particules pré-allouées (agrandi automatiquement)
+        """
+        capacite = max(1, int(capacite))
+        longueur = self.LONGUEUR_TRACE_MAX
+        self.nb = 0
+        self.positions = np.zeros((capacite, 2), dtype=np.float64)
+        self.vitesses = np.zeros((capacite, 2), dtype=np.float64)
+        self.vies = np.zeros(capacite, dtype=np.float64)
+        self.vies_initiales = np.ones(capacite, dtype=np.float64)
+        self.tailles = np.zeros(capacite, dtype=np.int32)
+        self.couleurs = np.zeros((capacite, 3), dtype=np.uint8)  # Couleur du corps
+        self.teintes_trace = np.zeros((capacite, longueur, 3), dtype=np.uint8)  # Couleur du i-ème point de traînée
+        self.angles = np.zeros(capacite, dtype=np.float64)
+        self.vitesses_rotation = np.zeros(capacite, dtype=np.float64)
+        self.gravites = np.zeros(capacite, dtype=np.float64)
+        self.longueurs_trace = np.zeros(capacite, dtype=np.int32)
+        self.nb_traces = np.zeros(capacite, dtype=np.int32)  # Points de traînée valides
+
+        # Traînées : tampon circulaire commun, la case `tete` reçoit les positions du prochain pas
+        self.traces = np.zeros((capacite, longueur, 2), dtype=np.float64)
+        self.tete = 0
+
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.nb
+
+    def _agrandir(self, capacite):
+        """Réalloue les tableaux avec une capacité plus grande"""
+        for nom in self.ARRAYS:
+            ancien = getattr(self, nom)
+            nouveau = np.zeros((capacite,) + ancien.shape[1:], dtype=ancien.dtype)
+            nouveau[:self.nb] = ancien[:self.nb]
+            setattr(self, nom, nouveau)
+
+    def emettre(self, positions, vitesses, vies, tailles, couleurs, teintes_trace, gravites, longueurs_trace,
+                angles, vitesses_rotation):
+        """
+        Ajoute un lot de particules (un tableau par propriété, une ligne par particule)
+
+        Returns:
+            slice: Lignes attribuées
+        """
+        n = len(positions)
+        debut = self.nb
+        fin = debut + n
+        if fin > len(self.vies):
+            capacite = len(self.vies)
+            while capacite < fin:
+                capacite *= 2
+            self._agrandir(capacite)
+
+        self.positions[debut:fin] = positions
+        self.vitesses[debut:fin] = vitesses
+        self.vies[debut:fin] = vies
+        self.vies_initiales[debut:fin] = vies
+        self.tailles[debut:fin] = tailles
+        self.couleurs[debut:fin] = couleurs
+        self.teintes_trace[debut:fin] = teintes_trace
+        self.gravites[debut:fin] = gravites
+        self.longueurs_trace[debut:fin] = longueurs_trace
+        self.nb_traces[debut:fin] = 0
+        self.angles[debut:fin] = angles
+        self.vitesses_rotation[debut:fin] = vitesses_rotation
+        self.nb = fin
+        return slice(debut, fin)
+
+    def explosion(self, centre, rayon, point_impact=None, nb=75, style=StyleExplosion.NORMAL,
+                  palette_name="festif"):
+        """
+        Émet les particules d'un cercle détruit, réparties sur sa circonférence
+
+        Args:
+            centre (list): Centre du cercle
+            rayon (float): Rayon du cercle
+            point_impact (list): Point de destruction ; les particules proches partent plus vite
+            nb (int): Nombre de particules
+            style (StyleExplosion): Style de couleurs des traînées
+            palette_name (str): Nom de la palette dans Particule.PALETTES
+        """
+        rng = self.rng
+        palette = np.array(Particule.PALETTES.get(palette_name, Particule.PALETTES["festif"]), dtype=np.float64)
+
+        # Positions sur la circonférence avec un léger décalage, direction qui suit le cercle
+        angles = np.arange(nb) / nb * 2 * math.pi
+        positions = np.column_stack((centre[0] + rayon * np.cos(angles), centre[1] + rayon * np.sin(angles)))
+        positions += rng.uniform(-2, 2, (nb, 2))
+        directions = angles + rng.uniform(-0.2, 0.2, nb)
+
+        # Vitesse selon la distance au point d'impact
+        if point_impact is not None and len(point_impact) >= 2:
+            distances = np.linalg.norm(positions - np.asarray(point_impact[:2], dtype=np.float64), axis=1)
+            vitesses_base = 400 - np.minimum(200, distances)
+        else:
+            vitesses_base = np.full(nb, 200.0)
+        normes = rng.uniform(vitesses_base, vitesses_base * 1.5)
+        vitesses = np.column_stack((normes * np.cos(directions), normes * np.sin(directions)))
+
+        # Couleurs du corps et de chaque point de traînée (du plus ancien au plus récent)
+        longueur = self.LONGUEUR_TRACE_MAX
+        bases = palette[rng.integers(len(palette), size=nb)]
+        rang = np.minimum(np.arange(longueur), 4)
+        if style == StyleExplosion.MULTICOLOR:
+            # 2 ou 3 couleurs de la palette par particule, une par point de traînée
+            melanges = rng.permuted(np.tile(np.arange(len(palette)), (nb, 1)), axis=1)
+            nb_couleurs = rng.integers(2, 4, size=nb)
+            choix = (rng.random((nb, longueur)) * nb_couleurs[:, None]).astype(np.intp)
+            teintes = palette[melanges[np.arange(nb)[:, None], choix]]
+        elif style == StyleExplosion.RAINBOW:
+            # Dégradé de la couleur de base vers le noir
+            teintes = bases[:, None, :] * (1 - rang / 4)[None, :, None]
+        elif style == StyleExplosion.FIREWORK:
+            # Couleur de base puis versions assombries
+            facteurs = np.array([1.0, 0.0, 0.2, 0.4, 0.6])[rang]
+            teintes = bases[:, None, :] * facteurs[None, :, None]
+        else:
+            teintes = np.repeat(bases[:, None, :], longueur, axis=1)
+
+        feu_artifice = style == StyleExplosion.FIREWORK
+        self.emettre(positions, vitesses,
+                     vies=rng.uniform(0.5, 1.5, nb),
+                     tailles=rng.integers(2, 5, size=nb),
+                     couleurs=bases.astype(np.uint8),
+                     teintes_trace=teintes.astype(np.uint8),
+                     gravites=200 if feu_artifice else 400,
+                     longueurs_trace=8 if feu_artifice else 5,
+                     angles=rng.uniform(0, 360, nb),
+                     vitesses_rotation=rng.uniform(-360, 360, nb))
+
+    def mettre_a_jour(self, dt):
+        """Avance toutes les particules d'un pas puis compacte les particules mortes"""
+        n = self.nb
+        if n == 0:
+            return
+
+        # Position courante dans la traînée
+        self.traces[:n, self.tete] = self.positions[:n]
+        self.tete = (self.tete + 1) % self.LONGUEUR_TRACE_MAX
+        np.minimum(self.nb_traces[:n] + 1, self.longueurs_trace[:n], out=self.nb_traces[:n])
+
+        # Gravité, frottement, déplacement, rotation et vieillissement
+        vitesses = self.vitesses[:n]
+        vitesses[:, 1] += self.gravites[:n] * dt
+        vitesses *= self.FRICTION ** (dt * 60)
+        self.positions[:n] += vitesses * dt
+        self.angles[:n] += self.vitesses_rotation[:n] * dt
+        self.vies[:n] -= dt
+
+        vivantes = self.vies[:n] > 0
+        if not vivantes.all():
+            self._compacter(vivantes)
+
+    def _compacter(self, vivantes):
+        """Regroupe en tête de tableaux les particules encore vivantes"""
+        restantes = int(np.count_nonzero(vivantes))
+        for nom in self.ARRAYS:
+            tableau = getattr(self, nom)
+            tableau[:restantes] = tableau[:self.nb][vivantes]
+        self.nb = restantes
+
+    def points_trace(self, i):
+        """Positions de la traînée de la particule i, de la plus ancienne à la plus récente"""
+        m = int(self.nb_traces[i])
+        cases = (self.tete - m + np.arange(m)) % self.LONGUEUR_TRACE_MAX
+        return self.traces[i, cases]
+
+    def sprites(self, surface_manager=None):
+        """
+        Couples (sprite, coin supérieur gauche) des traînées puis du corps des particules
+
+        Les sprites viennent de l'atlas du SurfaceManager (couleur × taille × palier
+        d'alpha) ; chaque sprite distinct n'est demandé qu'une fois par frame.
+
+        Args:
+            surface_manager (SurfaceManager): Gestionnaire fournissant l'atlas (singleton par défaut)
+
+        Returns:
+            list: Liste prête pour Surface.blits
+        """
+        n = self.nb
+        if n == 0:
+            return []
+        surface_manager = surface_manager or SurfaceManager.get_instance()
+        longueur = self.LONGUEUR_TRACE_MAX
+
+        tailles = self.tailles[:n]
+        alphas = (255 * (self.vies[:n] / self.vies_initiales[:n])).astype(np.int64)
+
+        # Points de traînée valides : k < nb_traces, du plus ancien (k = 0) au plus récent
+        m = self.nb_traces[:n]
+        k = np.arange(longueur)
+        valides = k[None, :] < m[:, None]
+        lignes, rangs = np.nonzero(valides)
+        m_points = m[lignes]
+        cases = (self.tete - m_points + rangs) % longueur
+        trace_positions = self.traces[lignes, cases]
+        trace_alphas = (alphas[lignes] * (rangs + 1) // m_points) // 2
+        trace_rayons = np.rint(2 * tailles[lignes] * (rangs + 1) / m_points).astype(np.int64)  # En demi-pixels
+        trace_couleurs = self.teintes_trace[lignes, rangs].astype(np.int64)
+
+        # Traînées puis corps, dans un même lot
+        couleurs = np.concatenate((trace_couleurs, self.couleurs[:n].astype(np.int64)))
+        demi_cotes = np.concatenate((tailles[lignes], tailles)).astype(np.int64)
+        rayons = np.concatenate((trace_rayons, 2 * demi_cotes[len(lignes):]))
+        paliers = SurfaceManager.palier_alpha(np.concatenate((trace_alphas, alphas)))
+        coins = np.concatenate((trace_positions, self.positions[:n])) - demi_cotes[:, None]
+
+        # Une clé entière par sprite distinct
+        cles = ((((couleurs[:, 0] * 256 + couleurs[:, 1]) * 256 + couleurs[:, 2]) * 256 + demi_cotes) * 256
+                + rayons) * SurfaceManager.PALIERS_ALPHA + paliers
+        _, premiers, inverse = np.unique(cles, return_index=True, return_inverse=True)
+        sprites = [surface_manager.get_particle_sprite(tuple(couleurs[p].tolist()), int(demi_cotes[p]),
+                                                       rayons[p] / 2, int(paliers[p]))
+                   for p in premiers.tolist()]
+
+        return [(sprites[u], coin) for u, coin in zip(inverse.tolist(), coins.tolist())]
+
+    def afficher(self, surface, surface_manager=None):
+        """Dessine toutes les particules en un seul appel Surface.blits"""
+        surface.blits(self.sprites(surface_manager), doreturn=False)
@@ -124,8 +124,10 @@ class Particule:
             self.positions_precedentes.pop(0)
 
         self.vitesse[1] += self.gravite * dt
-        self.vitesse[0] *= self.friction
-        self.vitesse[1] *= self.friction
+        # Frottement défini par 1/60 s : même rendu quelle que soit la fréquence de la physique
+        frottement = self.friction ** (dt * 60)
+        self.vitesse[0] *= frottement
+        self.vitesse[1] *= frottement
 
         self.position[0] += self.vitesse[0] * dt
         self.position[1] += self.vitesse[1] * dt
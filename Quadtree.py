@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import numpy as np
+
+
 class Rectangle:
     """Rectangle pour représenter une région"""
 
@@ -38,20 +41,21 @@ class Quadtree:
         self.capacity = capacity
         self.max_depth = max_depth
         self.depth = depth
-        self.points = []  # Objets dans ce nœud
+        self.points = []  # Objets dans ce nœud : tuples (point, data, rayon)
         self.divided = False
         self.northwest = None
         self.northeast = None
         self.southwest = None
         self.southeast = None
 
-    def insert(self, point, data=None):
+    def insert(self, point, data=None, rayon=0):
         """
         Insère un point dans le Quadtree
 
         Args:
             point (list): Position [x, y]
             data (any): Données associées au point (e.g., balle)
+            rayon (float): Rayon de l'objet, utilisé par query_contacts
 
         Returns:
             bool: True si l'insertion a réussi, False sinon
@@ -62,7 +66,7 @@ class Quadtree:
 
         # Si nous avons de la place et pas subdivisé, ajouter le point ici
         if len(self.points) < self.capacity and not self.divided and self.depth < self.max_depth:
-            self.points.append((point, data))
+            self.points.append((point, data, rayon))
             return True
 
         # Subdiviser si nécessaire
@@ -71,14 +75,14 @@ class Quadtree:
 
         # Si déjà subdivisé ou vient d'être subdivisé, insérer dans les sous-arbres appropriés
         if self.divided:
-            if self.northwest.insert(point, data): return True
-            if self.northeast.insert(point, data): return True
-            if self.southwest.insert(point, data): return True
-            if self.southeast.insert(point, data): return True
+            if self.northwest.insert(point, data, rayon): return True
+            if self.northeast.insert(point, data, rayon): return True
+            if self.southwest.insert(point, data, rayon): return True
+            if self.southeast.insert(point, data, rayon): return True
 
         # Si on atteint ce point, insérer même si la capacité est dépassée
         if self.depth >= self.max_depth:
-            self.points.append((point, data))
+            self.points.append((point, data, rayon))
             return True
 
         return False
@@ -107,8 +111,8 @@ class Quadtree:
         # Redistribuer les points existants
         points_copy = self.points.copy()
         self.points = []
-        for point, data in points_copy:
-            self.insert(point, data)
+        for point, data, rayon in points_copy:
+            self.insert(point, data, rayon)
 
     def query_range(self, range_rect, found=None):
         """
@@ -129,7 +133,7 @@ class Quadtree:
             return found
 
         # Vérifier les points dans ce nœud
-        for point, data in self.points:
+        for point, data, _ in self.points:
             if range_rect.contains(point):
                 found.append((point, data))
 
@@ -165,7 +169,7 @@ class Quadtree:
             return found
 
         # Vérifier les points dans ce nœud
-        for point, data in self.points:
+        for point, data, _ in self.points:
             dx = center[0] - point[0]
             dy = center[1] - point[1]
             distance_squared = dx * dx + dy * dy
@@ -181,6 +185,45 @@ class Quadtree:
 
         return found
 
+    def query_contacts(self, center, rayon, rayon_max, found=None):
+        """
+        Trouve tous les objets dont le disque touche le disque (center, rayon)
+
+        Args:
+            center (list): Centre du disque [x, y]
+            rayon (float): Rayon du disque
+            rayon_max (float): Plus grand rayon des objets insérés (étend la zone de recherche)
+            found (list): Liste pour accumuler les résultats
+
+        Returns:
+            list: Liste des data des objets en contact
+        """
+        if found is None:
+            found = []
+
+        # Rectangle englobant tous les centres pouvant être en contact
+        portee = rayon + rayon_max
+        r = Rectangle(center[0] - portee, center[1] - portee, portee * 2, portee * 2)
+
+        if not self.boundary.intersects(r):
+            return found
+
+        # Comparer à la somme des rayons de chaque paire
+        for point, data, rayon_point in self.points:
+            dx = center[0] - point[0]
+            dy = center[1] - point[1]
+            somme = rayon + rayon_point
+            if dx * dx + dy * dy <= somme * somme:
+                found.append(data)
+
+        if self.divided:
+            self.northwest.query_contacts(center, rayon, rayon_max, found)
+            self.northeast.query_contacts(center, rayon, rayon_max, found)
+            self.southwest.query_contacts(center, rayon, rayon_max, found)
+            self.southeast.query_contacts(center, rayon, rayon_max, found)
+
+        return found
+
     def clear(self):
         """Vide l'arbre"""
         self.points = []
@@ -193,4 +236,182 @@ class Quadtree:
             self.northwest = None
             self.northeast = None
             self.southwest = None
-            self.southeast = None
\ No newline at end of file
+            self.southeast = None
+
+
+def _etaler_bits(v):
+    """Intercale un bit nul entre chaque bit (16 bits -> 32 bits) pour le code de Morton"""
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+def _compacter_bits(v):
+    """Opération inverse de _etaler_bits"""
+    v = v & 0x55555555
+    v = (v | (v >> 1)) & 0x33333333
+    v = (v | (v >> 2)) & 0x0F0F0F0F
+    v = (v | (v >> 4)) & 0x00FF00FF
+    v = (v | (v >> 8)) & 0x0000FFFF
+    return v
+
+
+class LinearQuadtree:
+    """Quadtree linéaire : points triés par code de Morton, stocké dans des tableaux NumPy"""
+
+    BITS = 16  # Profondeur maximale (bits par axe)
+
+    # Nœuds voisins « en avant » : chaque paire de nœuds n'est visitée qu'une fois
+    VOISINS_AVANT = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, boundary):
+        """
+        Initialise un Quadtree linéaire vide
+
+        Args:
+            boundary (Rectangle): Limites du domaine (les points hors limites sont ramenés au bord)
+        """
+        self.boundary = boundary
+        self.nb = 0
+
+        # Tampons réutilisés d'une frame à l'autre (le tri par argsort et les produits par nœud
+        # de query_pairs allouent encore leurs tableaux intermédiaires à chaque frame)
+        self._capacite = 0
+        self._grille = None  # Coordonnées entières (n, 2)
+        self._codes = None  # Codes de Morton dans l'ordre d'insertion
+        self.ordre = None  # Indice d'origine de chaque point, trié par code
+        self.codes_tries = None
+        self._paires = {}  # Tampons de sortie de query_pairs : nom -> tableau d'indices
+
+    def _reserver(self, n):
+        """Agrandit les tampons si nécessaire (jamais de réduction)"""
+        if n > self._capacite:
+            self._capacite = max(n, 2 * self._capacite, 64)
+            self._grille = np.empty((self._capacite, 2), dtype=np.int64)
+            self._codes = np.empty(self._capacite, dtype=np.int64)
+            self.codes_tries = np.empty(self._capacite, dtype=np.int64)
+
+    def construire(self, positions):
+        """
+        Construit l'arbre en une passe à partir d'un tableau de positions
+
+        Args:
+            positions (array): Tableau (n, 2) de positions [x, y]
+        """
+        n = len(positions)
+        self.nb = n
+        self._reserver(n)
+        if n == 0:
+            self.ordre = np.empty(0, dtype=np.intp)
+            return
+
+        # Domaine carré pour que tous les nœuds d'un niveau soient des carrés
+        cote = max(self.boundary.width, self.boundary.height)
+        echelle = (1 << self.BITS) / cote
+        grille = self._grille[:n]
+        np.floor((positions[:, 0] - self.boundary.x) * echelle, out=grille[:, 0], casting='unsafe')
+        np.floor((positions[:, 1] - self.boundary.y) * echelle, out=grille[:, 1], casting='unsafe')
+        np.clip(grille, 0, (1 << self.BITS) - 1, out=grille)
+
+        codes = self._codes[:n]
+        np.bitwise_or(_etaler_bits(grille[:, 0]), _etaler_bits(grille[:, 1]) << 1, out=codes)
+        self.ordre = np.argsort(codes, kind='stable')
+        np.take(codes, self.ordre, out=self.codes_tries[:n])
+
+    def _niveau(self, distance):
+        """Niveau le plus profond dont les nœuds ont un côté d'au moins `distance`"""
+        cote = max(self.boundary.width, self.boundary.height)
+        if distance <= 0:
+            return self.BITS
+        niveau = int(np.floor(np.log2(cote / distance)))
+        return max(0, min(self.BITS, niveau))
+
+    @staticmethod
+    def _produits(debut_a, nb_a, debut_b, nb_b):
+        """Toutes les paires (a, b) avec a dans [debut_a, debut_a + nb_a) et b dans [debut_b, debut_b + nb_b)"""
+        tailles = nb_a * nb_b
+        total = int(tailles.sum())
+        if total == 0:
+            vide = np.empty(0, dtype=np.intp)
+            return vide, vide
+        groupe = np.repeat(np.arange(len(tailles)), tailles)
+        local = np.arange(total) - np.repeat(np.cumsum(tailles) - tailles, tailles)
+        a = debut_a[groupe] + local // nb_b[groupe]
+        b = debut_b[groupe] + local % nb_b[groupe]
+        return a, b
+
+    def query_pairs(self, max_radius):
+        """
+        Énumère toutes les paires candidates de points pouvant se toucher
+
+        Args:
+            max_radius (float): Plus grand rayon des objets (distance de contact ≤ 2 × max_radius)
+
+        Returns:
+            tuple: Deux tableaux (i, j) d'indices d'origine, chaque paire n'apparaissant qu'une fois
+        """
+        n = self.nb
+        if n < 2:
+            vide = np.empty(0, dtype=np.intp)
+            return vide, vide
+
+        # Au niveau choisi, deux points en contact sont dans des nœuds identiques ou adjacents
+        niveau = self._niveau(2 * max_radius)
+        cles = self.codes_tries[:n] >> (2 * (self.BITS - niveau))
+
+        # Nœuds occupés : plages contiguës du tableau trié
+        debuts = np.flatnonzero(np.r_[True, cles[1:] != cles[:-1]])
+        nombres = np.diff(np.r_[debuts, n])
+        cles_noeuds = cles[debuts]
+
+        morceaux_a = []
+        morceaux_b = []
+
+        # Paires à l'intérieur d'un même nœud
+        a, b = self._produits(debuts, nombres, debuts, nombres)
+        garder = a < b
+        morceaux_a.append(a[garder])
+        morceaux_b.append(b[garder])
+
+        # Paires avec les nœuds voisins
+        cx = _compacter_bits(cles_noeuds)
+        cy = _compacter_bits(cles_noeuds >> 1)
+        limite = 1 << niveau
+        for dx, dy in self.VOISINS_AVANT:
+            vx = cx + dx
+            vy = cy + dy
+            valides = (vx >= 0) & (vx < limite) & (vy >= 0) & (vy < limite)
+            cles_voisines = _etaler_bits(np.where(valides, vx, 0)) | (_etaler_bits(np.where(valides, vy, 0)) << 1)
+            k = np.searchsorted(cles_noeuds, cles_voisines)
+            k_borne = np.minimum(k, len(cles_noeuds) - 1)
+            trouves = valides & (cles_noeuds[k_borne] == cles_voisines)
+            if not trouves.any():
+                continue
+            source = np.flatnonzero(trouves)
+            cible = k_borne[trouves]
+            a, b = self._produits(debuts[source], nombres[source], debuts[cible], nombres[cible])
+            morceaux_a.append(a)
+            morceaux_b.append(b)
+
+        return self._indices_origine(morceaux_a, "i"), self._indices_origine(morceaux_b, "j")
+
+    def _indices_origine(self, morceaux, nom):
+        """
+        Rassemble des morceaux de rangs triés en indices d'origine, dans un tampon de sortie réutilisé
+
+        Returns:
+            array: Vue sur le tampon, valable jusqu'au prochain appel de query_pairs
+        """
+        total = sum(len(morceau) for morceau in morceaux)
+        tampon = self._paires.get(nom)
+        if tampon is None or len(tampon) < total:
+            tampon = np.empty(max(total, 2 * len(tampon) if tampon is not None else 0), dtype=np.intp)
+            self._paires[nom] = tampon
+        debut = 0
+        for morceau in morceaux:
+            fin = debut + len(morceau)
+            np.take(self.ordre, morceau, out=tampon[debut:fin])
+            debut = fin
+        return tampon[:total]
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Enregistrement et relecture déterministes des parties
+
+Usage:
+    python Replay.py enregistrer config1.json partie.bnr [durée]  # simulation headless enregistrée
+    python Replay.py verifier partie.bnr                           # rejoue sans affichage et compare au journal
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import struct
+
+
+class Replay:
+    """Journal binaire d'une partie : graine, pas de temps, configuration et événements pas par pas"""
+
+    MAGIE = b"BNCR"
+    VERSION = 1
+    ENTETE = struct.Struct("<4sHQdI")  # Magie, version, graine, pas de temps, longueur de la configuration
+    EVENEMENT = struct.Struct("<IBII")  # Pas, type, objet a, objet b (13 octets)
+
+    # Types d'événements (a et b : identifiants d'objets dans l'ordre d'ajout à l'écran)
+    REBOND = 1  # a = balle, b = cercle touché
+    DESTRUCTION = 2  # a = cercle détruit, b = balle responsable
+    RETRAIT = 3  # a = objet sorti de l'écran
+    ETAT = 4  # a, b = empreintes CRC32 des positions et des vitesses des balles
+    FIN = 5  # a = nombre de pas de la partie
+
+    NOMS = {REBOND: "rebond", DESTRUCTION: "destruction", RETRAIT: "retrait", ETAT: "état", FIN: "fin"}
+
+    AUCUN = 0xFFFFFFFF  # Objet absent
+    PERIODE_ETAT = 60  # Pas entre deux empreintes de l'état des balles
+
+    def __init__(self, graine=None, dt=1.0 / 120, config=None):
+        """
+        Initialise un journal vide
+
+        Args:
+            graine (int): Graine des générateurs aléatoires de l'écran (tirée au hasard si None)
+            dt (float): Pas de temps fixe de la physique
+            config (dict): Configuration JSON de la partie (objets et écran)
+        """
+        self.graine = random.getrandbits(63) if graine is None else int(graine)
+        self.dt = dt
+        self.config = config or {}
+        self.evenements = []  # Tuples (pas, type, a, b)
+        self.nb_pas = None  # Connu à la fin de la partie
+
+    def ajouter(self, pas, type_evenement, a=None, b=None):
+        """Ajoute un événement (None = pas d'objet)"""
+        self.evenements.append((pas, type_evenement,
+                                self.AUCUN if a is None else a,
+                                self.AUCUN if b is None else b))
+
+    @staticmethod
+    def empreinte_etat(world):
+        """Empreintes CRC32 des positions et des vitesses de toutes les balles d'un BallWorld"""
+        n = world.nb
+        return (zlib.crc32(world.positions[:n].tobytes()),
+                zlib.crc32(world.vitesses[:n].tobytes()))
+
+    def terminer(self, nb_pas):
+        """Clôt le journal après `nb_pas` pas de physique"""
+        self.nb_pas = nb_pas
+        self.ajouter(nb_pas, self.FIN, nb_pas)
+
+    def sauvegarder(self, chemin):
+        """Écrit le journal (en-tête, configuration JSON, événements de taille fixe)"""
+        if self.nb_pas is None:
+            raise ValueError("Journal non terminé : appeler terminer() avant sauvegarder()")
+        config = json.dumps(self.config, ensure_ascii=False).encode('utf-8')
+        with open(chemin, 'wb') as f:
+            f.write(self.ENTETE.pack(self.MAGIE, self.VERSION, self.graine, self.dt, len(config)))
+            f.write(config)
+            f.write(b"".join(self.EVENEMENT.pack(*evenement) for evenement in self.evenements))
+
+    @classmethod
+    def charger(cls, chemin):
+        """
+        Lit un journal écrit par sauvegarder
+
+        Returns:
+            Replay: Journal chargé
+
+        Raises:
+            ValueError: Si le fichier n'est pas un journal de cette version
+        """
+        with open(chemin, 'rb') as f:
+            donnees = f.read()
+
+        magie, version, graine, dt, longueur = cls.ENTETE.unpack_from(donnees)
+        if magie != cls.MAGIE or version != cls.VERSION:
+            raise ValueError(f"{chemin} n'est pas un journal de partie (version {cls.VERSION})")
+        debut = cls.ENTETE.size
+        config = json.loads(donnees[debut:debut + longueur].decode('utf-8'))
+
+        replay = cls(graine, dt, config)
+        replay.evenements = list(cls.EVENEMENT.iter_unpack(donnees[debut + longueur:]))
+        if replay.evenements and replay.evenements[-1][1] == cls.FIN:
+            replay.nb_pas = replay.evenements[-1][2]
+        return replay
+
+    def comparer(self, autre):
+        """
+        Compare les événements de deux journaux
+
+        Returns:
+            tuple: (rang, événement attendu, événement obtenu) de la première différence, ou None
+                   (un événement manquant vaut None)
+        """
+        for rang in range(max(len(self.evenements), len(autre.evenements))):
+            attendu = self.evenements[rang] if rang < len(self.evenements) else None
+            obtenu = autre.evenements[rang] if rang < len(autre.evenements) else None
+            if attendu != obtenu:
+                return rang, attendu, obtenu
+        return None
+
+    @classmethod
+    def decrire(cls, evenement):
+        """Texte lisible d'un événement"""
+        if evenement is None:
+            return "aucun"
+        pas, type_evenement, a, b = evenement
+        objets = ", ".join(str(x) for x in (a, b) if x != cls.AUCUN)
+        return f"pas {pas}: {cls.NOMS.get(type_evenement, type_evenement)} ({objets})"
+
+
+def enregistrer(fichier_config, chemin, duree=10.0, graine=None):
+    """
+    Simule une configuration sans affichage en enregistrant la partie
+
+    Returns:
+        Replay: Journal sauvegardé dans `chemin`
+    """
+    from Launcher import creer_screen_depuis_config, creer_objets_depuis_config_json
+
+    with open(fichier_config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    screen = creer_screen_depuis_config(config, headless=True)
+    creer_objets_depuis_config_json(screen, config)
+    replay = Replay(graine, screen.pas_fixe, config)
+    screen.enregistrer(replay)
+    screen.simuler(duree=duree)
+    replay.sauvegarder(chemin)
+    return replay
+
+
+def rejouer(chemin):
+    """
+    Rejoue un journal sans affichage, aussi vite que possible, et compare la partie obtenue à l'originale
+
+    Returns:
+        tuple: (journal original, journal rejoué, première différence ou None)
+    """
+    from Launcher import creer_screen_depuis_config, creer_objets_depuis_config_json
+
+    original = Replay.charger(chemin)
+    if original.nb_pas is None:
+        raise ValueError(f"{chemin} est incomplet (pas d'événement de fin)")
+
+    screen = creer_screen_depuis_config(original.config, headless=True)
+    creer_objets_depuis_config_json(screen, original.config)
+    rejoue = Replay(original.graine, original.dt, original.config)
+    screen.enregistrer(rejoue)
+    screen.simuler(dt=original.dt, nb_pas=original.nb_pas)
+    return original, rejoue, original.comparer(rejoue)
+
+
+def main():
+    """Point d'entrée : enregistrement ou vérification d'un journal"""
+    arguments = sys.argv[1:]
+    if len(arguments) >= 3 and arguments[0] == "enregistrer":
+        fichier_config = arguments[1]
+        if not os.path.exists(fichier_config):
+            fichier_config = os.path.join("CONFIGS", fichier_config)
+        duree = float(arguments[3]) if len(arguments) > 3 else 10.0
+        replay = enregistrer(fichier_config, arguments[2], duree=duree)
+        print(f"🎬 {arguments[2]}: {replay.nb_pas} pas, {len(replay.evenements)} événements, graine {replay.graine}")
+
+    elif len(arguments) == 2 and arguments[0] == "verifier":
+        debut = time.perf_counter()
+        original, rejoue, difference = rejouer(arguments[1])
+        duree = time.perf_counter() - debut
+        if difference is None:
+            print(f"✅ {arguments[1]}: {original.nb_pas} pas et {len(original.evenements)} événements "
+                  f"identiques ({duree:.2f} s)")
+        else:
+            rang, attendu, obtenu = difference
+            print(f"❌ {arguments[1]}: divergence à l'événement {rang}")
+            print(f"   attendu : {Replay.decrire(attendu)}")
+            print(f"   obtenu  : {Replay.decrire(obtenu)}")
+            sys.exit(1)
+
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
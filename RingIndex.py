@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class RingIndex:
+    """Index des cercles groupés par centre et triés par rayon, pour trouver les anneaux qu'une balle touche"""
+
+    def __init__(self):
+        self.groupes = []  # Tuples (centre (2,), rayons triés, indices des cercles dans le même ordre)
+        self.nb_cercles = 0
+        self.a_reconstruire = True
+
+    def invalider(self):
+        """Demande une reconstruction (cercle ajouté ou retiré)"""
+        self.a_reconstruire = True
+
+    def reconstruire(self, cercles):
+        """
+        Regroupe les cercles par centre et trie chaque groupe par rayon
+
+        Args:
+            cercles (list): Cercles indexés ; les résultats désignent leur rang dans cette liste
+        """
+        par_centre = {}
+        for k, cercle in enumerate(cercles):
+            cle = (float(cercle.position[0]), float(cercle.position[1]))
+            par_centre.setdefault(cle, []).append(k)
+
+        self.groupes = []
+        for centre, indices in par_centre.items():
+            indices = np.array(indices, dtype=np.intp)
+            rayons = np.array([cercles[k].rayon for k in indices], dtype=float)
+            ordre = np.argsort(rayons, kind='stable')
+            self.groupes.append((np.array(centre), rayons[ordre], indices[ordre]))
+
+        self.nb_cercles = len(cercles)
+        self.a_reconstruire = False
+
+    def candidats(self, positions, tailles, marge=1e-9, bande=True):
+        """
+        Paires (balle, cercle) où la balle touche l'anneau : |distance - rayon| <= taille
+
+        Pour chaque groupe concentrique, deux recherches dichotomiques sur les rayons triés
+        encadrent les seuls anneaux dont la bande contient la balle. Sans `bande`, toutes les
+        paires où la balle atteint le cercle ou en est sortie (distance + taille >= rayon,
+        test « proche » historique de Screen._gerer_collision_balle_cercle) sont retenues.
+
+        Args:
+            positions (array): Tableau (n, 2) des centres des balles
+            tailles (array): Rayons des balles
+            marge (float): Tolérance relative d'arrondi sur la bande
+            bande (bool): False pour ne pas écarter les anneaux plus petits que la bande
+
+        Returns:
+            tuple: Tableaux (indices de balles, indices de cercles), non triés
+        """
+        morceaux_b = []
+        morceaux_k = []
+
+        for centre, rayons, indices in self.groupes:
+            delta = positions - centre
+            distances = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+            if bande:
+                tolerance = marge * (1.0 + distances)
+                debuts = np.searchsorted(rayons, distances - tailles - tolerance, side='left')
+            else:
+                # Une balle au centre exact est traitée comme à distance 1 (voir _gerer_collision_balle_cercle)
+                distances[distances == 0] = 1.0
+                tolerance = marge * (1.0 + distances)
+                debuts = np.zeros(len(positions), dtype=np.intp)
+            fins = np.searchsorted(rayons, distances + tailles + tolerance, side='right')
+            nombres = fins - debuts
+
+            total = int(nombres.sum())
+            if total == 0:
+                continue
+            balles = np.repeat(np.arange(len(positions)), nombres)
+            local = np.arange(total) - np.repeat(np.cumsum(nombres) - nombres, nombres)
+            morceaux_b.append(balles)
+            morceaux_k.append(indices[debuts[balles] + local])
+
+        if not morceaux_b:
+            vide = np.empty(0, dtype=np.intp)
+            return vide, vide
+        return np.concatenate(morceaux_b), np.concatenate(morceaux_k)
+
+    def impacts_balayes(self, debuts, fins, tailles):
+        """
+        Instants d'impact des balles balayées de `debuts` à `fins` contre les anneaux (détection continue)
+
+        Pour chaque anneau, la balle le touche quand elle sort du disque de rayon
+        rayon - taille (en venant de l'intérieur) ou entre dans le disque de rayon
+        rayon + taille (en venant de l'extérieur). Seul le premier de ces instants est retenu
+        pour chaque paire ; une balle qui part déjà de la bande en s'éloignant n'en produit pas.
+
+        Args:
+            debuts (array): Tableau (n, 2) des positions en début de pas
+            fins (array): Tableau (n, 2) des positions en fin de pas
+            tailles (array): Rayons des balles
+
+        Returns:
+            tuple: Tableaux (indices de balles, indices de cercles, fraction du pas dans [0, 1])
+        """
+        morceaux_b = []
+        morceaux_k = []
+        morceaux_s = []
+
+        deplacements = fins - debuts
+        longueurs2 = np.einsum('ij,ij->i', deplacements, deplacements)
+        mobiles = longueurs2 > 0
+
+        for centre, rayons, indices in self.groupes:
+            relatifs = debuts - centre
+            d0 = np.sqrt(np.einsum('ij,ij->i', relatifs, relatifs))
+            d1 = np.linalg.norm(fins - centre, axis=1)
+
+            # Distance minimale au centre le long du segment
+            projection = -np.einsum('ij,ij->i', relatifs, deplacements) / np.where(mobiles, longueurs2, 1.0)
+            proche = relatifs + np.clip(projection, 0.0, 1.0)[:, None] * deplacements
+            d_min = np.sqrt(np.einsum('ij,ij->i', proche, proche))
+            d_max = np.maximum(d0, d1)
+
+            # Anneaux dont la bande recoupe l'intervalle de distances parcouru
+            bas = np.searchsorted(rayons, d_min - tailles, side='left')
+            haut = np.searchsorted(rayons, d_max + tailles, side='right')
+            nombres = np.where(mobiles, haut - bas, 0)
+            total = int(nombres.sum())
+            if total == 0:
+                continue
+            b = np.repeat(np.arange(len(debuts)), nombres)
+            local = np.arange(total) - np.repeat(np.cumsum(nombres) - nombres, nombres)
+            k = bas[b] + local
+
+            r = rayons[k]
+            taille = tailles[b]
+            rayon_interieur = r - taille
+            rayon_exterieur = r + taille
+
+            # |relatif + s * deplacement| = rayon de contact, résolu pour les deux cercles de contact
+            a = longueurs2[b]
+            demi_b = np.einsum('ij,ij->i', relatifs[b], deplacements[b])
+            d0_carre = d0[b] ** 2
+            disc_interieur = demi_b * demi_b - a * (d0_carre - rayon_interieur ** 2)
+            disc_exterieur = demi_b * demi_b - a * (d0_carre - rayon_exterieur ** 2)
+
+            # Sortie du disque intérieur (plus grande racine), vers l'extérieur
+            sortie = (-demi_b + np.sqrt(np.maximum(disc_interieur, 0.0))) / a
+            sortie_valide = (rayon_interieur > 0) & (disc_interieur > 0) & (sortie > 0.0)
+            # Entrée dans le disque extérieur (plus petite racine), depuis l'extérieur
+            entree = (-demi_b - np.sqrt(np.maximum(disc_exterieur, 0.0))) / a
+            entree_valide = (d0[b] > rayon_exterieur) & (disc_exterieur > 0) & (entree >= 0.0)
+
+            s = np.where(sortie_valide, sortie, np.inf)
+            s = np.where(entree_valide & (entree < s), entree, s)
+
+            valides = s <= 1.0
+            morceaux_b.append(b[valides])
+            morceaux_k.append(indices[k[valides]])
+            morceaux_s.append(s[valides])
+
+        if not morceaux_b:
+            vide = np.empty(0, dtype=np.intp)
+            return vide, vide, np.empty(0)
+        return np.concatenate(morceaux_b), np.concatenate(morceaux_k), np.concatenate(morceaux_s)
@@ -1,51 +1,150 @@
 # -*- coding: utf-8 -*-
 import pygame
 from Balle import Balle
+from BallWorld import BallWorld
 from Cercle import Cercle
 from Particule import Particule, StyleExplosion
+from ParticleSystem import ParticleSystem
 import random
 import math
-from Quadtree import Quadtree, Rectangle
+import weakref
+import numpy as np
+from Quadtree import Quadtree, LinearQuadtree, Rectangle
+from SpatialHashGrid import SpatialHashGrid
+from SweepAndPrune import SweepAndPrune
+from RingIndex import RingIndex
 from SurfaceManager import SurfaceManager
+from JournalDebug import JournalDebug
+from Replay import Replay
 
 
 class Screen:
     def __init__(self, taille=(800, 600), couleur_fond="black", titre="Bounce",
-                 collision_sur_contact=True, brisure_dans_ouverture=False, marge_suppression=100, debug=False):
-        pygame.init()
+                 collision_sur_contact=True, brisure_dans_ouverture=False, marge_suppression=100, debug=False,
+                 broad_phase="quadtree", headless=False, frequence_physique=120, max_sous_pas=8,
+                 detection_continue=True, rendu_partiel=False, seuil_rendu_partiel=0.4, graine=None,
+                 anneaux_touches_seulement=False):
         self.taille = taille
         self.couleur_fond = couleur_fond
         self.titre = titre
-        self.ecran = pygame.display.set_mode(taille)
-        pygame.display.set_caption(titre)
+
+        # En mode headless, aucune fenêtre n'est ouverte et rien n'est dessiné
+        self.headless = headless
+        if headless:
+            self.ecran = None
+        else:
+            pygame.init()
+            self.ecran = pygame.display.set_mode(taille)
+            pygame.display.set_caption(titre)
         self.horloge = pygame.time.Clock()
         self.objets = []
-        self.particules = []
+        self.particules = ParticleSystem()
         self.en_cours = True
         self.marge_suppression = marge_suppression
         self.debug = debug
         self.quadtree = None
+        self.grille = None
+
+        # Structure de détection grossière des collisions entre balles
+        # ("quadtree", "linear_quadtree", "grid" ou "sap")
+        self.broad_phase = broad_phase
+        self.quadtree_lineaire = None  # Conservé entre les frames pour réutiliser ses tampons de construction
+
+        # Le tri et balayage est persistant entre les frames (alimenté par ajouter/retirer_objet)
+        self.sap = SweepAndPrune() if broad_phase == "sap" else None
+
+        # Stockage en tableaux de l'état physique de toutes les balles
+        self.world = BallWorld()
+        self.contacts_resolus = 0  # Contacts balle-balle résolus à la dernière frame
+
+        # Index des anneaux par centre et rayon (reconstruit quand un cercle est ajouté ou retiré)
+        self.index_anneaux = RingIndex()
+        # Si True, une balle n'interagit qu'avec les anneaux qu'elle touche (|distance - rayon| <= taille) ;
+        # sinon comportement historique : aussi avec tout anneau dont elle est sortie, même lointain
+        self.anneaux_touches_seulement = anneaux_touches_seulement
+        self.paires_balle_cercle = 0  # Paires balle-cercle examinées à la dernière frame
+
+        # Détection continue : une balle rapide ne peut plus traverser un anneau entre deux pas
+        self.detection_continue = detection_continue
+        self.impacts_continus = 0  # Balles ramenées à leur instant d'impact au dernier pas
 
         # Paramètres de collision globaux
         self.collision_sur_contact = collision_sur_contact
         self.brisure_dans_ouverture = brisure_dans_ouverture
 
         # Surface pour les éléments statiques
-        self.static_surface = pygame.Surface(taille, pygame.SRCALPHA)
-        self.static_surface.fill((0, 0, 0, 0))
-        self.static_objects = []  # Liste des objets statiques
+        self.static_surface = None if headless else pygame.Surface(taille, pygame.SRCALPHA)
+        if self.static_surface is not None:
+            self.static_surface.fill((0, 0, 0, 0))
+        self.static_objects = {}  # Objets statiques (dict ordonné utilisé comme ensemble)
         self.static_dirty = True  # Si True, il faut redessiner les éléments statiques
 
-        # Compteur pour les opérations périodiques
+        # Rendu partiel : seules les zones touchées par les objets dynamiques sont restaurées et envoyées
+        self.rendu_partiel = rendu_partiel
+        self.seuil_rendu_partiel = seuil_rendu_partiel  # Fraction de l'écran au-delà de laquelle on fait un flip
+        self.fond_compose = None  # Fond + couche statique, source de la restauration des zones
+        self.rects_precedents = []  # Zones dessinées à la frame précédente
+
+        # Compteurs pour les opérations périodiques (frames affichées, pas de physique)
         self.frame_counter = 0
+        self.pas_counter = 0
+
+        # Pas de physique fixe, indépendant du fps d'affichage
+        self.pas_fixe = 1.0 / frequence_physique
+        self.max_sous_pas = max_sous_pas  # Au-delà, le retard est abandonné (évite la spirale de la mort)
 
         # Gestionnaire de surfaces
         self.surface_manager = SurfaceManager.get_instance()
-
-    def log_debug(self, message):
-        """Affiche les messages de debug si activé"""
+        # Rien n'est dessiné en headless : cache sur disque suspendu jusqu'à la fin de simuler()
+        # (ou jusqu'à la destruction de l'écran), sans toucher aux écrans fenêtrés suivants
+        self.suspension_disque = None
+        if headless:
+            self.surface_manager.suspendre_disque()
+            self.suspension_disque = weakref.finalize(self, self.surface_manager.reprendre_disque)
+
+        # Journal de debug en tampon circulaire (vidé à la fermeture ou avec F12)
+        self.journal = JournalDebug(actif=debug)
+
+        # Aléatoire de la partie (explosions, balles superposées, particules) : reproductible avec une graine
+        self.initialiser_aleatoire(graine)
+
+        # Enregistrement de la partie (voir enregistrer) ; les objets y sont désignés par leur rang d'ajout
+        self.replay = None
+        self.identifiants = {}
+        self.nb_objets_ajoutes = 0
+
+    def initialiser_aleatoire(self, graine):
+        """
+        Initialise tous les générateurs aléatoires de l'écran à partir d'une graine
+
+        Args:
+            graine (int): Graine commune (None : tirages non reproductibles)
+        """
+        self.rng = random.Random(graine)
+        monde, particules = np.random.SeedSequence(graine).spawn(2)
+        self.world.rng = np.random.default_rng(monde)
+        self.particules.rng = np.random.default_rng(particules)
+
+    def enregistrer(self, replay):
+        """
+        Enregistre la partie dans un journal Replay : l'aléatoire est réinitialisé avec sa graine,
+        puis chaque rebond, destruction et retrait y est noté avec le pas où il se produit
+
+        Args:
+            replay (Replay): Journal à remplir (terminé à la fin de boucle ou simuler)
+        """
+        self.initialiser_aleatoire(replay.graine)
+        self.replay = replay
+
+    def _noter(self, type_evenement, a=None, b=None):
+        """Ajoute un événement au journal de la partie, si elle est enregistrée"""
+        if self.replay is not None:
+            self.replay.ajouter(self.pas_counter, type_evenement, self.identifiants.get(a), self.identifiants.get(b))
+
+    def log_debug(self, message, *args):
+        """Enregistre un message de debug différé (gabarit % et arguments formatés seulement au vidage)"""
         if self.debug:
-            print(f"[DEBUG] {message}")
+            self.journal.log(message, *args)
 
     def est_statique(self, obj):
         """Détermine si un objet est statique ou dynamique"""
@@ -57,15 +156,13 @@ class Screen:
         return False
 
     def categoriser_objets(self):
-        """Catégorise les objets en statiques et dynamiques"""
-        self.static_objects = []
-        for obj in self.objets:
-            if self.est_statique(obj):
-                self.static_objects.append(obj)
-
-        self.static_dirty = True  # Marquer pour redessiner
-        self.log_debug(
-            f"Objets catégorisés: {len(self.static_objects)} statiques, {len(self.objets) - len(self.static_objects)} dynamiques")
+        """Catégorise les objets en statiques et dynamiques (la couche statique n'est redessinée que si elle change)"""
+        statiques = {obj: None for obj in self.objets if self.est_statique(obj)}
+        if list(statiques) != list(self.static_objects):
+            self.static_objects = statiques
+            self.static_dirty = True  # Marquer pour redessiner
+        self.log_debug("Objets catégorisés: %d statiques, %d dynamiques",
+                       len(self.static_objects), len(self.objets) - len(self.static_objects))
 
     def mettre_a_jour_surface_statique(self):
         """Met à jour la surface contenant tous les éléments statiques"""
@@ -82,19 +179,37 @@ class Screen:
     def ajouter_objet(self, objet):
         """Ajoute un objet et le catégorise"""
         self.objets.append(objet)
+        self.identifiants[objet] = self.nb_objets_ajoutes
+        self.nb_objets_ajoutes += 1
+
+        # Les balles sont intégrées en bloc par le BallWorld de l'écran
+        if isinstance(objet, Balle):
+            self.world.adopter(objet)
+            if self.sap is not None:
+                self.sap.ajouter(objet)
+        elif isinstance(objet, Cercle):
+            self.index_anneaux.invalider()
 
         # Si c'est un objet statique, l'ajouter à la liste correspondante
         if self.est_statique(objet):
-            self.static_objects.append(objet)
+            self.static_objects[objet] = None
             self.static_dirty = True
 
     def retirer_objet(self, objet):
         """Retire un objet des listes"""
         if objet in self.objets:
             self.objets.remove(objet)
+        self.identifiants.pop(objet, None)
+
+        if isinstance(objet, Balle):
+            self.world.retirer(objet)
+            if self.sap is not None:
+                self.sap.retirer(objet)
+        elif isinstance(objet, Cercle):
+            self.index_anneaux.invalider()
 
         if objet in self.static_objects:
-            self.static_objects.remove(objet)
+            del self.static_objects[objet]
             self.static_dirty = True
 
     def retirer_objets_hors_ecran(self):
@@ -121,144 +236,553 @@ class Screen:
 
         # Retirer les objets identifiés
         for obj in objets_a_retirer:
+            self._noter(Replay.RETRAIT, obj)
             self.retirer_objet(obj)
-            self.log_debug(
-                f"Objet retiré hors écran: {type(obj).__name__} à {getattr(obj, 'position', 'position inconnue')}")
+            self.log_debug("Objet retiré hors écran: %s à %s",
+                           type(obj).__name__, tuple(getattr(obj, 'position', ())))
 
         return len(objets_a_retirer)
 
     def boucle(self, fps=60, duree=None):
+        """
+        Boucle de jeu à pas de physique fixe
+
+        Le temps écoulé à chaque frame affichée est accumulé puis consommé par pas
+        fixes de self.pas_fixe (au plus self.max_sous_pas par frame) ; le rendu
+        interpole les balles entre les deux derniers états. En mode headless,
+        délègue à simuler(), qui exige alors une durée.
+
+        Raises:
+            ValueError: En mode headless sans durée (aucun événement ne pourrait arrêter la boucle)
+        """
+        if self.headless:
+            return self.simuler(duree=duree)
+
         import time
         debut = time.time()
 
         # Catégorisation initiale des objets
         self.categoriser_objets()
 
+        accumulateur = 0.0
         while self.en_cours:
-            dt = self.horloge.tick(fps) / 1000.0
+            accumulateur += self.horloge.tick(fps) / 1000.0
             self.frame_counter += 1
 
             # Gestion des événements
+            self.journal.frame = self.frame_counter
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.en_cours = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F12:
+                    self.journal.vider()
 
             # Vérification de la durée
             if duree and (time.time() - debut) >= duree:
                 self.en_cours = False
 
-            # Effacer l'écran
-            self.ecran.fill(self.couleur_fond)
-
-            # Séparer les objets par type
-            balles = [obj for obj in self.objets if isinstance(obj, Balle)]
-            cercles = [obj for obj in self.objets if isinstance(obj, Cercle)]
-
-            # Mise à jour des objets
-            for obj in self.objets:
-                if hasattr(obj, 'mettre_a_jour'):
-                    obj.mettre_a_jour(dt)
-
-                    # Si un objet statique a été modifié (ex: cercle qui a perdu de la vie)
-                    if obj in self.static_objects and isinstance(obj, Cercle):
-                        if obj.a_change():
-                            self.static_dirty = True
-
-            # Recatégorisation périodique (toutes les 60 frames)
-            if self.frame_counter % 60 == 0:
-                self.categoriser_objets()
-
-            # Retirer les objets hors écran
-            objets_retires = self.retirer_objets_hors_ecran()
-            if objets_retires > 0:
-                self.log_debug(f"{objets_retires} objets retirés de l'écran")
-
-            # Gestion des collisions entre balles
-            self.check_collisions()
-
-            # Gestion des collisions balle-cercle avec nouvelle logique
-            for balle in balles:
-                for cercle in cercles[:]:
-                    collision_point = self._gerer_collision_balle_cercle(balle, cercle)
-
-                    if cercle.life <= 0:
-                        self.log_debug(f"Cercle détruit! Création d'explosion à {collision_point}")
-                        self._creer_explosion(cercle, collision_point)
-                        # Suppression du cercle
-                        self.retirer_objet(cercle)
-                        if cercle in cercles:
-                            cercles.remove(cercle)
-
-            # Mettre à jour la surface statique si nécessaire
-            self.mettre_a_jour_surface_statique()
+            # Consommer le temps accumulé par pas fixes
+            sous_pas = 0
+            while accumulateur >= self.pas_fixe and sous_pas < self.max_sous_pas:
+                self.pas_physique(self.pas_fixe)
+                accumulateur -= self.pas_fixe
+                sous_pas += 1
+            if accumulateur >= self.pas_fixe:
+                accumulateur %= self.pas_fixe
 
-            # Afficher la surface statique (objets qui ne changent pas)
-            if self.static_objects:
-                self.ecran.blit(self.static_surface, (0, 0))
+            self.rendre(alpha=accumulateur / self.pas_fixe)
 
-            # Afficher uniquement les objets dynamiques (qui ne sont pas dans la liste statique)
-            for obj in self.objets:
-                if obj not in self.static_objects:
-                    obj.afficher(self.ecran)
+            # Nettoyage périodique des surfaces temporaires (toutes les 300 frames)
+            if self.frame_counter % 300 == 0:
+                self.surface_manager.cleanup()
 
-            # Mise à jour et affichage des particules
-            for particule in self.particules[:]:
-                particule.mettre_a_jour(dt)
-                particule.afficher(self.ecran)
+        # Bilan des caches de surfaces, puis vidage du journal de debug accumulé pendant la partie
+        for nom, stats in self.surface_manager.stats().items():
+            self.log_debug("Cache %s: %d entrées, %.1f Mo, %d hits, %d misses, %d évictions", nom,
+                           stats["entrees"], stats["octets"] / 1e6, stats["hits"], stats["misses"],
+                           stats["evictions"])
+        if self.surface_manager.cache_disque is not None:
+            stats = self.surface_manager.cache_disque.stats()
+            self.log_debug("Cache disque: %d lectures, %d écritures", stats["lectures"], stats["ecritures"])
+        self.journal.vider()
 
-                # Supprimer les particules expirées
-                if particule.vie <= 0:
-                    self.particules.remove(particule)
+        if self.replay is not None:
+            self.replay.terminer(self.pas_counter)
 
-            self.log_debug("\n")
+        pygame.quit()
 
-            # Mise à jour de l'affichage
-            pygame.display.flip()
+    def simuler(self, duree=None, dt=None, nb_pas=None):
+        """
+        Fait tourner la physique sans affichage, aussi vite que possible, avec un pas fixe
 
-            # Nettoyage périodique des surfaces temporaires (toutes les 300 frames)
-            if self.frame_counter % 300 == 0:
-                self.surface_manager.cleanup()
+        Args:
+            duree (float): Temps simulé en secondes (None = jusqu'à nb_pas)
+            dt (float): Pas de temps fixe en secondes (par défaut self.pas_fixe)
+            nb_pas (int): Nombre maximal de pas (None = jusqu'à duree)
 
-        pygame.quit()
+        Returns:
+            dict: Statistiques de la simulation
 
-    def check_collisions(self):
-        """Vérifie les collisions entre balles en utilisant Quadtree"""
-        # Récupérer uniquement les balles
+        Raises:
+            ValueError: Si ni duree ni nb_pas n'est donné (sans boucle d'événements, rien n'arrêterait la simulation)
+        """
+        import time
+        debut = time.perf_counter()
+
+        if dt is None:
+            dt = self.pas_fixe
+        if duree is not None:
+            pas_duree = int(round(duree / dt))
+            nb_pas = pas_duree if nb_pas is None else min(nb_pas, pas_duree)
+        if nb_pas is None:
+            raise ValueError("simuler() nécessite une durée ou un nombre de pas")
+
+        self.categoriser_objets()
+
+        pas = 0
+        while self.en_cours and pas < nb_pas:
+            self.frame_counter += 1
+            self.journal.frame = self.frame_counter
+            self.pas_physique(dt)
+            pas += 1
+
+        if self.debug:
+            self.journal.vider()
+
+        if self.replay is not None:
+            self.replay.terminer(self.pas_counter)
+
+        if self.suspension_disque is not None:
+            self.suspension_disque()  # Reprend le cache sur disque (une seule fois)
+
+        return {
+            "pas": pas,
+            "temps_simule": pas * dt,
+            "temps_reel": time.perf_counter() - debut,
+            "balles": self.world.nb,
+            "cercles": sum(1 for obj in self.objets if isinstance(obj, Cercle)),
+            "particules": self.particules.nb,
+        }
+
+    def pas_physique(self, dt):
+        """Avance la simulation d'un pas : intégration, collisions, destruction des cercles, particules"""
+        self.pas_counter += 1
+
+        # Séparer les objets par type
         balles = [obj for obj in self.objets if isinstance(obj, Balle)]
+        cercles = [obj for obj in self.objets if isinstance(obj, Cercle)]
+
+        # Gravité et intégration de toutes les balles en une seule passe
+        self.world.memoriser_positions()
+        self.world.integrer(dt)
+
+        # Balles rapides qui auraient traversé un anneau pendant le pas
+        if self.detection_continue:
+            self.balayer_anneaux(cercles)
+
+        # Mise à jour des autres objets
+        for obj in self.objets:
+            if hasattr(obj, 'mettre_a_jour') and not isinstance(obj, Balle):
+                obj.mettre_a_jour(dt)
+
+                # Si un objet statique a été modifié (ex: cercle qui a perdu de la vie)
+                if obj in self.static_objects and isinstance(obj, Cercle):
+                    if obj.a_change():
+                        self.static_dirty = True
+
+        # Recatégorisation périodique (tous les 60 pas)
+        if self.pas_counter % 60 == 0:
+            self.categoriser_objets()
+
+        # Retirer les objets hors écran
+        objets_retires = self.retirer_objets_hors_ecran()
+        if objets_retires > 0:
+            self.log_debug("%d objets retirés de l'écran", objets_retires)
+
+        # Gestion des collisions entre balles
+        self.check_collisions()
+
+        # Gestion des collisions balle-cercle (index des anneaux)
+        self.gerer_collisions_balles_cercles(balles, cercles)
+
+        # Cache des rotations réparti entre les géométries des arcs tournants encore affichés
+        if not self.headless:
+            self.repartir_rotations_arcs(cercles)
+
+        # Mise à jour des particules et compactage des particules expirées
+        self.particules.mettre_a_jour(dt)
+
+        # Empreinte périodique de l'état des balles, pour vérifier une relecture
+        if self.replay is not None and self.pas_counter % Replay.PERIODE_ETAT == 0:
+            self.replay.ajouter(self.pas_counter, Replay.ETAT, *Replay.empreinte_etat(self.world))
+
+    def repartir_rotations_arcs(self, cercles):
+        """Répartit à nouveau le cache des rotations quand l'ensemble des géométries d'arcs tournants change"""
+        arcs = {cercle.geometrie_tournante(): cercle for cercle in cercles if cercle.est_arc_tournant()}
+        if arcs.keys() == self.surface_manager.rotations_arcs.keys():
+            return
+        pas = Cercle.repartir_rotations({geometrie: arc.octets_rotation() for geometrie, arc in arcs.items()})
+        en_cache = [p for p in pas.values() if p is not None]
+        self.log_debug("Rotations des arcs: %d géométries en cache (pas de %.2f° à %.2f°), %d tournées à chaque frame",
+                       len(en_cache), min(en_cache, default=0), max(en_cache, default=0),
+                       len(pas) - len(en_cache))
+
+    def rendre(self, alpha=1.0):
+        """
+        Dessine la frame courante et met à jour l'affichage
+
+        Args:
+            alpha (float): Position du rendu entre le pas précédent (0) et le pas courant (1)
+        """
+        if self.rendu_partiel:
+            self._rendre_partiel(alpha)
+            return
+
+        # Effacer l'écran
+        self.ecran.fill(self.couleur_fond)
+
+        # Mettre à jour la surface statique si nécessaire
+        self.mettre_a_jour_surface_statique()
+
+        # Tous les blits de la frame dans une seule liste : surface statique, objets dynamiques, particules
+        self.ecran.blits(self.lots_de_rendu(alpha), doreturn=False)
+
+        # Mise à jour de l'affichage
+        pygame.display.flip()
+
+    def _rendre_partiel(self, alpha):
+        """
+        Rendu par zones sales : efface les zones de la frame précédente depuis le fond composé,
+        dessine les objets dynamiques et n'envoie à l'écran que les rectangles touchés
+
+        Un flip complet est fait quand la couche statique change ou quand la surface sale
+        dépasse seuil_rendu_partiel × la surface de l'écran.
+        """
+        recomposer = self.fond_compose is None or self.static_dirty
+        if recomposer:
+            self.mettre_a_jour_surface_statique()
+            self.static_dirty = False
+            self.fond_compose = pygame.Surface(self.taille).convert()
+            self.fond_compose.fill(self.couleur_fond)
+            if self.static_objects:
+                self.fond_compose.blit(self.static_surface, (0, 0))
+            self.ecran.blit(self.fond_compose, (0, 0))
+        else:
+            # Restaurer le fond sous les objets de la frame précédente
+            fond = self.fond_compose
+            self.ecran.blits([(fond, rect, rect) for rect in self.rects_precedents], doreturn=False)
+
+        rects = self.ecran.blits(self.lots_de_rendu(alpha, avec_statique=False))
+        sales = self.rects_precedents + rects
+        self.rects_precedents = rects
+
+        largeur, hauteur = self.taille
+        if recomposer or sum(r.w * r.h for r in sales) > self.seuil_rendu_partiel * largeur * hauteur:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._fusionner_rects(sales))
+
+    @staticmethod
+    def _fusionner_rects(rects):
+        """Fusionne chaque rectangle avec le premier rectangle déjà retenu qu'il chevauche"""
+        fusionnes = []
+        for rect in rects:
+            if not rect.w or not rect.h:
+                continue
+            k = rect.collidelist(fusionnes)
+            if k < 0:
+                fusionnes.append(rect)
+            else:
+                fusionnes[k] = fusionnes[k].union(rect)
+        return fusionnes
+
+    def lots_de_rendu(self, alpha=1.0, avec_statique=True):
+        """
+        Couples (surface, destination) de la frame, dans l'ordre de dessin
+
+        Args:
+            alpha (float): Position du rendu entre le pas précédent (0) et le pas courant (1)
+            avec_statique (bool): Inclure la couche statique (False pour le rendu partiel)
+
+        Returns:
+            list: Liste prête pour Surface.blits
+        """
+        lots = []
+
+        # Surface statique (objets qui ne changent pas)
+        if avec_statique and self.static_objects:
+            lots.append((self.static_surface, (0, 0)))
+
+        # Objets dynamiques ; coins des balles calculés en bloc depuis les positions interpolées
+        n = self.world.nb
+        coins = (self.world.positions_interpolees(alpha) - self.world.tailles[:n, None]).astype(np.int64).tolist()
+        statiques = self.static_objects
+        for obj in self.objets:
+            if obj in statiques:
+                continue
+            if isinstance(obj, Balle):
+                lots.append((obj.surface_affichage(), coins[obj.index]))
+            else:
+                lots.append(obj.sprite())
+
+        # Particules
+        lots.extend(self.particules.sprites(self.surface_manager))
+        return lots
+
+    def check_collisions(self):
+        """Vérifie les collisions entre balles (phase grossière configurable) et les résout en bloc"""
+        paires_i, paires_j = self.paires_candidates()
+
+        # Résolution vectorisée de toutes les paires
+        self.contacts_resolus = self.world.resoudre_collisions(paires_i, paires_j)
+        return self.contacts_resolus
+
+    def paires_candidates(self):
+        """Paires (i, j) d'indices du BallWorld en contact, issues de la phase grossière configurée"""
+        if self.broad_phase == "grid":
+            paires_i, paires_j = self._paires_grille()
+        elif self.broad_phase == "sap":
+            paires_i, paires_j = self._paires_balayage()
+        elif self.broad_phase == "linear_quadtree":
+            paires_i, paires_j = self._paires_quadtree_lineaire()
+        else:
+            # Le Quadtree filtre déjà par somme des rayons
+            return self._paires_quadtree()
+
+        # Pré-filtrage par somme des rayons avant la phase fine
+        return self.world.filtrer_contacts(paires_i, paires_j)
+
+    def _paires_quadtree(self):
+        """Paires en contact obtenues en reconstruisant un Quadtree à chaque frame"""
+        balles = self.world.balles
+        rayon_max = self.world.taille_max()
 
-        # Créer un nouveau Quadtree à chaque frame
         # +100 pour inclure les objets légèrement hors écran
         boundary = Rectangle(-100, -100,
                              self.taille[0] + 200,
                              self.taille[1] + 200)
         self.quadtree = Quadtree(boundary)
 
-        # Insérer toutes les balles dans le Quadtree avec leur indice
-        for i, balle in enumerate(balles):
-            self.quadtree.insert(balle.position, (i, balle))
-
-        # Vérifier les collisions pour chaque balle
-        for i, balle in enumerate(balles):
-            # Créer une zone de recherche autour de la balle
-            radius = balle.taille * 2  # Rayon de recherche (2x taille pour être sûr)
+        # Insérer toutes les balles avec leur indice dans le BallWorld et leur rayon
+        for balle in balles:
+            self.quadtree.insert(balle.position, balle.index, balle.taille)
 
-            # Trouver les balles potentiellement en collision
-            potential_collisions = self.quadtree.query_radius(balle.position, radius)
-
-            # Vérifier uniquement ces collisions
-            for _, data in potential_collisions:
-                j, other_balle = data
+        paires_i = []
+        paires_j = []
+        for balle in balles:
+            i = balle.index
+            # Recherche sur taille + rayon max : aucun voisin plus gros n'est manqué
+            for j in self.quadtree.query_contacts(balle.position, balle.taille, rayon_max):
                 if i < j:  # Éviter de vérifier deux fois la même paire
-                    balle.collision_avec_balle(other_balle)
-
-    def _est_entierement_dans_ouverture(self, balle, cercle):
-        """Vérifie si TOUTE la balle est dans l'ouverture"""
+                    paires_i.append(i)
+                    paires_j.append(j)
+
+        return paires_i, paires_j
+
+    def _paires_quadtree_lineaire(self):
+        """Paires candidates énumérées en bloc par un Quadtree linéaire (codes de Morton)"""
+        n = self.world.nb
+        if self.quadtree_lineaire is None:
+            # +100 pour inclure les objets légèrement hors écran
+            boundary = Rectangle(-100, -100,
+                                 self.taille[0] + 200,
+                                 self.taille[1] + 200)
+            self.quadtree_lineaire = LinearQuadtree(boundary)
+
+        self.quadtree_lineaire.construire(self.world.positions[:n])
+        if n == 0:
+            return [], []
+        return self.quadtree_lineaire.query_pairs(self.world.taille_max())
+
+    def _paires_grille(self):
+        """Paires candidates obtenues en une passe sur une grille uniforme"""
+        n = self.world.nb
+        if n == 0:
+            return [], []
+
+        # Cellule de 2x le plus grand rayon : deux balles en contact sont dans des cellules voisines
+        self.grille = SpatialHashGrid(2 * self.world.taille_max())
+        positions = self.world.positions
+        for i in range(n):
+            self.grille.insert(positions[i], i)
+
+        paires = self.grille.paires_candidates()
+        if not paires:
+            return [], []
+        paires_i, paires_j = zip(*paires)
+        return paires_i, paires_j
+
+    def _paires_balayage(self):
+        """Paires candidates émises directement par le tri et balayage persistant"""
+        paires = self.sap.paires_candidates(self.world)
+        if not paires:
+            return [], []
+        paires_i, paires_j = zip(*paires)
+        return paires_i, paires_j
+
+    def _preparer_index_anneaux(self, cercles):
+        """Reconstruit l'index des anneaux si la liste des cercles a changé"""
+        if self.index_anneaux.a_reconstruire or self.index_anneaux.nb_cercles != len(cercles):
+            self.index_anneaux.reconstruire(cercles)
+
+    def balayer_anneaux(self, cercles):
+        """
+        Détection continue des balles rapides contre les anneaux
+
+        Le test de proximité de gerer_collisions_balles_cercles ne voit que la position de
+        fin de pas : une balle qui parcourt plus que son rayon peut sauter par-dessus la
+        bande d'un anneau. Le segment parcouru pendant le pas est donc balayé contre les
+        anneaux ; au premier impact sur une partie pleine (ou dans une ouverture si la
+        brisure est active), la balle est ramenée à l'instant d'impact, juste dans la bande,
+        et la logique habituelle fait le rebond ou la brisure.
+
+        Args:
+            cercles (list): Cercles de la frame (dans l'ordre de self.objets)
+        """
+        self.impacts_continus = 0
+        n = self.world.nb
+        if n == 0 or not cercles:
+            return
+        if not self.collision_sur_contact and not self.brisure_dans_ouverture:
+            return
+
+        # Seules les balles qui avancent de plus que leur rayon peuvent sauter une bande
+        debuts = self.world.positions_precedentes[:n]
+        fins = self.world.positions[:n]
+        tailles = self.world.tailles[:n]
+        deplacements = fins - debuts
+        rapides = np.flatnonzero(np.einsum('ij,ij->i', deplacements, deplacements) > tailles * tailles)
+        if rapides.size == 0:
+            return
+
+        self._preparer_index_anneaux(cercles)
+        impacts_b, impacts_k, impacts_s = self.index_anneaux.impacts_balayes(debuts[rapides], fins[rapides],
+                                                                           tailles[rapides])
+        if impacts_s.size == 0:
+            return
+
+        # Impacts de chaque balle dans l'ordre chronologique
+        ordre = np.lexsort((impacts_s, impacts_b))
+        impacts_b = impacts_b[ordre].tolist()
+        impacts_k = impacts_k[ordre].tolist()
+        impacts_s = impacts_s[ordre].tolist()
+
+        balle_traitee = -1
+        for b, k, s in zip(impacts_b, impacts_k, impacts_s):
+            if b == balle_traitee:
+                continue
+            i = int(rapides[b])
+            balle = self.world.balles[i]
+            cercle = cercles[k]
+            x0, y0 = debuts[i]
+            dx, dy = deplacements[i]
+            # Un millième de pixel au-delà du cercle de contact : la balle est dans la bande
+            s = min(1.0, s + 1e-3 / math.hypot(dx, dy))
+            impact = (x0 + s * dx, y0 + s * dy)
+
+            if cercle.angle_ouverture > 0 and self._est_entierement_dans_ouverture(balle, cercle, impact):
+                retenu = self.brisure_dans_ouverture
+            else:
+                retenu = self.collision_sur_contact
+            if not retenu:
+                continue
+
+            self.world.positions[i] = impact
+            balle_traitee = b
+            self.impacts_continus += 1
+            if self.debug:
+                self.journal.evenement("impact_continu", balle=i, cercle=k, fraction=s, position=impact)
+
+    def gerer_collisions_balles_cercles(self, balles, cercles):
+        """
+        Traite les paires balle × cercle de la frame
+
+        L'index des anneaux (RingIndex) retient les paires où la balle atteint le cercle
+        ou en est sortie (distance + taille >= rayon, comme la double boucle historique),
+        ou seulement les anneaux dont la bande |distance - rayon| <= taille contient la
+        balle avec anneaux_touches_seulement ; la logique exacte de
+        _gerer_collision_balle_cercle (rebond, ouverture, brisure) ne tourne que sur
+        ces paires, dans l'ordre balle par balle puis cercle par cercle.
+
+        Args:
+            balles (list): Balles de la frame (dans l'ordre de self.objets)
+            cercles (list): Cercles de la frame ; les cercles détruits en sont retirés
+        """
+        self.paires_balle_cercle = 0
+        if not balles or not cercles:
+            return
+
+        self._preparer_index_anneaux(cercles)
+
+        # État des balles : lignes du BallWorld (ou de leur monde privé si retirées cette frame)
+        indices = np.fromiter((balle.index if balle.world is self.world else -1 for balle in balles),
+                              dtype=np.intp, count=len(balles))
+        positions = self.world.positions[indices]
+        tailles = self.world.tailles[indices]
+        for b in np.flatnonzero(indices < 0):
+            positions[b] = balles[b].position
+            tailles[b] = balles[b].taille
+
+        # Paires candidates triées par balle puis par rang du cercle
+        bande = self.anneaux_touches_seulement
+        paires_b, paires_k = self.index_anneaux.candidats(positions, tailles, bande=bande)
+        # Les cercles déjà sans vie sont examinés (et détruits) avec la première balle
+        morts = np.array([k for k, cercle in enumerate(cercles) if cercle.life <= 0], dtype=np.intp)
+        nb_cercles = len(cercles)
+        cles = np.unique(np.concatenate((paires_b * nb_cercles + paires_k, morts)))
+        if cles.size == 0:
+            return
+        paires_b = cles // nb_cercles
+        paires_k = cles % nb_cercles
+        self.paires_balle_cercle = len(cles)
+
+        detruits = [False] * nb_cercles
+        debuts = np.flatnonzero(np.r_[True, paires_b[1:] != paires_b[:-1]])
+        fins = np.r_[debuts[1:], len(paires_b)]
+        for debut, fin in zip(debuts.tolist(), fins.tolist()):
+            balle = balles[int(paires_b[debut])]
+            ks = paires_k[debut:fin].tolist()
+            pos = 0
+            while pos < len(ks):
+                k = ks[pos]
+                pos += 1
+                if detruits[k]:
+                    continue
+
+                cercle = cercles[k]
+                x_avant, y_avant = balle.position
+                collision_point = self._gerer_collision_balle_cercle(balle, cercle)
+
+                if cercle.life <= 0:
+                    self.log_debug("Cercle détruit! Création d'explosion à %s", collision_point)
+                    self._noter(Replay.DESTRUCTION, cercle, balle)
+                    self._creer_explosion(cercle, collision_point)
+                    # Suppression du cercle
+                    self.retirer_objet(cercle)
+                    detruits[k] = True
+
+                # Balle repositionnée : rechercher à nouveau les cercles suivants
+                x, y = balle.position
+                if x != x_avant or y != y_avant:
+                    _, suivants = self.index_anneaux.candidats(np.array([[x, y]]), np.array([balle.taille]),
+                                                               bande=bande)
+                    suivants = np.union1d(suivants, morts)
+                    ks = suivants[suivants > k].tolist()
+                    pos = 0
+
+        cercles[:] = [cercle for cercle, detruit in zip(cercles, detruits) if not detruit]
+
+    def _est_entierement_dans_ouverture(self, balle, cercle, position=None):
+        """Vérifie si TOUTE la balle est dans l'ouverture (à sa position, ou à `position` si donnée)"""
         if cercle.angle_ouverture == 0:
             return False
 
+        if position is None:
+            position = balle.position
+
         # Calculer l'angle du centre de la balle
-        dx = balle.position[0] - cercle.position[0]
-        dy = balle.position[1] - cercle.position[1]
+        dx = position[0] - cercle.position[0]
+        dy = position[1] - cercle.position[1]
         distance_centre = math.sqrt(dx * dx + dy * dy)
 
         if distance_centre == 0:
@@ -309,8 +833,6 @@ class Screen:
 
     def _gerer_collision_balle_cercle(self, balle, cercle):
         """Gère la collision entre une balle et un cercle selon les paramètres configurés"""
-        import numpy as np
-
         centre_cercle = np.array(cercle.position)
         rayon_cercle = cercle.rayon
         position = np.array(balle.position)
@@ -336,13 +858,12 @@ class Screen:
         s_eloigne = np.dot(vitesse_vec, normal) > 0  # True si la balle s'éloigne du centre
 
         # Logs détaillés
-        self.log_debug(f"Balle pos: {[round(x, 2) for x in balle.position]}, Cercle pos: {cercle.position}")
-        self.log_debug(f"Distance: {distance:.2f}, Rayon: {rayon_cercle}, Taille balle: {balle.taille}")
-        self.log_debug(
-            f"Proche du cercle: {balle_pres_du_cercle}, À l'intérieur: {balle_a_l_interieur}, À l'extérieur: {balle_a_l_exterieur}")
-        self.log_debug(f"S'approche: {s_approche}, S'éloigne: {s_eloigne}")
-        self.log_debug(
-            f"Mode collision_sur_contact: {self.collision_sur_contact}, Mode brisure: {self.brisure_dans_ouverture}")
+        if self.debug:
+            self.journal.evenement("balle_cercle", balle=tuple(balle.position), cercle=tuple(cercle.position),
+                                   distance=distance, rayon=rayon_cercle, taille=balle.taille,
+                                   proche=balle_pres_du_cercle, interieur=balle_a_l_interieur,
+                                   exterieur=balle_a_l_exterieur, approche=s_approche, eloigne=s_eloigne,
+                                   contact=self.collision_sur_contact, brisure=self.brisure_dans_ouverture)
 
         if balle_pres_du_cercle:
             collision_detectee = False
@@ -353,7 +874,7 @@ class Screen:
             if self.brisure_dans_ouverture and cercle.angle_ouverture > 0:
                 self.log_debug("Vérification: BRISURE DANS OUVERTURE")
                 balle_entierement_dans_ouverture = self._est_entierement_dans_ouverture(balle, cercle)
-                self.log_debug(f"Balle entièrement dans ouverture: {balle_entierement_dans_ouverture}")
+                self.log_debug("Balle entièrement dans ouverture: %s", balle_entierement_dans_ouverture)
 
                 # Conditions pour la brisure : balle dans l'ouverture ET proche du cercle
                 if balle_entierement_dans_ouverture and balle_pres_du_cercle:
@@ -361,7 +882,7 @@ class Screen:
                     cercle.life = 0  # Brise immédiatement
                     point_collision = list(position)  # Point d'impact = position de la balle
                     brisure_detectee = True
-                    self.log_debug(f"BRISURE! Cercle brisé à la position: {[round(x, 2) for x in point_collision]}")
+                    self.log_debug("BRISURE! Cercle brisé à la position: (%.2f, %.2f)", *point_collision)
                     # Pas de rebond, la balle continue sa trajectoire
                 else:
                     self.log_debug("Conditions de brisure non remplies")
@@ -376,9 +897,9 @@ class Screen:
                 else:
                     # Arc : logique d'ouverture avec vérification de direction
                     balle_entierement_dans_ouverture = self._est_entierement_dans_ouverture(balle, cercle)
-                    self.log_debug(
-                        f"Angle ouverture: {cercle.angle_ouverture}°, Rotation: {cercle.angle_rotation:.1f}°")
-                    self.log_debug(f"Balle entièrement dans ouverture: {balle_entierement_dans_ouverture}")
+                    self.log_debug("Angle ouverture: %s°, Rotation: %.1f°", cercle.angle_ouverture,
+                                   cercle.angle_rotation)
+                    self.log_debug("Balle entièrement dans ouverture: %s", balle_entierement_dans_ouverture)
 
                     if balle_entierement_dans_ouverture:
                         # Balle dans l'ouverture - pas de collision
@@ -408,8 +929,9 @@ class Screen:
                 if collision_detectee:
                     # Rebond traditionnel
                     cercle.life -= 1
+                    self._noter(Replay.REBOND, balle, cercle)
                     point_collision = centre_cercle + normal * rayon_cercle
-                    self.log_debug(f"REBOND! Vie du cercle: {cercle.life}")
+                    self.log_debug("REBOND! Vie du cercle: %s", cercle.life)
 
                     vitesse_vec = np.array(balle.vitesse, dtype=float)
                     nouvelle_vitesse = vitesse_vec - 2 * np.dot(vitesse_vec, normal) * normal
@@ -420,8 +942,8 @@ class Screen:
                         # Balle vient de l'intérieur - la placer à l'intérieur
                         nouvelle_position = centre_cercle + normal * (rayon_cercle - balle.taille)
                         balle.position = list(nouvelle_position)
-                        self.log_debug(f"Repositionnement INTÉRIEUR: {[round(x, 2) for x in balle.position]}")
-                    self.log_debug(f"Nouvelle vitesse: {[round(x, 2) for x in balle.vitesse]}")
+                        self.log_debug("Repositionnement INTÉRIEUR: (%.2f, %.2f)", *balle.position)
+                    self.log_debug("Nouvelle vitesse: (%.2f, %.2f)", *balle.vitesse)
 
             # S'assurer que point_collision est toujours une liste ou None
             if point_collision is not None and hasattr(point_collision, 'tolist'):
@@ -433,10 +955,10 @@ class Screen:
 
     def _creer_explosion(self, cercle, collision_point):
         """Crée l'animation d'explosion pour un cercle détruit"""
-        self.log_debug(f"Création explosion avec {75} particules")
+        self.log_debug("Création explosion avec %d particules", 75)
 
         # Choisir un style d'explosion
-        style = random.choice([
+        style = self.rng.choice([
             StyleExplosion.NORMAL,
             StyleExplosion.MULTICOLOR,
             StyleExplosion.RAINBOW,
@@ -444,44 +966,10 @@ class Screen:
         ])
 
         # Choisir une palette de couleurs
-        palette = random.choice(list(Particule.PALETTES.keys()))
-
-        self.log_debug(f"Style explosion: {style}, Palette: {palette}")
-
-        # Création d'un motif d'explosion sur la circonférence
-        num_particules = 75
-        for i in range(num_particules):
-            # Calcul de la position sur la circonférence
-            angle = (i / num_particules) * 2 * math.pi
-            pos_x = cercle.position[0] + cercle.rayon * math.cos(angle)
-            pos_y = cercle.position[1] + cercle.rayon * math.sin(angle)
-
-            # Ajout d'un léger décalage aléatoire
-            pos_x += random.uniform(-2, 2)
-            pos_y += random.uniform(-2, 2)
-
-            # La direction initiale des particules suit la forme du cercle
-            direction_angle = angle + random.uniform(-0.2, 0.2)
-
-            # Vitesse des particules selon la distance au point d'impact
-            if collision_point is not None and len(collision_point) >= 2:
-                dx = pos_x - collision_point[0]
-                dy = pos_y - collision_point[1]
-                distance_impact = math.sqrt(dx * dx + dy * dy)
-                vitesse_base = 400 - min(200, distance_impact)
-            else:
-                vitesse_base = 200
-
-            vitesse_min = vitesse_base
-            vitesse_max = vitesse_base * 1.5
-
-            # Création de la particule avec le nouveau système
-            particule = Particule(
-                position=[pos_x, pos_y],
-                style=style,
-                palette_name=palette,
-                vitesse_min=vitesse_min,
-                vitesse_max=vitesse_max,
-                direction_angle=direction_angle
-            )
-            self.particules.append(particule)
+        palette = self.rng.choice(list(Particule.PALETTES.keys()))
+
+        self.log_debug("Style explosion: %s, Palette: %s", style, palette)
+
+        # Motif d'explosion sur la circonférence, émis en un seul lot
+        self.particules.explosion(cercle.position, cercle.rayon, collision_point, nb=75,
+                                  style=style, palette_name=palette)
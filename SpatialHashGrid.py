@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import math
+
+
+class SpatialHashGrid:
+    """Grille uniforme hachée pour la détection de collision entre objets de tailles proches"""
+
+    # Cellules voisines « en avant » : chaque paire de cellules n'est visitée qu'une fois
+    VOISINS_AVANT = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, taille_cellule):
+        """
+        Initialise une grille vide
+
+        Args:
+            taille_cellule (float): Côté d'une cellule (≈ 2 × rayon max des objets)
+        """
+        self.taille_cellule = max(float(taille_cellule), 1e-6)
+        self.cellules = {}  # (cx, cy) -> liste de tuples (point, data)
+
+    def _cle(self, x, y):
+        """Cellule contenant le point (x, y)"""
+        return (math.floor(x / self.taille_cellule), math.floor(y / self.taille_cellule))
+
+    def insert(self, point, data=None):
+        """
+        Insère un point dans la grille
+
+        Args:
+            point (list): Position [x, y]
+            data (any): Données associées au point (e.g., indice de balle)
+
+        Returns:
+            bool: Toujours True (la grille n'a pas de limites)
+        """
+        cle = self._cle(point[0], point[1])
+        cellule = self.cellules.get(cle)
+        if cellule is None:
+            self.cellules[cle] = [(point, data)]
+        else:
+            cellule.append((point, data))
+        return True
+
+    def query_radius(self, center, radius, found=None):
+        """
+        Trouve tous les points dans un cercle donné
+
+        Args:
+            center (list): Centre du cercle [x, y]
+            radius (float): Rayon du cercle
+            found (list): Liste pour accumuler les résultats
+
+        Returns:
+            list: Liste de tuples (point, data) dans le cercle
+        """
+        if found is None:
+            found = []
+
+        cx_min, cy_min = self._cle(center[0] - radius, center[1] - radius)
+        cx_max, cy_max = self._cle(center[0] + radius, center[1] + radius)
+        radius_squared = radius * radius
+
+        for cx in range(cx_min, cx_max + 1):
+            for cy in range(cy_min, cy_max + 1):
+                cellule = self.cellules.get((cx, cy))
+                if not cellule:
+                    continue
+                for point, data in cellule:
+                    dx = center[0] - point[0]
+                    dy = center[1] - point[1]
+                    if dx * dx + dy * dy <= radius_squared:
+                        found.append((point, data))
+
+        return found
+
+    def paires_candidates(self):
+        """
+        Énumère en une passe toutes les paires de points dans des cellules identiques ou adjacentes
+
+        Returns:
+            list: Liste de tuples (data_a, data_b), chaque paire n'apparaissant qu'une fois
+        """
+        paires = []
+        cellules = self.cellules
+
+        for (cx, cy), cellule in cellules.items():
+            # Paires à l'intérieur de la cellule
+            n = len(cellule)
+            for a in range(n):
+                data_a = cellule[a][1]
+                for b in range(a + 1, n):
+                    paires.append((data_a, cellule[b][1]))
+
+            # Paires avec les cellules voisines (moitié du voisinage seulement)
+            for dx, dy in self.VOISINS_AVANT:
+                voisine = cellules.get((cx + dx, cy + dy))
+                if not voisine:
+                    continue
+                for _, data_a in cellule:
+                    for _, data_b in voisine:
+                        paires.append((data_a, data_b))
+
+        return paires
+
+    def clear(self):
+        """Vide la grille"""
+        self.cellules = {}
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 import pygame
 import os
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from CacheLRU import CacheLRU
+from CacheDisque import CacheDisque
 
 
 class SurfaceManager:
@@ -8,17 +12,107 @@ class SurfaceManager:
 
     _instance = None
 
+    PALIERS_ALPHA = 16  # Niveaux d'opacité distincts des sprites de particules
+
+    # Budget mémoire par défaut de chaque cache, en octets de pixels
+    BUDGETS = {
+        "image_cache": 64 * 1024 * 1024,
+        "circle_cache": 16 * 1024 * 1024,
+        "temp_surfaces": 16 * 1024 * 1024,
+        "particle_sprites": 8 * 1024 * 1024,
+        "anneaux": 64 * 1024 * 1024,
+        "arcs_de_base": 32 * 1024 * 1024,
+        "arcs_tournes": 64 * 1024 * 1024,
+        "sprites_balles": 32 * 1024 * 1024,
+    }
+
+    # Cache persistant des sprites dérivés du singleton, conservé d'un lancement à l'autre (None : désactivé)
+    DOSSIER_DISQUE = "cache_sprites"
+
     @staticmethod
     def get_instance():
         """Accès singleton au gestionnaire"""
         if SurfaceManager._instance is None:
-            SurfaceManager._instance = SurfaceManager()
+            SurfaceManager._instance = SurfaceManager(dossier_disque=SurfaceManager.DOSSIER_DISQUE)
         return SurfaceManager._instance
 
-    def __init__(self):
-        self.image_cache = {}  # Cache pour les images chargées
-        self.circle_cache = {}  # Cache pour les cercles dessinés
-        self.temp_surfaces = {}  # Surfaces temporaires réutilisables
+    def __init__(self, budgets=None, dossier_disque=None):
+        """
+        Initialise des caches vides, chacun un LRU borné en octets
+
+        Args:
+            budgets (dict): Budgets en octets remplaçant ceux de BUDGETS (clé = nom du cache)
+            dossier_disque (str): Dossier du cache persistant des sprites (None : pas de cache sur disque)
+        """
+        budgets = {**self.BUDGETS, **(budgets or {})}
+
+        def cache(nom):
+            return CacheLRU(max_octets=budgets[nom], poids=self.octets_surface)
+
+        self.image_cache = cache("image_cache")  # Images chargées et redimensionnées
+        self.circle_cache = cache("circle_cache")  # Cercles dessinés et masques circulaires
+        self.temp_surfaces = cache("temp_surfaces")  # Surfaces temporaires réutilisables
+        self.particle_sprites = cache("particle_sprites")  # Atlas des particules : (couleur, taille, rayon, palier)
+
+        # Anneaux prérendus partagés : (rayon, épaisseur, ouverture, rotation, palier de vie) -> surface
+        self.anneaux = cache("anneaux")
+
+        # Arcs tournants : une surface par géométrie, palier de couleur et angle quantifié, ou seulement
+        # le sprite de base (tourné à chaque frame) pour les arcs dont les rotations ne tiennent pas en cache
+        self.arcs_de_base = cache("arcs_de_base")
+        self.arcs_tournes = cache("arcs_tournes")
+        self.rotations_arcs = {}  # Géométrie d'arc tournant -> (octets d'une rotation, pas de l'angle ou None)
+
+        # Images finales des balles (découpées, contour compris) : (chemin, taille, contour) -> surface
+        self.sprites_balles = cache("sprites_balles")
+
+        # Sprites dérivés (anneaux, arcs, balles) relus du disque au lieu d'être redessinés
+        # (le dossier n'est créé qu'à la première écriture)
+        self.cache_disque = CacheDisque(dossier_disque) if dossier_disque is not None else None
+        self.suspensions_disque = 0  # Écrans headless en cours : le cache sur disque n'est ni lu ni écrit
+
+        # Décodages lancés par prefetch : chemin absolu -> Future de la surface brute (non convertie)
+        self.decodages = {}
+        self.pool_decodage = None
+
+    def suspendre_disque(self):
+        """Suspend le cache de sprites sur disque jusqu'au reprendre_disque correspondant (ex: écran headless)"""
+        self.suspensions_disque += 1
+
+    def reprendre_disque(self):
+        """Lève une suspension posée par suspendre_disque"""
+        self.suspensions_disque = max(0, self.suspensions_disque - 1)
+
+    def disque(self):
+        """Cache de sprites sur disque utilisable, ou None (absent ou suspendu)"""
+        return self.cache_disque if self.suspensions_disque == 0 else None
+
+    def caches(self):
+        """Caches du gestionnaire, par nom"""
+        return {nom: getattr(self, nom) for nom in self.BUDGETS}
+
+    def configurer_budgets(self, **budgets):
+        """Change le budget en octets de caches existants (ex: anneaux=128 * 1024 * 1024) et évince l'excédent"""
+        for nom, max_octets in budgets.items():
+            self.caches()[nom].redimensionner(max_octets)
+        if "arcs_tournes" in budgets:
+            self.rotations_arcs = {}  # Répartition à refaire avec le nouveau budget
+
+    def stats(self):
+        """
+        Statistiques de tous les caches
+
+        Returns:
+            dict: nom du cache -> {entrees, octets, max_octets, hits, misses, evictions}, plus "total"
+                  (max_octets du total : somme des seuls budgets bornés, sans_budget : nombre de caches non bornés)
+        """
+        stats = {nom: cache.stats() for nom, cache in self.caches().items()}
+        total = {cle: sum(s[cle] for s in stats.values())
+                 for cle in ("entrees", "octets", "hits", "misses", "evictions")}
+        total["max_octets"] = sum(s["max_octets"] for s in stats.values() if s["max_octets"] is not None)
+        total["sans_budget"] = sum(1 for s in stats.values() if s["max_octets"] is None)
+        stats["total"] = total
+        return stats
 
     def get_circle_surface(self, taille, couleur, contour=None):
         """Obtient une surface de cercle du cache ou en crée une nouvelle"""
@@ -31,8 +125,9 @@ class SurfaceManager:
         key = f"circle_{taille}_{color_str}{contour_str}"
 
         # Vérifier si elle existe déjà en cache
-        if key in self.circle_cache:
-            return self.circle_cache[key]
+        circle_surface = self.circle_cache.get(key)
+        if circle_surface is not None:
+            return circle_surface
 
         # Sinon créer une nouvelle surface
         diameter = int(taille * 2)
@@ -48,8 +143,166 @@ class SurfaceManager:
                                (taille, taille), taille, contour[1])
 
         # Mettre en cache et retourner
-        self.circle_cache[key] = circle_surface
-        return circle_surface
+        return self.circle_cache.put(key, circle_surface)
+
+    def get_circle_mask(self, taille):
+        """Obtient le masque circulaire blanc opaque (côté 2 × taille) utilisé pour découper les images"""
+        cote = int(taille * 2)
+        key = f"mask_{cote}"
+        mask_surface = self.circle_cache.get(key)
+        if mask_surface is None:
+            # Disque centré sur la surface de côté entier (partagée par toutes les tailles de même côté)
+            mask_surface = pygame.Surface((cote, cote), pygame.SRCALPHA)
+            pygame.draw.circle(mask_surface, (255, 255, 255, 255), (cote / 2, cote / 2), cote / 2)
+            self.circle_cache.put(key, mask_surface)
+        return mask_surface
+
+    def decouper_en_cercle(self, image, taille, path=None):
+        """
+        Découpe une image en disque de rayon `taille` (image agrandie de 5 % puis masquée)
+
+        Args:
+            image (pygame.Surface): Image source
+            taille (float): Rayon du disque
+            path (str): Chemin de l'image, pour réutiliser sa version redimensionnée en cache
+
+        Returns:
+            pygame.Surface: Nouvelle surface de côté 2 × taille avec canal alpha (None si l'image est illisible)
+        """
+        sprite = pygame.Surface((taille * 2, taille * 2), pygame.SRCALPHA)
+        scaled_size = int(taille * 2.1)  # 5% plus grand
+        if path is not None:
+            scaled_image = self.get_scaled_image(path, (scaled_size, scaled_size))
+            if scaled_image is None:
+                return None
+        else:
+            try:
+                scaled_image = pygame.transform.smoothscale(image, (scaled_size, scaled_size))
+            except ValueError:
+                scaled_image = pygame.transform.scale(image, (scaled_size, scaled_size))
+
+        sprite.fill((0, 0, 0, 0))
+        sprite.blit(scaled_image, ((taille * 2 - scaled_size) // 2, (taille * 2 - scaled_size) // 2))
+        sprite.blit(self.get_circle_mask(taille), (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        return sprite
+
+    @staticmethod
+    def octets_surface(surface):
+        """Mémoire occupée par les pixels d'une surface (largeur × hauteur × octets par pixel)"""
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get_persistant(self, nom, cle, dessiner, source=None):
+        """
+        Obtient un sprite dérivé depuis un cache mémoire, sinon depuis le cache sur disque, sinon en le dessinant
+
+        Args:
+            nom (str): Nom du cache mémoire (ex: "anneaux")
+            cle (tuple): Paramètres du sprite
+            dessiner (callable): Crée le sprite en cas d'absence des deux caches (peut retourner None)
+            source (str): Image dont le sprite est dérivé : l'entrée sur disque suit son contenu
+
+        Returns:
+            pygame.Surface: Surface partagée, à ne pas modifier (None si `dessiner` a échoué)
+        """
+        cache = getattr(self, nom)
+        cle_memoire = (os.path.abspath(source), cle) if source is not None else cle
+        surface = cache.get(cle_memoire)
+        if surface is not None:
+            return surface
+
+        disque = self.disque()
+        if disque is not None:
+            surface = disque.charger((nom, cle), source, self.sources_code(dessiner))
+        if surface is None:
+            surface = dessiner()
+            if surface is None:
+                return None
+            if disque is not None:
+                disque.enregistrer((nom, cle), surface, source, self.sources_code(dessiner))
+        return cache.put(cle_memoire, surface)
+
+    @staticmethod
+    def sources_code(dessiner):
+        """Fichiers Python du code de dessin d'un sprite : celui de `dessiner` et ce module"""
+        try:
+            fichier = inspect.getsourcefile(dessiner)
+        except TypeError:
+            fichier = None
+        return tuple(f for f in (fichier, __file__) if f is not None)
+
+    def get_ring_surface(self, cle, dessiner):
+        """
+        Obtient une surface d'anneau prérendue, partagée entre les cercles de même géométrie
+
+        Args:
+            cle (tuple): Géométrie et palier de couleur de l'anneau
+            dessiner (callable): Crée la surface en cas d'absence du cache
+
+        Returns:
+            pygame.Surface: Surface partagée, à ne pas modifier
+        """
+        return self.get_persistant("anneaux", cle, dessiner)
+
+    def get_ball_sprite(self, path, taille, contour, dessiner):
+        """
+        Obtient l'image finale d'une balle, partagée entre les balles de même image, taille et contour
+
+        Args:
+            path (str): Chemin de l'image source
+            taille (float): Rayon de la balle
+            contour (tuple): (couleur, épaisseur) du contour, ou None
+            dessiner (callable): Crée l'image en cas d'absence du cache (peut retourner None)
+
+        Returns:
+            pygame.Surface: Surface partagée, à ne pas modifier (None si `dessiner` a échoué)
+        """
+        return self.get_persistant("sprites_balles", self._cle_sprite_balle(taille, contour), dessiner, source=path)
+
+    def a_sprite_balle(self, path, taille, contour, dessiner):
+        """True si l'image finale d'une balle est déjà en mémoire ou sur disque (get_ball_sprite ne décodera rien)"""
+        cle = self._cle_sprite_balle(taille, contour)
+        if (os.path.abspath(path), cle) in self.sprites_balles:
+            return True
+        disque = self.disque()
+        return disque is not None and disque.contient(("sprites_balles", cle), path, self.sources_code(dessiner))
+
+    @staticmethod
+    def _cle_sprite_balle(taille, contour):
+        """Paramètres de l'image finale d'une balle"""
+        if contour:
+            couleur, epaisseur = contour[0], contour[1]
+            # Les couleurs lues dans un JSON sont des listes, non hachables
+            contour = (tuple(couleur) if isinstance(couleur, list) else couleur, epaisseur)
+        return float(taille), contour or None
+
+    @classmethod
+    def palier_alpha(cls, alpha):
+        """Palier d'opacité (0 à PALIERS_ALPHA - 1) d'un alpha entre 0 et 255 ; accepte un tableau NumPy"""
+        return (alpha * (cls.PALIERS_ALPHA - 1) + 127) // 255
+
+    def get_particle_sprite(self, couleur, taille, rayon, palier):
+        """
+        Obtient le sprite pré-rendu d'une particule ou d'un point de traînée
+
+        Args:
+            couleur (tuple): Couleur RGB
+            taille (int): Demi-côté du sprite (le disque est centré en (taille, taille))
+            rayon (float): Rayon du disque dessiné
+            palier (int): Palier d'opacité retourné par palier_alpha
+
+        Returns:
+            pygame.Surface: Sprite partagé, à ne pas modifier
+        """
+        key = (couleur, taille, rayon, palier)
+        sprite = self.particle_sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        alpha = palier * 255 // (self.PALIERS_ALPHA - 1)
+        sprite = pygame.Surface((taille * 2, taille * 2), pygame.SRCALPHA)
+        sprite.fill((0, 0, 0, 0))
+        pygame.draw.circle(sprite, (*couleur, alpha), (taille, taille), rayon)
+        return self.particle_sprites.put(key, sprite)
 
     def get_image(self, path):
         """Charge une image depuis un chemin avec mise en cache"""
@@ -60,18 +313,63 @@ class SurfaceManager:
         abs_path = os.path.abspath(path) if path else None
 
         # Retourner depuis le cache si disponible
-        if abs_path in self.image_cache:
-            return self.image_cache[abs_path]
+        image = self.image_cache.get(abs_path)
+        if image is not None:
+            return image
 
-        # Sinon charger et mettre en cache
+        # Sinon charger (ou récupérer le décodage lancé par prefetch) et mettre en cache
+        decodage = self.decodages.pop(abs_path, None)
         try:
-            image = pygame.image.load(path).convert_alpha()
-            self.image_cache[abs_path] = image
-            return image
+            image = decodage.result() if decodage is not None else pygame.image.load(path)
+            # convert_alpha nécessite une fenêtre (absente en mode headless)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            return self.image_cache.put(abs_path, image)
         except Exception as e:
             print(f"Erreur lors du chargement de l'image {path}: {e}")
             return None
 
+    def prefetch(self, paths):
+        """
+        Lance le décodage des images en arrière-plan, sur un pool de threads
+
+        Le décodage (lecture du fichier et décompression, hors GIL) se fait dans les threads ;
+        seule la conversion au format de l'écran (convert_alpha) reste sur le thread principal,
+        lors du premier get_image de chaque chemin.
+
+        Args:
+            paths (iterable): Chemins d'images (None et doublons ignorés)
+
+        Returns:
+            int: Nombre de décodages lancés
+        """
+        lances = 0
+        for path in paths:
+            if not path:
+                continue
+            abs_path = os.path.abspath(path)
+            if abs_path in self.decodages or abs_path in self.image_cache:
+                continue
+            if self.pool_decodage is None:
+                self.pool_decodage = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                                        thread_name_prefix="decodage")
+            self.decodages[abs_path] = self.pool_decodage.submit(pygame.image.load, abs_path)
+            lances += 1
+        return lances
+
+    def abandonner_prechargements(self):
+        """
+        Annule les décodages de prefetch qui n'ont pas été consommés par get_image et libère leurs surfaces
+
+        Returns:
+            int: Nombre de décodages abandonnés
+        """
+        abandonnes = len(self.decodages)
+        for decodage in self.decodages.values():
+            decodage.cancel()
+        self.decodages.clear()
+        return abandonnes
+
     def get_scaled_image(self, path, size):
         """Obtient une image redimensionnée avec mise en cache"""
         if path is None:
@@ -81,8 +379,9 @@ class SurfaceManager:
         key = f"{abs_path}_{size[0]}_{size[1]}"
 
         # Vérifier si cette version existe en cache
-        if key in self.image_cache:
-            return self.image_cache[key]
+        scaled = self.image_cache.get(key)
+        if scaled is not None:
+            return scaled
 
         # Charger l'image de base
         base_image = self.get_image(path)
@@ -92,14 +391,12 @@ class SurfaceManager:
         # Redimensionner et mettre en cache
         try:
             scaled = pygame.transform.smoothscale(base_image, size)
-            self.image_cache[key] = scaled
-            return scaled
+            return self.image_cache.put(key, scaled)
         except ValueError:
             # Fallback au scale standard
             try:
                 scaled = pygame.transform.scale(base_image, size)
-                self.image_cache[key] = scaled
-                return scaled
+                return self.image_cache.put(key, scaled)
             except Exception as e:
                 print(f"Erreur lors du redimensionnement de l'image {path}: {e}")
                 return base_image
@@ -108,9 +405,9 @@ class SurfaceManager:
         """Obtient une surface temporaire réutilisable"""
         key = f"{size[0]}x{size[1]}_{flags}"
 
-        if key in self.temp_surfaces:
+        surface = self.temp_surfaces.get(key)
+        if surface is not None:
             # Réinitialiser la surface existante
-            surface = self.temp_surfaces[key]
             surface.fill((0, 0, 0, 0) if flags & pygame.SRCALPHA else (0, 0, 0))
             return surface
 
@@ -120,11 +417,10 @@ class SurfaceManager:
             surface.fill((0, 0, 0, 0))
 
         # Stocker pour réutilisation future
-        self.temp_surfaces[key] = surface
-        return surface
+        return self.temp_surfaces.put(key, surface)
 
     def cleanup(self):
-        """Libère les ressources non essentielles"""
-        # Conserver uniquement les images les plus utilisées
+        """Libère les ressources non essentielles (les autres caches restent bornés par leur budget)"""
+        # Les surfaces temporaires sont recréées à la demande
         if len(self.temp_surfaces) > 20:  # Limite arbitraire
             self.temp_surfaces.clear()
\ No newline at end of file
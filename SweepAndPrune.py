@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class SweepAndPrune:
+    """Détection grossière par tri et balayage sur l'axe x, avec cohérence temporelle entre frames"""
+
+    def __init__(self):
+        self.balles = []  # Balles triées par borne gauche (x - taille) à la dernière frame
+        self.bornes_min = []  # Bornes gauches correspondantes
+
+    def ajouter(self, balle):
+        """Insère une balle à sa place dans la liste triée"""
+        borne = float(balle.position[0] - balle.taille)
+        k = len(self.bornes_min)
+        while k > 0 and self.bornes_min[k - 1] > borne:
+            k -= 1
+        self.balles.insert(k, balle)
+        self.bornes_min.insert(k, borne)
+
+    def retirer(self, balle):
+        """Retire une balle de la liste triée"""
+        for k, autre in enumerate(self.balles):
+            if autre is balle:
+                del self.balles[k]
+                del self.bornes_min[k]
+                return True
+        return False
+
+    def _retrier(self, bornes):
+        """Tri par insertion : quasi linéaire quand les balles ont peu bougé depuis la frame précédente"""
+        balles = self.balles
+        for k in range(1, len(bornes)):
+            borne = bornes[k]
+            if bornes[k - 1] <= borne:
+                continue
+            balle = balles[k]
+            m = k - 1
+            while m >= 0 and bornes[m] > borne:
+                bornes[m + 1] = bornes[m]
+                balles[m + 1] = balles[m]
+                m -= 1
+            bornes[m + 1] = borne
+            balles[m + 1] = balle
+        self.bornes_min = bornes
+
+    def paires_candidates(self, world):
+        """
+        Met à jour l'ordre puis balaie l'axe x pour émettre les paires dont les boîtes se chevauchent
+
+        Args:
+            world (BallWorld): Monde contenant l'état courant des balles
+
+        Returns:
+            list: Liste de tuples (i, j) d'indices dans le BallWorld
+        """
+        if not self.balles:
+            return []
+
+        # Bornes gauches dans l'ordre de la frame précédente, puis retri
+        indices = np.fromiter((balle.index for balle in self.balles), dtype=np.intp, count=len(self.balles))
+        bornes = (world.positions[indices, 0] - world.tailles[indices]).tolist()
+        self._retrier(bornes)
+
+        # Boîtes englobantes dans le nouvel ordre
+        indices = np.fromiter((balle.index for balle in self.balles), dtype=np.intp, count=len(self.balles))
+        positions = world.positions[indices]
+        tailles = world.tailles[indices]
+        x_max = (positions[:, 0] + tailles).tolist()
+        y_min = (positions[:, 1] - tailles).tolist()
+        y_max = (positions[:, 1] + tailles).tolist()
+        indices = indices.tolist()
+
+        paires = []
+        actives = []  # Positions (dans l'ordre trié) des boîtes encore ouvertes sur x
+        for k, borne in enumerate(self.bornes_min):
+            # Fermer les intervalles qui se terminent avant cette borne
+            actives = [a for a in actives if x_max[a] >= borne]
+            bas = y_min[k]
+            haut = y_max[k]
+            for a in actives:
+                if y_min[a] <= haut and y_max[a] >= bas:
+                    paires.append((indices[a], indices[k]))
+            actives.append(k)
+
+        return paires
+
+    def clear(self):
+        """Vide la structure"""
+        self.balles = []
+        self.bornes_min = []